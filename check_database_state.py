@@ -7,37 +7,37 @@ import os
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+from legacylink.migrations import MigrationProbeError, print_checks, probe_migrations
+from legacylink.testdata import Namespace
+
+TEST_DATA = Namespace(__file__)
+
 def check_migration_status():
     """Check if our migration functions exist in the database."""
     load_dotenv('.env.local')
     load_dotenv()
     
     url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
-    key = os.getenv('NEXT_PUBLIC_SUPABASE_ANON_KEY')
-    
-    supabase: Client = create_client(url, key)
+    # migration_catalog() is granted to service_role only
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
     
     print('🔍 Migration Status Check:')
     print('=' * 30)
     
-    # Test if our functions exist
-    functions_to_test = [
-        'sync_existing_auth_users',
-        'handle_new_user',
-        'handle_user_email_confirmed'
-    ]
+    if not url or not key:
+        print('  ❌ SUPABASE_SERVICE_ROLE_KEY is required to read the migration catalog')
+        return
     
-    for func_name in functions_to_test:
-        try:
-            result = supabase.rpc(func_name).execute()
-            print(f'  ✅ {func_name}: Available')
-            if func_name == 'sync_existing_auth_users' and result.data:
-                data = result.data[0] if isinstance(result.data, list) else result.data
-                print(f'      Users processed: {data.get("users_processed", 0)}')
-                print(f'      Profiles created: {data.get("profiles_created", 0)}')
-                print(f'      Errors: {data.get("errors_encountered", 0)}')
-        except Exception as e:
-            print(f'  ❌ {func_name}: Not available - {e}')
+    supabase: Client = create_client(url, key)
+    
+    # Read the catalog instead of calling the functions: calling
+    # sync_existing_auth_users to see if it exists runs a full sync
+    try:
+        checks = probe_migrations(supabase)
+    except MigrationProbeError as e:
+        print(f'  ❌ {e}')
+        return
+    print_checks(checks)
     
 def check_auth_users():
     """Check auth.users table for existing users.""" 
@@ -62,14 +62,6 @@ def check_auth_users():
                 print(f'    • {user.get("email", "No email")} - Confirmed: {user.get("email_confirmed_at") is not None}')
     except Exception as e:
         print(f'  ❌ Debug function method failed: {e}')
-    
-    # Method 2: Check if we have working RPC functions at all
-    try:
-        # Test with a simple function that might exist
-        result = supabase.rpc('sync_missing_profiles').execute()
-        print(f'  ✅ RPC functions are working')
-    except Exception as e:
-        print(f'  ⚠️  RPC test failed: {e}')
 
 def test_current_signup_flow():
     """Test what happens when we try to create a profile manually."""
@@ -85,20 +77,14 @@ def test_current_signup_flow():
     print('=' * 35)
     
     # Try to create a test profile to see what error we get
-    test_profile = {
-        'id': '00000000-0000-0000-0000-000000000001',  # Fake UUID for testing
-        'email': 'test@example.com',
-        'full_name': 'Test User',
-        'role': 'alumni',
-        'verified': False
-    }
+    test_profile = TEST_DATA.profile('manual-profile', full_name='Test User')
     
     try:
         result = supabase.table('profiles').insert(test_profile).execute()
         print(f'  ✅ Profile creation successful: {result.data}')
         
         # Clean up test data
-        supabase.table('profiles').delete().eq('id', test_profile['id']).execute()
+        TEST_DATA.cleanup(supabase)
         print(f'  🧹 Test profile cleaned up')
         
     except Exception as e:
@@ -143,7 +129,7 @@ def main():
     
     print('\n📋 Conclusions:')
     print('=' * 15)
-    print('1. If sync_existing_auth_users is available but no profiles exist:')
+    print('1. If every catalog check is ✅ but no profiles exist:')
     print('   → Migration functions exist but no auth.users to sync')
     print('2. If profile creation fails with RLS error:')
     print('   → Migration not applied, still has restrictive policies')
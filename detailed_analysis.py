@@ -7,6 +7,8 @@ import os
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+from legacylink.refcache import shared_cache
+
 def detailed_user_analysis():
     """Get detailed user analysis."""
     load_dotenv('.env.local')
@@ -23,8 +25,9 @@ def detailed_user_analysis():
     # Get all profiles with university info
     try:
         profiles_result = supabase.table('profiles').select(
-            'id, email, full_name, role, verified, created_at, universities(name)'
+            'id, email, full_name, role, verified, created_at, university_id'
         ).execute()
+        shared_cache(supabase).resolve(profiles_result.data)
         
         print(f'📊 Total Profiles: {len(profiles_result.data)}')
         
@@ -74,12 +77,13 @@ def test_admin_dashboard_queries():
     try:
         # Simulate university admin query (would normally be filtered by university_id)
         pending_verifications = supabase.table('profiles').select(
-            'id, full_name, email, role, created_at, universities(name)'
+            'id, full_name, email, role, created_at, university_id'
         ).eq('verified', False).execute()
+        shared_cache(supabase).resolve(pending_verifications.data)
         
         print(f'   Pending verifications: {len(pending_verifications.data)}')
         for user in pending_verifications.data:
-            print(f'     • {user["full_name"]} ({user["role"]}) - {user.get("universities", {}).get("name", "No university")}')
+            print(f'     • {user["full_name"]} ({user["role"]}) - {(user.get("universities") or {}).get("name", "No university")}')
         
     except Exception as e:
         print(f'   ❌ University admin query failed: {e}')
@@ -88,13 +92,14 @@ def test_admin_dashboard_queries():
     print('\n2. Super Admin View:')
     try:
         all_users = supabase.table('profiles').select(
-            'id, full_name, email, role, verified, universities(name)'
+            'id, full_name, email, role, verified, university_id'
         ).order('created_at', desc=True).limit(10).execute()
+        shared_cache(supabase).resolve(all_users.data)
         
         print(f'   Recent users (last 10): {len(all_users.data)}')
         for user in all_users.data:
             status = "✅" if user["verified"] else "⏳"
-            print(f'     {status} {user["full_name"]} ({user["role"]}) - {user.get("universities", {}).get("name", "No university")}')
+            print(f'     {status} {user["full_name"]} ({user["role"]}) - {(user.get("universities") or {}).get("name", "No university")}')
         
     except Exception as e:
         print(f'   ❌ Super admin query failed: {e}')
@@ -7,6 +7,10 @@ import os
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+from legacylink.testdata import Namespace
+
+TEST_DATA = Namespace(__file__)
+
 def diagnose_rls_issue():
     """Diagnose the specific RLS policy problem."""
     print('🔍 Diagnosing RLS Policy Issue')
@@ -73,13 +77,7 @@ def test_after_policy_fix():
     supabase: Client = create_client(url, key)
     
     # Test profile creation
-    test_profile = {
-        'id': '99999999-9999-9999-9999-999999999999',
-        'email': 'policy-test@example.com',
-        'full_name': 'Policy Test User',
-        'role': 'alumni',
-        'verified': False
-    }
+    test_profile = TEST_DATA.profile('policy-test', full_name='Policy Test User')
     
     try:
         result = supabase.table('profiles').insert(test_profile).execute()
@@ -87,7 +85,7 @@ def test_after_policy_fix():
         print('✅ RLS policy fixed correctly')
         
         # Clean up
-        supabase.table('profiles').delete().eq('id', test_profile['id']).execute()
+        TEST_DATA.cleanup(supabase)
         print('🧹 Test data cleaned up')
         
         print('\n🎉 PROBLEM SOLVED!')
@@ -0,0 +1,5 @@
+"""
+LegacyLink Python toolkit - shared client, local stand-in and batch services
+"""
+
+__version__ = "0.1.0"
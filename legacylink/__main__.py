@@ -0,0 +1,5 @@
+import sys
+
+from legacylink.cli import main
+
+sys.exit(main())
@@ -0,0 +1,247 @@
+"""
+Authorization context for admin verify / reject / promote flows.
+
+Each of /api/admin/verify/[userId], reject and promote calls auth.getUser,
+re-reads the caller's profiles row for role/university_id and then reads the
+target profile before doing any work - six round trips per click. Here:
+
+  - verified tokens and the caller's (role, university_id) are cached for a
+    short TTL keyed by the JWT subject, so an admin session pays one lookup,
+  - target profiles are resolved in batches (one in_() per page of the
+    verification queue) and reused for a few seconds,
+  - verify_users()/reject_users() apply one update (and one badge insert) per
+    lookup_chunk targets, so large batches stay within URL length limits.
+
+Role changes made through promote() invalidate the cached context at once;
+changes made elsewhere take effect within `ttl` seconds.
+"""
+
+import base64
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timezone
+
+ADMIN_ROLES = ('super_admin', 'university_admin', 'admin')
+PROMOTABLE_ROLES = ('super_admin', 'university_admin')
+
+AdminContext = namedtuple('AdminContext', 'user_id role university_id')
+
+
+class AdminAuthError(Exception):
+    """Carries the HTTP status the admin routes would answer with."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def jwt_claims(token):
+    """Decode (without verifying) the claims of a Supabase access token."""
+    try:
+        payload = token.split('.')[1]
+        return json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+    except (AttributeError, IndexError, ValueError) as e:
+        raise AdminAuthError(401, 'Unauthorized - malformed token') from e
+
+
+class _TTLCache:
+    """Small thread-safe LRU with per-entry expiry."""
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class AdminAuthorizer:
+    """Resolves and caches who an admin is and which targets they may act on."""
+
+    def __init__(self, client, ttl=30.0, target_ttl=10.0, max_entries=10000, lookup_chunk=200):
+        self.client = client
+        self.lookup_chunk = lookup_chunk
+        self._tokens = _TTLCache(ttl, max_entries)
+        self._contexts = _TTLCache(ttl, max_entries)
+        self._targets = _TTLCache(target_ttl, max_entries * 10)
+        self.stats = {'token_checks': 0, 'role_lookups': 0, 'target_lookups': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def chunks(self, ids):
+        for start in range(0, len(ids), self.lookup_chunk):
+            yield ids[start:start + self.lookup_chunk]
+
+    def authorize(self, token):
+        """Return the caller's AdminContext or raise AdminAuthError (401/403)."""
+        if not token:
+            raise AdminAuthError(401, 'Unauthorized - no user session')
+        claims = jwt_claims(token)
+        subject = claims.get('sub')
+        if not subject or claims.get('exp', 0) < time.time():
+            raise AdminAuthError(401, 'Unauthorized - token expired')
+
+        digest = hashlib.sha256(token.encode()).hexdigest()
+        if self._tokens.get(digest) != subject:
+            self._count('token_checks')
+            try:
+                response = self.client.auth.get_user(token)
+            except Exception as e:
+                raise AdminAuthError(401, f'Authentication error: {e}') from e
+            user = getattr(response, 'user', None)
+            if user is None or user.id != subject:
+                raise AdminAuthError(401, 'Unauthorized - no user session')
+            self._tokens.put(digest, subject)
+
+        context = self._contexts.get(subject)
+        if context is None:
+            self._count('role_lookups')
+            rows = self.client.table('profiles').select('id, role, university_id').eq('id', subject).execute().data
+            if not rows or rows[0]['role'] not in ADMIN_ROLES:
+                raise AdminAuthError(403, 'Forbidden - Admin access required')
+            context = AdminContext(rows[0]['id'], rows[0]['role'], rows[0]['university_id'])
+            self._contexts.put(subject, context)
+        return context
+
+    def invalidate(self, user_id=None):
+        """Forget cached admin contexts (one user, or everyone)."""
+        if user_id is None:
+            self._contexts.clear()
+        else:
+            self._contexts.pop(user_id)
+
+    def resolve_targets(self, user_ids):
+        """Batch-load target profiles. Returns {user_id: profile} for those that exist."""
+        found, missing = {}, []
+        for user_id in dict.fromkeys(user_ids):
+            cached = self._targets.get(user_id)
+            if cached is None:
+                missing.append(user_id)
+            else:
+                found[user_id] = cached
+        for chunk in self.chunks(missing):
+            self._count('target_lookups')
+            rows = self.client.table('profiles').select('id, university_id, verified').in_('id', chunk).execute().data
+            for row in rows or []:
+                self._targets.put(row['id'], row)
+                found[row['id']] = row
+        return found
+
+    def forget_targets(self, user_ids):
+        for user_id in user_ids:
+            self._targets.pop(user_id)
+
+    @staticmethod
+    def may_act_on(context, target):
+        """University admins are limited to their own university; super admins act on anyone."""
+        return context.role != 'university_admin' or target.get('university_id') == context.university_id
+
+
+class AdminActions:
+    """verify / reject / promote with one authorization per session and batched writes."""
+
+    def __init__(self, client, authorizer=None):
+        self.client = client
+        self.authorizer = authorizer or AdminAuthorizer(client)
+
+    def _partition(self, context, user_ids):
+        targets = self.authorizer.resolve_targets(user_ids)
+        results, allowed = {}, []
+        for user_id in user_ids:
+            target = targets.get(user_id)
+            if target is None:
+                results[user_id] = 'not_found'
+            elif not self.authorizer.may_act_on(context, target):
+                results[user_id] = 'forbidden'
+            else:
+                allowed.append(user_id)
+        return results, allowed
+
+    def _set_verified(self, user_ids, verified):
+        now = datetime.now(timezone.utc).isoformat()
+        for chunk in self.authorizer.chunks(user_ids):
+            self.client.table('profiles').update({'verified': verified, 'updated_at': now}).in_('id', chunk).execute()
+
+    def verify_users(self, token, user_ids, award_badge=True):
+        """Verify every permitted user, one update per chunk. Returns {user_id: outcome}."""
+        context = self.authorizer.authorize(token)
+        results, allowed = self._partition(context, list(user_ids))
+        if allowed:
+            self._set_verified(allowed, True)
+            if award_badge:
+                try:
+                    for chunk in self.authorizer.chunks(allowed):
+                        self.client.table('badges').insert([
+                            {
+                                'user_id': user_id,
+                                'title': 'Verified Alumni',
+                                'description': 'Profile verified by university administration',
+                                'points': 100,
+                                'badge_type': 'profile',
+                            }
+                            for user_id in chunk
+                        ]).execute()
+                except Exception as e:
+                    print(f'⚠️  Badge creation failed: {e}')
+            self.authorizer.forget_targets(allowed)
+            results.update({user_id: 'verified' for user_id in allowed})
+        return results
+
+    def reject_users(self, token, user_ids):
+        """Mark every permitted user unverified, one update per chunk. Returns {user_id: outcome}."""
+        context = self.authorizer.authorize(token)
+        results, allowed = self._partition(context, list(user_ids))
+        if allowed:
+            self._set_verified(allowed, False)
+            self.authorizer.forget_targets(allowed)
+            results.update({user_id: 'rejected' for user_id in allowed})
+        return results
+
+    def promote(self, token, email, role):
+        """Promote a user by email. Only super admins may promote."""
+        if role not in PROMOTABLE_ROLES:
+            raise AdminAuthError(400, 'Invalid role')
+        context = self.authorizer.authorize(token)
+        if context.role != 'super_admin':
+            raise AdminAuthError(403, 'Forbidden - Super admin access required')
+        rows = self.client.table('profiles').select('id').ilike('email', email).execute().data
+        if len(rows or []) != 1:
+            raise AdminAuthError(404, f'User not found with email: {email}')
+        user_id = rows[0]['id']
+        now = datetime.now(timezone.utc).isoformat()
+        self.client.table('profiles').update({'role': role, 'updated_at': now}).eq('id', user_id).execute()
+        self.authorizer.invalidate(user_id)
+        return {'id': user_id, 'email': email, 'role': role}
@@ -0,0 +1,164 @@
+"""
+Local analytics over columnar snapshots.
+
+The reports that check_database_state.py, detailed_analysis.py and
+verify_admin_dashboard.py hand-roll (role counts, pending verifications per
+university, registrations per event, mentorship status) are answered here
+from the part files written by legacylink.snapshots. Tables are memory-mapped
+once and every report is a vectorized Arrow filter / group-by, with joins
+done after aggregation on the small side - nothing touches Supabase.
+
+    python -m legacylink.snapshots --out snapshots
+    python -m legacylink.analytics --snapshots snapshots roles pending events funnel
+"""
+
+import argparse
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from legacylink.snapshots import read_snapshot
+
+DIRECTORY_ROLES = ('alumni', 'student')
+MENTORSHIP_STAGES = ('pending', 'active', 'completed', 'cancelled')
+
+
+def _grouped(columns, key, aggregations):
+    """Group-by over a few columns; parts may carry different dictionaries, so unify them first."""
+    return pa.table(columns).unify_dictionaries().group_by(key, use_threads=False).aggregate(aggregations)
+
+
+class SnapshotAnalytics:
+    """Vectorized reports over a snapshot directory."""
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self._tables = {}
+
+    def table(self, name):
+        """The latest version of a snapshot table, loaded (memory-mapped) once."""
+        data = self._tables.get(name)
+        if data is None:
+            data = self._tables[name] = read_snapshot(self.out_dir, name)
+        return data
+
+    def _university_names(self):
+        universities = self.table('universities')
+        return dict(zip(universities['id'].to_pylist(), universities['name'].to_pylist()))
+
+    def _profiles(self, university_id=None):
+        profiles = self.table('profiles')
+        if university_id is not None:
+            profiles = profiles.filter(pc.equal(profiles['university_id'], university_id))
+        return profiles
+
+    # -- reports ----------------------------------------------------------
+
+    def role_distribution(self, university_id=None):
+        """[{role, count, pending}] - the GROUP BY role query in verify_admin_dashboard.py."""
+        profiles = self._profiles(university_id)
+        grouped = _grouped({
+            'role': profiles['role'],
+            'pending': pc.invert(pc.fill_null(profiles['verified'], False)),
+        }, 'role', [([], 'count_all'), ('pending', 'sum')])
+        rows = [
+            {'role': role, 'count': count, 'pending': pending or 0}
+            for role, count, pending in zip(
+                grouped['role'].to_pylist(), grouped['count_all'].to_pylist(), grouped['pending_sum'].to_pylist()
+            )
+        ]
+        return sorted(rows, key=lambda r: -r['count'])
+
+    def pending_by_university(self, roles=DIRECTORY_ROLES):
+        """[{university_id, university, pending}] of unverified directory users, largest queue first."""
+        profiles = self.table('profiles')
+        pending = pc.and_(
+            pc.invert(pc.fill_null(profiles['verified'], False)),
+            pc.is_in(profiles['role'], value_set=pa.array(roles)),
+        )
+        queue = profiles['university_id'].filter(pending)
+        grouped = _grouped({'university_id': queue}, 'university_id', [([], 'count_all')])
+        names = self._university_names()
+        rows = [
+            {'university_id': uid, 'university': names.get(uid, 'No university'), 'pending': count}
+            for uid, count in zip(grouped['university_id'].to_pylist(), grouped['count_all'].to_pylist())
+        ]
+        return sorted(rows, key=lambda r: -r['pending'])
+
+    def registrations_per_event(self, university_id=None, limit=None):
+        """[{event_id, title, event_date, registrations, max_attendees, fill}] busiest first."""
+        registrations = self.table('event_registrations')['event_id']
+        counts = _grouped({'event_id': registrations}, 'event_id', [([], 'count_all')])
+        events = self.table('events')
+        if university_id is not None:
+            events = events.filter(pc.equal(events['university_id'], university_id))
+        joined = events.select(['id', 'title', 'event_date', 'max_attendees']).join(
+            counts, keys='id', right_keys='event_id', join_type='left outer'
+        )
+        joined = joined.set_column(
+            joined.schema.get_field_index('count_all'), 'registrations', pc.fill_null(joined['count_all'], 0)
+        )
+        order = pc.sort_indices(joined, sort_keys=[('registrations', 'descending'), ('event_date', 'ascending')])
+        if limit is not None:
+            order = order[:limit]
+        rows = joined.take(order).rename_columns(['event_id', 'title', 'event_date', 'max_attendees', 'registrations'])
+        out = rows.to_pylist()
+        for row in out:
+            row['fill'] = round(row['registrations'] / row['max_attendees'], 3) if row['max_attendees'] else None
+        return out
+
+    def mentorship_funnel(self):
+        """Requests by status plus the request -> accepted -> completed conversion rates."""
+        mentorships = self.table('mentorships')
+        grouped = _grouped({'status': mentorships['status']}, 'status', [([], 'count_all')])
+        by_status = dict.fromkeys(MENTORSHIP_STAGES, 0)
+        by_status.update(zip(grouped['status'].to_pylist(), grouped['count_all'].to_pylist()))
+        requested = sum(by_status.values())
+        accepted = by_status['active'] + by_status['completed']
+        return {
+            'by_status': by_status,
+            'requested': requested,
+            'accepted': accepted,
+            'completed': by_status['completed'],
+            'acceptance_rate': round(accepted / requested, 3) if requested else 0.0,
+            'completion_rate': round(by_status['completed'] / accepted, 3) if accepted else 0.0,
+        }
+
+
+REPORTS = {
+    'roles': ('👥 Role distribution', lambda a, args: a.role_distribution(args.university)),
+    'pending': ('⏳ Pending verifications by university', lambda a, args: a.pending_by_university()),
+    'events': ('📅 Registrations per event', lambda a, args: a.registrations_per_event(args.university, args.limit)),
+    'funnel': ('🤝 Mentorship funnel', lambda a, args: a.mentorship_funnel()),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reports over local columnar snapshots')
+    parser.add_argument('reports', nargs='*', metavar='report',
+                        help=f'any of {", ".join(sorted(REPORTS))} (default: all)')
+    parser.add_argument('--snapshots', default='snapshots', help='directory written by legacylink.snapshots')
+    parser.add_argument('--university', help='restrict roles/events to one university_id')
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+    # validated here: argparse rejects a list default when nargs='*' is combined with choices
+    unknown = [name for name in args.reports if name not in REPORTS]
+    if unknown:
+        parser.error(f'unknown reports: {", ".join(unknown)}')
+    args.reports = args.reports or sorted(REPORTS)
+
+    analytics = SnapshotAnalytics(args.snapshots)
+    for name in args.reports:
+        title, report = REPORTS[name]
+        result = report(analytics, args)
+        print(f'\n{title}:')
+        if isinstance(result, dict):
+            for key, value in result.items():
+                print(f'  {key}: {value}')
+        else:
+            for row in result[:args.limit]:
+                print(f'  • {row}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Load tests and benchmarks for the LegacyLink Python toolkit.
+
+Each module runs against the local stand-in by default:
+
+    python -m legacylink.bench.<name> --help
+"""
+
+import uuid
+
+
+def percentile(values, p):
+    """Nearest-rank percentile (p in 0..100) of an unsorted list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def latency_summary(seconds):
+    """p50/p95/p99/max in milliseconds."""
+    return {
+        'p50_ms': round(percentile(seconds, 50) * 1000, 2),
+        'p95_ms': round(percentile(seconds, 95) * 1000, 2),
+        'p99_ms': round(percentile(seconds, 99) * 1000, 2),
+        'max_ms': round(max(seconds, default=0.0) * 1000, 2),
+    }
+
+
+def seed_university(client, name='Stand-in University'):
+    domain = f'{uuid.uuid4().hex[:8]}.standin.edu'
+    return client.table('universities').insert({'name': name, 'domain': domain, 'approved': True}).execute().data[0]
+
+
+def seed_people(client, count, university_id=None, role='alumni', verified=True, chunk=1000):
+    """Insert `count` synthetic profiles and return them."""
+    people = []
+    for start in range(0, count, chunk):
+        rows = [
+            {
+                'id': str(uuid.uuid4()),
+                'email': f'user{i}@standin.edu',
+                'full_name': f'Stand-in User {i}',
+                'role': role,
+                'university_id': university_id,
+                'verified': verified,
+            }
+            for i in range(start, min(count, start + chunk))
+        ]
+        people.extend(client.table('profiles').insert(rows).execute().data)
+    return people
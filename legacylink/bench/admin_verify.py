@@ -0,0 +1,128 @@
+"""
+Load test of the admin verify flow at realistic click rates.
+
+Several admins work through the verification queue, each clicking "Verify"
+at --clicks-per-sec. Two flows are compared on the local stand-in:
+
+  route   - what /api/admin/verify/[userId] does per click: getUser, caller
+            profile, target profile, update, re-fetch, badge insert
+  cached  - AdminActions.verify_users with the authorization cache; the queue
+            page is batch-resolved once when the admin opens it
+
+    python -m legacylink.bench.admin_verify --admins 3 --clicks 60 --clicks-per-sec 8
+"""
+
+import argparse
+import threading
+import time
+from datetime import datetime, timezone
+
+from legacylink.admin_auth import ADMIN_ROLES, AdminActions, AdminAuthorizer
+from legacylink.bench import latency_summary, seed_people, seed_university
+from legacylink.standin import StandInClient
+
+
+def route_verify(client, token, target_id):
+    """Call-for-call copy of app/api/admin/verify/[userId]/route.ts."""
+    user = client.auth.get_user(token).user
+    admin = client.table('profiles').select('id, role, university_id').eq('id', user.id).single().execute().data
+    if admin['role'] not in ADMIN_ROLES:
+        raise PermissionError('Forbidden')
+    target = client.table('profiles').select('id, university_id, verified').eq('id', target_id).single().execute().data
+    if admin['role'] == 'university_admin' and target['university_id'] != admin['university_id']:
+        raise PermissionError('Cross-university action not allowed')
+    now = datetime.now(timezone.utc).isoformat()
+    client.table('profiles').update({'verified': True, 'updated_at': now}).eq('id', target_id).execute()
+    client.table('profiles').select('id, full_name, email, verified, updated_at').eq('id', target_id).single().execute()
+    client.table('badges').insert({
+        'user_id': target_id,
+        'title': 'Verified Alumni',
+        'description': 'Profile verified by university administration',
+        'points': 100,
+        'badge_type': 'profile',
+    }).execute()
+
+
+def setup(client, admins, clicks):
+    university = seed_university(client)
+    staff = seed_people(client, admins, university['id'], role='university_admin')
+    pending = seed_people(client, admins * clicks, university['id'], role='alumni', verified=False)
+    queues = [[p['id'] for p in pending[n::admins]] for n in range(admins)]
+    tokens = [client.auth.issue_token(s['id'], s['email']) for s in staff]
+    return tokens, queues
+
+
+def run_flow(flow, admins=3, clicks=60, clicks_per_sec=8.0, round_trip=0.004):
+    client = StandInClient()
+    tokens, queues = setup(client, admins, clicks)
+    client.round_trip = round_trip
+    client.calls = 0
+    actions = AdminActions(client, AdminAuthorizer(client))
+    latencies = []
+    lock = threading.Lock()
+    interval = 1.0 / clicks_per_sec
+
+    def admin_session(token, queue):
+        if flow == 'cached':
+            actions.authorizer.resolve_targets(queue)  # the admin page lists the queue once
+        next_click = time.perf_counter()
+        for target_id in queue:
+            time.sleep(max(0.0, next_click - time.perf_counter()))
+            started = time.perf_counter()
+            if flow == 'route':
+                route_verify(client, token, target_id)
+            else:
+                outcome = actions.verify_users(token, [target_id])
+                assert outcome[target_id] == 'verified', outcome
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+            next_click += interval
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=admin_session, args=pair) for pair in zip(tokens, queues)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    calls = client.calls
+    client.round_trip = 0.0
+    verified_count = client.table('profiles').select('id', count='exact').eq(
+        'role', 'alumni'
+    ).eq('verified', True).limit(1).execute().count
+    total_clicks = admins * clicks
+    return {
+        'flow': flow,
+        'clicks': total_clicks,
+        'verified': verified_count,
+        'elapsed_s': round(elapsed, 2),
+        'upstream_calls_per_click': round(calls / total_clicks, 2),
+        **latency_summary(latencies),
+        **({'authorizer': actions.authorizer.stats} if flow == 'cached' else {}),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Admin verify flow load test (route vs cached authorization)')
+    parser.add_argument('--admins', type=int, default=3)
+    parser.add_argument('--clicks', type=int, default=60, help='verifications per admin')
+    parser.add_argument('--clicks-per-sec', type=float, default=8.0, help='per admin')
+    parser.add_argument('--round-trip', type=float, default=0.004, help='simulated API latency per call (s)')
+    args = parser.parse_args()
+
+    print('🛡️ Admin verify load test (local stand-in)')
+    for flow in ('route', 'cached'):
+        report = run_flow(flow, args.admins, args.clicks, args.clicks_per_sec, args.round_trip)
+        print(f'\n  {flow}:')
+        for key, value in report.items():
+            if key != 'flow':
+                print(f'    {key}: {value}')
+        if report['verified'] != report['clicks']:
+            print(f'    ❌ expected {report["clicks"]} verified profiles')
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark for the local analytics engine at millions of rows.
+
+Writes synthetic snapshot parts straight to disk (no database), then times
+each report cold (first memory-mapped load) and warm, and cross-checks the
+role distribution against a plain Python count.
+
+    python -m legacylink.bench.analytics --profiles 2000000 --registrations 3000000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import uuid
+from collections import Counter
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from legacylink.analytics import MENTORSHIP_STAGES, SnapshotAnalytics
+from legacylink.snapshots import MANIFEST, arrow_schema
+
+ROLES = np.array(['alumni', 'student', 'university_admin', 'super_admin'])
+
+
+def _enum(values):
+    return pa.DictionaryArray.from_arrays(
+        pa.array(np.unique(values, return_inverse=True)[1].astype(np.int32)), pa.array(np.unique(values))
+    )
+
+
+def _ids(prefix, count):
+    return pa.array([f'{prefix}-{n}' for n in range(count)])
+
+
+def _timestamps(rng, count):
+    micros = 1_700_000_000_000_000 + rng.integers(0, 60_000_000_000_000, count)
+    return pa.array(micros, type=pa.timestamp('us', tz='UTC'))
+
+
+def write_synthetic(out_dir, profiles, registrations, events=5000, universities=300, seed=1):
+    rng = np.random.default_rng(seed)
+    university_ids = np.array([str(uuid.UUID(int=n)) for n in range(universities)])
+    columns = {
+        'universities': {
+            'id': pa.array(university_ids),
+            'name': pa.array([f'University {n}' for n in range(universities)]),
+            'domain': pa.array([f'u{n}.edu' for n in range(universities)]),
+            'approved': pa.array(np.ones(universities, dtype=bool)),
+        },
+        'profiles': {
+            'id': _ids('user', profiles),
+            'role': _enum(ROLES[rng.choice(4, profiles, p=[0.6, 0.38, 0.019, 0.001])]),
+            'university_id': _enum(university_ids[rng.integers(0, universities, profiles)]),
+            'verified': pa.array(rng.random(profiles) < 0.85),
+            'created_at': _timestamps(rng, profiles),
+        },
+        'events': {
+            'id': _ids('event', events),
+            'university_id': _enum(university_ids[rng.integers(0, universities, events)]),
+            'title': pa.array([f'Event {n}' for n in range(events)]),
+            'event_date': _timestamps(rng, events),
+            'max_attendees': pa.array(rng.integers(50, 2000, events).astype(np.int32)),
+        },
+        'event_registrations': {
+            'id': _ids('reg', registrations),
+            'event_id': pa.array(np.char.add('event-', rng.zipf(1.3, registrations).clip(1, events).astype(str))),
+            'user_id': pa.array(np.char.add('user-', rng.integers(0, profiles, registrations).astype(str))),
+        },
+        'mentorships': {
+            'id': _ids('mentorship', profiles // 10),
+            'status': _enum(np.array(MENTORSHIP_STAGES)[rng.choice(4, profiles // 10, p=[0.3, 0.3, 0.3, 0.1])]),
+        },
+    }
+
+    manifest = {'format': 'arrow', 'tables': {}}
+    for table, data in columns.items():
+        schema = arrow_schema(table)
+        rows = len(next(iter(data.values())))
+        arrays = [data.get(f.name, pa.nulls(rows, type=f.type)) for f in schema]
+        os.makedirs(os.path.join(out_dir, table), exist_ok=True)
+        with pa.OSFile(os.path.join(out_dir, table, 'part-00000.arrow'), 'wb') as sink:
+            with ipc.new_file(sink, schema) as writer:
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+        manifest['tables'][table] = {'watermark': None, 'watermark_ids': [], 'rows': rows,
+                                     'parts': [{'file': 'part-00000.arrow', 'rows': rows}]}
+    with open(os.path.join(out_dir, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+
+def run(profiles=2000000, registrations=3000000):
+    out_dir = tempfile.mkdtemp(prefix='legacylink-snapshots-')
+    started = time.perf_counter()
+    write_synthetic(out_dir, profiles, registrations)
+    report = {'profiles': profiles, 'registrations': registrations,
+              'write_s': round(time.perf_counter() - started, 2)}
+
+    analytics = SnapshotAnalytics(out_dir)
+    reports = {
+        'roles': analytics.role_distribution,
+        'pending': analytics.pending_by_university,
+        'events': lambda: analytics.registrations_per_event(limit=20),
+        'funnel': analytics.mentorship_funnel,
+    }
+    for name, fn in reports.items():
+        t0 = time.perf_counter()
+        fn()
+        cold = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        fn()
+        report[f'{name}_ms'] = {'cold': round(cold * 1000, 1), 'warm': round((time.perf_counter() - t0) * 1000, 1)}
+
+    roles = analytics.table('profiles')['role'].to_pylist()
+    t0 = time.perf_counter()
+    expected = Counter(roles)
+    report['python_counter_ms'] = round((time.perf_counter() - t0) * 1000, 1)
+    report['roles_match'] = {r['role']: r['count'] for r in analytics.role_distribution()} == dict(expected)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local analytics engine benchmark')
+    parser.add_argument('--profiles', type=int, default=2000000)
+    parser.add_argument('--registrations', type=int, default=3000000)
+    args = parser.parse_args()
+
+    print(f'📈 Snapshot analytics benchmark ({args.profiles} profiles, {args.registrations} registrations)')
+    report = run(args.profiles, args.registrations)
+    for key, value in report.items():
+        print(f'  {key}: {value}')
+    if not report['roles_match']:
+        print('  ❌ role distribution disagrees with a Python count')
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Throughput of the bulk loader against one-row-per-request inserts.
+
+Loads synthetic alumni (a profiles row plus an alumni_profiles row each) into
+the local stand-in with a simulated API round trip, first row by row (as
+test_manual_profile.py does) for a small sample, then through UpsertLoader,
+and re-loads part of the data to exercise conflict handling.
+
+    python -m legacylink.bench.bulk_load --alumni 1000000 --round-trip 0.02
+"""
+
+import argparse
+import random
+import time
+import uuid
+
+from legacylink.bench import seed_university
+from legacylink.bulk_load import LoadProgress, UpsertLoader
+from legacylink.standin import StandInClient
+
+COMPANIES = ['Infosys', 'TCS', 'Wipro', 'Google', 'Microsoft', 'Flipkart', 'Zomato', 'Razorpay']
+SKILLS = ['python', 'react', 'sql', 'design', 'finance', 'devops', 'go']
+
+
+def synthetic_alumni(count, university_id, seed=8):
+    rng = random.Random(seed)
+    for n in range(count):
+        user_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        yield {
+            'id': user_id,
+            'email': f'alumni{n}@bulk.edu',
+            'full_name': f'Bulk Alumni {n}',
+            'role': 'alumni',
+            'university_id': university_id,
+            'verified': False,
+        }, {
+            'user_id': user_id,
+            'skills': rng.sample(SKILLS, 2),
+            'current_company': rng.choice(COMPANIES),
+            'graduation_year': rng.randint(1995, 2024),
+            'available_for_mentoring': rng.random() < 0.3,
+        }
+
+
+def run(alumni=100000, round_trip=0.02, chunk_size=1000, workers=4, sample=200):
+    client = StandInClient()
+    university = seed_university(client)
+    client.round_trip = round_trip
+
+    people = list(synthetic_alumni(alumni + sample, university['id']))
+    single, people = people[:sample], people[sample:]
+
+    started = time.perf_counter()
+    for profile, details in single:
+        client.table('profiles').insert(profile).execute()
+        client.table('alumni_profiles').insert(details).execute()
+    per_alumnus = (time.perf_counter() - started) / sample
+
+    loader = UpsertLoader(client, chunk_size, workers)
+    started = time.perf_counter()
+    profiles = loader.load('profiles', (p for p, _ in people), 'update', LoadProgress('profiles'))
+    details = loader.load('alumni_profiles', (d for _, d in people), 'update', LoadProgress('alumni_profiles'))
+    bulk_s = time.perf_counter() - started
+
+    rerun = people[: alumni // 10]
+    changed = ({**p, 'verified': True} for p, _ in rerun)
+    skipped = loader.load('profiles', (p for p, _ in rerun), 'skip')
+    updated = loader.load('profiles', changed, 'update')
+
+    client.round_trip = 0.0
+    return {
+        'alumni': alumni,
+        'row_by_row_s_per_alumnus': round(per_alumnus, 4),
+        'row_by_row_projected_s': round(per_alumnus * alumni, 1),
+        'bulk_s': round(bulk_s, 2),
+        'bulk_alumni_per_s': round(alumni / bulk_s),
+        'profiles': profiles,
+        'alumni_profiles': details,
+        'rerun_skip_s': skipped['elapsed_s'],
+        'rerun_update_s': updated['elapsed_s'],
+        'rows_ok': _count(client, 'profiles', role='alumni') == alumni + sample
+        and _count(client, 'alumni_profiles') == alumni + sample
+        and _count(client, 'profiles', verified=True) == len(rerun),
+    }
+
+
+def _count(client, table, **eq):
+    query = client.table(table).select('*', count='exact')
+    for column, value in eq.items():
+        query = query.eq(column, value)
+    return query.limit(1).execute().count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk loader throughput (local stand-in)')
+    parser.add_argument('--alumni', type=int, default=100000)
+    parser.add_argument('--round-trip', type=float, default=0.02, help='simulated API latency per request (s)')
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    print(f'🚚 Bulk load benchmark ({args.alumni} alumni)')
+    report = run(args.alumni, args.round_trip, args.chunk_size, args.workers)
+    for key, value in report.items():
+        print(f'  {key}: {value}')
+    if not report['rows_ok']:
+        print('  ❌ row counts do not match what was loaded')
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Throughput and replay benchmark for the donation webhook pipeline.
+
+Simulates a peak giving day: N payments, a share of which the provider
+delivers more than once. Compares the current route's insert-per-webhook
+behaviour with queue + batched upsert, then replays the whole queue and checks
+that donations did not change.
+
+    python -m legacylink.bench.donation_webhooks --payments 5000 --retry-rate 0.2
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from legacylink.bench import seed_people, seed_university
+from legacylink.donation_webhooks import DonationWebhookWorker, WebhookQueue, donation_row, payment_id_for
+from legacylink.standin import StandInClient
+
+
+def make_deliveries(payments, retry_rate, donors, university_id, seed=11):
+    rng = random.Random(seed)
+    deliveries = []
+    for n in range(payments):
+        body = {
+            'id': f'pay_bench_{n}',
+            'amount': rng.choice([50000, 100000, 250000, 1000000]),
+            'notes': {'donor_id': rng.choice(donors)['id'], 'university_id': university_id},
+        }
+        deliveries.append(body)
+        if rng.random() < retry_rate:
+            deliveries.append(dict(body))
+    rng.shuffle(deliveries)
+    return deliveries
+
+
+def donation_count(client):
+    return client.table('donations').select('id', count='exact').limit(1).execute().count
+
+
+def run(payments=5000, retry_rate=0.2, round_trip=0.002, batch_size=500, baseline_sample=300):
+    client = StandInClient()
+    university = seed_university(client)
+    donors = seed_people(client, 200, university['id'])
+    deliveries = make_deliveries(payments, retry_rate, donors, university['id'])
+    client.round_trip = round_trip
+
+    # Baseline: what the route does today, one insert per delivery (sampled).
+    sample = deliveries[:baseline_sample]
+    started = time.perf_counter()
+    for body in sample:
+        client.table('donations').insert(donation_row(body, payment_id_for(body)) | {'payment_id': None}).execute()
+    baseline_per_sec = len(sample) / (time.perf_counter() - started)
+    client.round_trip = 0.0
+    client.table('donations').delete().is_('payment_id', None).execute()
+    client.round_trip = round_trip
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = WebhookQueue(os.path.join(tmp, 'webhooks.db'))
+
+        started = time.perf_counter()
+        for body in deliveries:
+            queue.append(body)
+        enqueue_elapsed = time.perf_counter() - started
+
+        worker = DonationWebhookWorker(client, queue, batch_size)
+        started = time.perf_counter()
+        worker.drain()
+        drain_elapsed = time.perf_counter() - started
+        after_drain = donation_count(client)
+
+        replayed = queue.replay()
+        started = time.perf_counter()
+        worker.drain()
+        replay_elapsed = time.perf_counter() - started
+        after_replay = donation_count(client)
+
+    return {
+        'deliveries': len(deliveries),
+        'unique_payments': payments,
+        'baseline_inserts_per_sec': round(baseline_per_sec, 1),
+        'enqueue_per_sec': round(len(deliveries) / enqueue_elapsed, 1),
+        'drain_per_sec': round(len(deliveries) / drain_elapsed, 1),
+        'replayed': replayed,
+        'replay_per_sec': round(replayed / replay_elapsed, 1),
+        'donations_after_drain': after_drain,
+        'donations_after_replay': after_replay,
+        'idempotent': after_drain == after_replay == payments,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Donation webhook queue throughput and replay benchmark')
+    parser.add_argument('--payments', type=int, default=5000)
+    parser.add_argument('--retry-rate', type=float, default=0.2)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--round-trip', type=float, default=0.002, help='simulated API latency per call (s)')
+    args = parser.parse_args()
+
+    print('💸 Donation webhook pipeline benchmark (local stand-in)')
+    report = run(args.payments, args.retry_rate, args.round_trip, args.batch_size)
+    for key, value in report.items():
+        print(f'  {key}: {value}')
+    if not report['idempotent']:
+        print('  ❌ Duplicate donations after drain/replay')
+        raise SystemExit(1)
+    print('  ✅ One donation per payment_id after retries and a full replay')
+
+
+if __name__ == '__main__':
+    main()
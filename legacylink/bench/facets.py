@@ -0,0 +1,120 @@
+"""
+Benchmark for the faceted alumni directory engine.
+
+Loads synthetic profiles ⋈ alumni_profiles rows into a FacetEngine (directly,
+no database), times typical directory filter combinations and a change batch,
+and cross-checks totals against a plain Python scan.
+
+    python -m legacylink.bench.facets --profiles 300000 --queries 100
+"""
+
+import argparse
+import random
+import time
+
+from legacylink.bench import latency_summary
+from legacylink.facets import FacetEngine
+
+SKILLS = ['python', 'react', 'go', 'sql', 'design', 'finance', 'machine learning', 'devops']
+DEGREES = ['B.Tech', 'M.Tech', 'MBA', 'B.Sc', 'M.Sc', 'PhD']
+
+
+def synthetic_directory(count, universities=200, companies=3000, seed=11):
+    rng = random.Random(seed)
+    profiles, alumni = [], {}
+    for n in range(count):
+        user_id = f'user-{n}'
+        profiles.append({
+            'id': user_id,
+            'role': rng.choice(['alumni', 'alumni', 'student']),
+            'university_id': f'uni-{rng.randrange(universities)}',
+            'verified': rng.random() < 0.8,
+            'created_at': f'2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T00:00:00Z',
+        })
+        alumni[user_id] = {
+            'graduation_year': rng.randint(2000, 2024),
+            'degree': rng.choice(DEGREES),
+            'current_company': f'company-{rng.randrange(companies)}',
+            'skills': rng.sample(SKILLS, 2),
+            'available_for_mentoring': rng.random() < 0.3,
+        }
+    return profiles, alumni
+
+
+def random_filters(rng, universities=200):
+    filters = {}
+    if rng.random() < 0.6:
+        year = rng.randint(2000, 2023)
+        filters['graduation_year'] = [year, year + 1]
+    if rng.random() < 0.5:
+        filters['skills'] = rng.sample(SKILLS, rng.randint(1, 2))
+    if rng.random() < 0.3:
+        filters['university_id'] = [f'uni-{rng.randrange(universities)}']
+    if rng.random() < 0.2:
+        filters['available_for_mentoring'] = [True]
+    return filters
+
+
+def matches(profile, extra, filters):
+    for facet, values in filters.items():
+        if facet == 'skills':
+            if not set(values) & set(extra['skills']):
+                return False
+        elif (profile.get(facet) if facet in profile else extra.get(facet)) not in values:
+            return False
+    return True
+
+
+def run(profiles=300000, queries=100, batch=5000):
+    rows, alumni = synthetic_directory(profiles)
+    started = time.perf_counter()
+    engine = FacetEngine()
+    for start in range(0, len(rows), batch):
+        engine.apply_changes(rows[start:start + batch], alumni)
+    build_s = time.perf_counter() - started
+
+    rng = random.Random(7)
+    workload = [random_filters(rng) for _ in range(queries)]
+    latencies = []
+    for filters in workload:
+        t0 = time.perf_counter()
+        engine.query(filters)
+        latencies.append(time.perf_counter() - t0)
+
+    mismatches = 0
+    for filters in workload[:5]:
+        expected = sum(1 for p in rows if matches(p, alumni[p['id']], filters))
+        mismatches += engine.query(filters, count_facets=())['total'] != expected
+
+    changes = [dict(p, verified=not p['verified']) for p in rows[:1000]]
+    t0 = time.perf_counter()
+    engine.apply_changes(changes, alumni)
+    apply_ms = (time.perf_counter() - t0) * 1000
+
+    return {
+        'profiles': profiles,
+        'build_s': round(build_s, 2),
+        'memory_mb': round(engine.memory_bytes() / 1e6, 1),
+        'query': latency_summary(latencies),
+        'apply_1000_changes_ms': round(apply_ms, 1),
+        'mismatches': mismatches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Faceted directory benchmark')
+    parser.add_argument('--profiles', type=int, default=300000)
+    parser.add_argument('--queries', type=int, default=100)
+    args = parser.parse_args()
+
+    print(f'🧭 Faceted directory benchmark ({args.profiles} synthetic profiles)')
+    report = run(args.profiles, args.queries)
+    for key, value in report.items():
+        print(f'  {key}: {value}')
+    if report['mismatches']:
+        print('  ❌ facet totals disagree with a full scan')
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
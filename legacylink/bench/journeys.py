@@ -0,0 +1,392 @@
+"""
+Mixed-traffic user journeys on the local stand-in.
+
+Virtual users pick weighted journeys and walk through them page by page,
+pausing for think time between pages. Every step issues the queries the
+matching app route or component issues (see the comment on each step), so
+the mix of embeds, per-event count queries and writes is the app's own:
+
+  browse_alumni       student: dashboard, alumni list, two alumni profiles
+  request_mentorship  student: alumni list, alumni profile, request button
+  register_event      student/alumni: dashboard, events, event page, register
+  chat                student/alumni: open a conversation, send, poll
+  admin_verify        university admin: admin queue, verify three users
+
+The number of active users follows a ramp profile of DURATION:USERS stages
+(linear from the previous stage's users to USERS over DURATION seconds, like
+k6 stages); a user past the current target finishes its journey and leaves.
+The report gives, per journey, completed/failed journeys, journeys per
+second and journey duration, and per step the latency distribution.
+
+    python -m legacylink.bench.journeys --profile ramp
+    python -m legacylink.bench.journeys --ramp 10:20,30:20,5:80,20:80,10:0 --think 0.5
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from legacylink.bench import latency_summary, seed_people, seed_university
+from legacylink.bench.admin_verify import route_verify
+from legacylink.standin import StandInClient
+
+Journey = namedtuple('Journey', 'name roles weight steps')
+# (seconds, users): ramp linearly to `users` over `seconds`
+Stage = namedtuple('Stage', 'seconds users')
+
+PROFILES = {
+    'smoke': '5:2,10:2',
+    'ramp': '15:25,30:25,15:75,30:75,10:0',
+    'spike': '10:10,2:100,20:100,2:10,15:10',
+    'soak': '30:40,600:40,30:0',
+}
+
+
+class Session:
+    """One virtual user's login and what it picked on earlier pages."""
+
+    def __init__(self, user, token, rng, peers):
+        self.user = user
+        self.token = token
+        self.rng = rng
+        self.peers = peers
+        self.alumni = []
+        self.mentor = None
+        self.event = None
+        self.registered = False
+        self.peer = None
+        self.queue = []
+
+
+def _own_profile(client, session, columns='*, university:universities(*)'):
+    return client.table('profiles').select(columns).eq('id', session.user['id']).single().execute().data
+
+
+def dashboard_page(client, session):
+    # app/dashboard/page.tsx, alumni/student branch
+    profile = _own_profile(client, session)
+    university_id = profile['university_id']
+    client.table('profiles').select('*', count='exact', head=True).eq('role', 'alumni').eq(
+        'university_id', university_id).execute()
+    client.table('events').select('*', count='exact', head=True).eq('university_id', university_id).execute()
+    # the app embeds mentor:profiles!mentor_id(university_id) here; with head=True it returns no rows either way
+    client.table('mentorships').select('*', count='exact', head=True).eq('status', 'active').execute()
+    client.table('donations').select('*', count='exact', head=True).eq('payment_status', 'completed').eq(
+        'university_id', university_id).execute()
+    client.table('profiles').select('*', count='exact', head=True).eq('verified', False).in_(
+        'role', ['alumni', 'student']).eq('university_id', university_id).execute()
+
+
+def alumni_page(client, session):
+    # app/dashboard/alumni/page.tsx
+    profile = _own_profile(client, session)
+    query = client.table('profiles').select(
+        '*, university:universities(*), alumni_profile:alumni_profiles(*)'
+    ).in_('role', ['alumni', 'student'])
+    if profile['university_id']:
+        query = query.eq('university_id', profile['university_id'])
+    rows = query.order('created_at', desc=True).execute().data
+    session.alumni = [row['id'] for row in rows if row['role'] == 'alumni']
+
+
+def alumni_profile_page(client, session):
+    # app/dashboard/alumni/[id]/page.tsx (.single() on the mentorship is an empty result, not an error, in the app)
+    alumni_id = session.rng.choice(session.alumni)
+    client.table('profiles').select('*').eq('id', session.user['id']).single().execute()
+    client.table('profiles').select(
+        '*, university:universities(*), alumni_profile:alumni_profiles(*)'
+    ).eq('id', alumni_id).single().execute()
+    client.table('badges').select('*').eq('user_id', alumni_id).order('earned_at', desc=True).execute()
+    client.table('mentorships').select('*').eq('mentor_id', alumni_id).eq(
+        'mentee_id', session.user['id']).maybe_single().execute()
+    session.mentor = alumni_id
+
+
+def request_mentorship(client, session):
+    # components/mentorship-request-button.tsx
+    existing = client.table('mentorships').select('*').eq('mentor_id', session.mentor).eq(
+        'mentee_id', session.user['id']).maybe_single().execute().data
+    if existing:
+        return
+    client.table('mentorships').insert({
+        'mentor_id': session.mentor,
+        'mentee_id': session.user['id'],
+        'status': 'pending',
+        'message': 'Would love your advice on breaking into the industry.',
+    }).execute()
+
+
+def events_page(client, session):
+    # app/dashboard/events/page.tsx: two queries per listed event
+    profile = _own_profile(client, session)
+    query = client.table('events').select('*, university:universities(*), creator:profiles!created_by(*)')
+    if profile['role'] != 'super_admin' and profile['university_id']:
+        query = query.eq('university_id', profile['university_id'])
+    events = query.order('event_date').execute().data
+    for event in events:
+        client.table('event_registrations').select('*', count='exact', head=True).eq('event_id', event['id']).execute()
+        client.table('event_registrations').select('*').eq('event_id', event['id']).eq(
+            'user_id', session.user['id']).maybe_single().execute()
+    session.event = session.rng.choice(events)['id'] if events else None
+
+
+def event_page(client, session):
+    # app/dashboard/events/[id]/page.tsx
+    client.table('profiles').select('*').eq('id', session.user['id']).single().execute()
+    client.table('events').select(
+        '*, university:universities(*), creator:profiles!created_by(*)'
+    ).eq('id', session.event).single().execute()
+    registrations = client.table('event_registrations').select('*, user:profiles(*)').eq(
+        'event_id', session.event).order('registered_at', desc=True).execute().data
+    session.registered = any(r['user_id'] == session.user['id'] for r in registrations)
+
+
+def register_event(client, session):
+    # components/event-registration-button.tsx: toggles the registration
+    if session.registered:
+        client.table('event_registrations').delete().eq('event_id', session.event).eq(
+            'user_id', session.user['id']).execute()
+        return
+    client.table('event_registrations').insert({'event_id': session.event, 'user_id': session.user['id']}).execute()
+    client.table('badges').insert({
+        'user_id': session.user['id'],
+        'title': 'Event Participant',
+        'description': 'Registered for an alumni event',
+        'points': 50,
+        'badge_type': 'event',
+    }).execute()
+
+
+def _conversation(client, session):
+    # app/api/chat/messages/route.ts GET
+    me, peer = session.user['id'], session.peer
+    return client.table('messages').select('*').or_(
+        f'and(sender_id.eq.{me},recipient_id.eq.{peer}),and(sender_id.eq.{peer},recipient_id.eq.{me})'
+    ).order('created_at').execute().data
+
+
+def chat_open(client, session):
+    while session.peer in (None, session.user['id']):
+        session.peer = session.rng.choice(session.peers)
+    client.auth.get_user(session.token)
+    _conversation(client, session)
+
+
+def chat_send(client, session):
+    # app/api/chat/messages/route.ts POST
+    client.auth.get_user(session.token)
+    client.table('messages').insert({
+        'sender_id': session.user['id'],
+        'recipient_id': session.peer,
+        'content': f'message {session.rng.randrange(10 ** 6)}',
+    }).execute()
+
+
+def admin_queue_page(client, session):
+    # app/admin/page.tsx
+    profile = _own_profile(client, session)
+    pending = client.table('profiles').select(
+        '*, university:universities(*), alumni_profile:alumni_profiles(*)'
+    ).eq('verified', False).in_('role', ['alumni', 'student']).order('created_at', desc=True).execute().data
+    client.table('profiles').select('*').eq('university_id', profile['university_id']).execute()
+    session.queue = [p['id'] for p in pending if p['university_id'] == profile['university_id']]
+
+
+def admin_verify(client, session):
+    # app/api/admin/verify/[userId]/route.ts, on a user from the queue page
+    if session.queue:
+        route_verify(client, session.token, session.queue.pop(session.rng.randrange(len(session.queue))))
+
+
+JOURNEYS = (
+    Journey('browse_alumni', ('student',), 40, (
+        ('dashboard', dashboard_page), ('alumni_list', alumni_page),
+        ('alumni_profile', alumni_profile_page), ('alumni_profile', alumni_profile_page),
+    )),
+    Journey('request_mentorship', ('student',), 15, (
+        ('alumni_list', alumni_page), ('alumni_profile', alumni_profile_page),
+        ('request_mentorship', request_mentorship),
+    )),
+    Journey('register_event', ('student', 'alumni'), 20, (
+        ('dashboard', dashboard_page), ('events', events_page), ('event', event_page),
+        ('register', register_event),
+    )),
+    Journey('chat', ('student', 'alumni'), 15, (
+        ('chat_open', chat_open), ('chat_send', chat_send), ('chat_open', chat_open),
+    )),
+    Journey('admin_verify', ('university_admin',), 10, (
+        ('admin_queue', admin_queue_page), ('verify', admin_verify), ('verify', admin_verify),
+        ('verify', admin_verify),
+    )),
+)
+
+
+def parse_ramp(text):
+    """'10:20,30:20,10:0' -> [Stage(10.0, 20), Stage(30.0, 20), Stage(10.0, 0)]."""
+    text = PROFILES.get(text, text)
+    stages = []
+    for part in text.split(','):
+        seconds, _, users = part.partition(':')
+        stages.append(Stage(float(seconds), int(users)))
+    return stages
+
+
+def target_users(stages, elapsed):
+    """Active users the ramp asks for `elapsed` seconds in."""
+    previous = 0
+    for stage in stages:
+        if elapsed < stage.seconds:
+            return round(previous + (stage.users - previous) * elapsed / stage.seconds)
+        elapsed -= stage.seconds
+        previous = stage.users
+    return previous
+
+
+def seed(client, students=300, alumni=300, admins=5, pending=2000, events=12):
+    """One university's worth of people, mentors, events and a verification queue."""
+    university = seed_university(client)
+    people = {
+        'student': seed_people(client, students, university['id'], role='student'),
+        'alumni': seed_people(client, alumni, university['id'], role='alumni'),
+        'university_admin': seed_people(client, admins, university['id'], role='university_admin'),
+    }
+    client.table('alumni_profiles').insert([
+        {'user_id': person['id'], 'graduation_year': 2010 + n % 14, 'available_for_mentoring': n % 3 == 0}
+        for n, person in enumerate(people['alumni'])
+    ]).execute()
+    seed_people(client, pending, university['id'], role='alumni', verified=False)
+    client.table('events').insert([
+        {
+            'title': f'Alumni Meetup {n}',
+            'description': 'Networking evening',
+            'event_date': f'2026-{n % 12 + 1:02d}-15T18:00:00Z',
+            'university_id': university['id'],
+            'created_by': people['university_admin'][n % admins]['id'],
+        }
+        for n in range(events)
+    ]).execute()
+    return people
+
+
+class Recorder:
+    def __init__(self):
+        self.steps = defaultdict(list)
+        self.step_errors = defaultdict(int)
+        self.journeys = defaultdict(list)
+        self.failed = defaultdict(int)
+        self.errors = defaultdict(int)
+
+    def report(self, seconds):
+        report = {}
+        for journey in JOURNEYS:
+            durations = self.journeys[journey.name]
+            steps = {}
+            for name, _ in journey.steps:
+                key = (journey.name, name)
+                steps[name] = dict(latency_summary(self.steps[key]), calls=len(self.steps[key]),
+                                   errors=self.step_errors[key])
+            report[journey.name] = {
+                'completed': len(durations),
+                'failed': self.failed[journey.name],
+                'per_s': round(len(durations) / seconds, 2) if seconds else 0.0,
+                'duration': latency_summary(durations),
+                'steps': steps,
+            }
+        return report
+
+
+async def virtual_user(client, pool, people, tokens, rng, think, stop, recorder):
+    loop = asyncio.get_running_loop()
+    weights = [journey.weight for journey in JOURNEYS]
+    peers = [p['id'] for p in people['alumni'] + people['student']]
+    while not stop.is_set():
+        journey = rng.choices(JOURNEYS, weights)[0]
+        user = rng.choice(people[rng.choice(journey.roles)])
+        session = Session(user, tokens[user['id']], rng, peers)
+        elapsed = 0.0
+        for n, (name, step) in enumerate(journey.steps):
+            if n and think:
+                await asyncio.sleep(rng.expovariate(1 / think))
+            started = time.perf_counter()
+            try:
+                await loop.run_in_executor(pool, step, client, session)
+            except Exception as e:
+                recorder.step_errors[(journey.name, name)] += 1
+                recorder.failed[journey.name] += 1
+                recorder.errors[f'{journey.name}/{name}: {type(e).__name__}: {e}'] += 1
+                break
+            latency = time.perf_counter() - started
+            recorder.steps[(journey.name, name)].append(latency)
+            elapsed += latency
+        else:
+            recorder.journeys[journey.name].append(elapsed)
+
+
+async def simulate(stages, think=1.0, round_trip=0.01, seed_value=None, path=':memory:', **population):
+    rng = random.Random(seed_value)
+    client = StandInClient(path)
+    people = seed(client, **population)
+    tokens = {p['id']: client.auth.issue_token(p['id'], p['email']) for group in people.values() for p in group}
+    client.round_trip = round_trip
+    recorder = Recorder()
+    peak = max(stage.users for stage in stages)
+    total = sum(stage.seconds for stage in stages)
+    users = []
+    with ThreadPoolExecutor(max_workers=max(1, peak)) as pool:
+        started = time.perf_counter()
+        while (elapsed := time.perf_counter() - started) < total:
+            target = target_users(stages, elapsed)
+            while len(users) < target:
+                stop = asyncio.Event()
+                task = asyncio.create_task(virtual_user(
+                    client, pool, people, tokens, random.Random(rng.random()), think, stop, recorder
+                ))
+                users.append((task, stop))
+            while len(users) > target:
+                users.pop()[1].set()
+            await asyncio.sleep(0.1)
+        for _, stop in users:
+            stop.set()
+        await asyncio.gather(*(task for task, _ in users))
+        seconds = time.perf_counter() - started
+    client.round_trip = 0.0
+    return {'seconds': round(seconds, 1), 'peak_users': peak, 'calls': client.calls,
+            'journeys': recorder.report(seconds), 'errors': dict(recorder.errors)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Weighted user journeys on the local stand-in')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='smoke', help='preset ramp profile')
+    parser.add_argument('--ramp', help='DURATION:USERS stages, e.g. 10:20,30:20,10:0 (overrides --profile)')
+    parser.add_argument('--think', type=float, default=1.0, help='mean think time between pages (s)')
+    parser.add_argument('--round-trip', type=float, default=0.01, help='simulated API latency per request (s)')
+    parser.add_argument('--students', type=int, default=300)
+    parser.add_argument('--alumni', type=int, default=300)
+    parser.add_argument('--pending', type=int, default=2000, help='unverified users in the admin queue')
+    parser.add_argument('--seed', type=int, help='random seed for journey choices')
+    parser.add_argument('--db', default=':memory:', help='stand-in SQLite path')
+    args = parser.parse_args()
+
+    stages = parse_ramp(args.ramp or args.profile)
+    print(f'🚶 Journeys: {", ".join(f"{s.users} users over {s.seconds:g}s" for s in stages)}')
+    report = asyncio.run(simulate(stages, args.think, args.round_trip, args.seed, args.db, students=args.students,
+                                  alumni=args.alumni, pending=args.pending))
+    print(f'  {report["seconds"]}s, peak {report["peak_users"]} users, {report["calls"]} requests')
+    for name, journey in report['journeys'].items():
+        print(f'  {"❌" if journey["failed"] else "✅"} {name}: {journey["completed"]} completed, '
+              f'{journey["failed"]} failed, {journey["per_s"]}/s, duration p50 {journey["duration"]["p50_ms"]} ms '
+              f'p95 {journey["duration"]["p95_ms"]} ms')
+        for step, stats in journey['steps'].items():
+            print(f'      {step}: {stats["calls"]} calls, p50 {stats["p50_ms"]} ms, p95 {stats["p95_ms"]} ms, '
+                  f'p99 {stats["p99_ms"]} ms' + (f', {stats["errors"]} errors' if stats['errors'] else ''))
+    for error, count in sorted(report['errors'].items(), key=lambda item: -item[1])[:5]:
+        print(f'  ⚠️  {count}x {error}')
+    if report['errors']:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Memory-per-row benchmark: result.data dicts vs slotted row models.
+
+Builds a synthetic PostgREST JSON payload, decodes it the way the scripts do
+(json.loads -> list of dicts) and again into Profile / Donation models, and
+reports traced bytes per row and decode time for each.
+
+    python -m legacylink.bench.models --rows 1000000
+"""
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+import uuid
+
+from legacylink.models import PAYMENT_STATUSES, ROLES, Donation, Profile
+
+
+def profile_payload(count, universities=300, seed=1):
+    rng = random.Random(seed)
+    university_ids = [str(uuid.UUID(int=n)) for n in range(universities)]
+    return json.dumps([
+        {
+            'id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'email': f'user{n}@alumni.edu',
+            'full_name': f'Alumni Member {n}',
+            'role': rng.choice(ROLES),
+            'university_id': rng.choice(university_ids),
+            'linkedin_url': None,
+            'verified': rng.random() < 0.8,
+            'created_at': '2025-09-14T10:21:33.123456+00:00',
+            'updated_at': '2025-09-14T10:21:33.123456+00:00',
+        }
+        for n in range(count)
+    ])
+
+
+def donation_payload(count, universities=300, seed=2):
+    rng = random.Random(seed)
+    university_ids = [str(uuid.UUID(int=n)) for n in range(universities)]
+    return json.dumps([
+        {
+            'id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'donor_id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'university_id': rng.choice(university_ids),
+            'amount': round(rng.uniform(100, 50000), 2),
+            'payment_status': rng.choice(PAYMENT_STATUSES),
+            'payment_id': f'pay_{n:014d}',
+            'receipt_url': None,
+            'created_at': '2025-09-14T10:21:33.123456+00:00',
+            'updated_at': '2025-09-14T10:21:33.123456+00:00',
+        }
+        for n in range(count)
+    ])
+
+
+def measure(decode, payload):
+    """(retained bytes per row, decode seconds) for decode(payload).
+
+    Timed untraced first; the traced pass only counts what the rows keep alive.
+    """
+    gc.collect()
+    started = time.perf_counter()
+    rows = decode(payload)
+    elapsed = time.perf_counter() - started
+    count = len(rows)
+    del rows
+
+    gc.collect()
+    tracemalloc.start()
+    rows = decode(payload)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return retained / count, elapsed
+
+
+def run(rows=200000):
+    report = {}
+    for name, payload, model in (
+        ('profiles', profile_payload(rows), Profile),
+        ('donations', donation_payload(rows), Donation),
+    ):
+        dict_bytes, dict_s = measure(json.loads, payload)
+        model_bytes, model_s = measure(lambda p: model.from_rows(json.loads(p)), payload)
+        report[name] = {
+            'dict_bytes_per_row': round(dict_bytes),
+            'model_bytes_per_row': round(model_bytes),
+            'saving': f'{1 - model_bytes / dict_bytes:.0%}',
+            'dict_decode_s': round(dict_s, 2),
+            'model_decode_s': round(model_s, 2),
+            'projected_1m_rows_mb': {
+                'dict': round(dict_bytes * 1e6 / 2**20),
+                'model': round(model_bytes * 1e6 / 2**20),
+            },
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Row model memory benchmark')
+    parser.add_argument('--rows', type=int, default=200000)
+    args = parser.parse_args()
+
+    print(f'🧮 Row model memory benchmark ({args.rows} rows per table)')
+    for table, stats in run(args.rows).items():
+        print(f'\n  {table}:')
+        for key, value in stats.items():
+            print(f'    {key}: {value}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark for the trigram people search at directory scale.
+
+Builds the index over synthetic profiles (directly, no database), then times
+typo-laden directory queries against it and against a leading-wildcard scan
+equivalent to ilike('full_name', '%term%').
+
+    python -m legacylink.bench.search --profiles 1000000 --queries 200
+"""
+
+import argparse
+import random
+import time
+
+from legacylink.bench import latency_summary
+from legacylink.search import PeopleSearchIndex
+
+FIRST = ['Harsh', 'Aarav', 'Priya', 'Ananya', 'Rohan', 'Vikram', 'Sneha', 'Kavya', 'Arjun', 'Ishaan',
+         'Meera', 'Neha', 'Rahul', 'Siddharth', 'Tanvi', 'Aditya', 'Divya', 'Karan', 'Pooja', 'Yash']
+LAST = ['Jeswani', 'Sharma', 'Verma', 'Iyer', 'Reddy', 'Patel', 'Gupta', 'Nair', 'Menon', 'Kulkarni',
+        'Bose', 'Chatterjee', 'Agarwal', 'Mehta', 'Joshi', 'Rao', 'Pillai', 'Banerjee', 'Desai', 'Kapoor']
+COMPANIES = ['Infosys', 'TCS', 'Wipro', 'Google', 'Microsoft', 'Flipkart', 'Zomato', 'Razorpay', 'Amazon', 'ISRO']
+SKILLS = ['python', 'react', 'machine learning', 'product management', 'finance', 'design', 'go', 'sql', 'devops']
+
+
+def typo(word, rng):
+    if len(word) < 4:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def synthetic_people(count, seed=3):
+    rng = random.Random(seed)
+    for n in range(count):
+        first, last = rng.choice(FIRST), rng.choice(LAST)
+        yield {
+            'id': f'user-{n}',
+            'full_name': f'{first} {last}',
+            'email': f'{first.lower()}.{last.lower()}{n}@alumni.edu',
+            'university_id': f'uni-{n % 50}',
+        }, {
+            'current_company': rng.choice(COMPANIES),
+            'skills': rng.sample(SKILLS, 2),
+        }
+
+
+def run(profiles=200000, queries=200):
+    started = time.perf_counter()
+    index = PeopleSearchIndex()
+    names = []
+    for profile, alumni in synthetic_people(profiles):
+        index.add_profile(profile, alumni)
+        if len(names) < 5000:
+            names.append(profile['full_name'])
+    index.compact()
+    build_s = time.perf_counter() - started
+
+    rng = random.Random(5)
+    terms = [' '.join(typo(w, rng) for w in rng.choice(names).split()) for _ in range(queries)]
+
+    latencies = []
+    for term in terms:
+        t0 = time.perf_counter()
+        index.search(term, limit=20)
+        latencies.append(time.perf_counter() - t0)
+
+    # Leading-wildcard scan (what ilike '%term%' does), on a sample of queries.
+    corpus = [p['full_name'].lower() for p, _ in synthetic_people(profiles)]
+    scan = []
+    for term in terms[:10]:
+        needle = term.split()[0].lower()
+        t0 = time.perf_counter()
+        [name for name in corpus if needle in name]
+        scan.append(time.perf_counter() - t0)
+
+    return {
+        'profiles': profiles,
+        'build_s': round(build_s, 2),
+        'postings_mb': round(index.postings_bytes() / 1e6, 1),
+        'fuzzy_query': latency_summary(latencies),
+        'ilike_scan': latency_summary(scan),
+        'sample': (terms[0], index.search(terms[0], limit=3)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Trigram people search benchmark')
+    parser.add_argument('--profiles', type=int, default=200000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f'🔍 People search benchmark ({args.profiles} synthetic profiles)')
+    for key, value in run(args.profiles, args.queries).items():
+        print(f'  {key}: {value}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""
+Signup bursts against the handle_new_user trigger.
+
+Every signup inserts into auth.users and, inside the same transaction,
+handle_new_user (scripts/010, 011) inserts the profile. This replays the flow
+test_signup_flow.py walks through (sign up, the profile appears unverified in
+the admin queue, optionally the email gets confirmed) as an open workload on
+the local stand-in: signups arrive at a fixed rate whether or not earlier ones
+have finished, and latency is measured from the scheduled arrival, so queueing
+shows up instead of being hidden by a slow client.
+
+Each step raises the arrival rate and reports signup latency, time spent in
+the trigger, time waiting for the write lock and achieved throughput. The
+sustainable rate is the highest step whose throughput kept up with arrivals
+(--keep-up) with p95 latency within --slo-ms. A final burst fires --invites
+signups at once, like a university bulk-inviting its alumni, and
+sync_existing_auth_users() reports any profile the trigger failed to create.
+
+    python -m legacylink.bench.signup_burst --rates 50,100,200,400 --signups 500
+    python -m legacylink.bench.signup_burst --invites 5000 --triggers 010 --confirm
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from legacylink.bench import latency_summary, seed_university
+from legacylink.standin import StandInClient
+from legacylink.testdata import Namespace
+
+
+def sync_existing_auth_users(client):
+    """Stand-in for public.sync_existing_auth_users(): create profiles the trigger missed."""
+    rows = client.conn.execute(
+        'SELECT au.id, au.email, au.raw_user_meta_data, au.email_confirmed_at FROM auth_users au '
+        'LEFT JOIN profiles p ON au.id = p.id WHERE p.id IS NULL'
+    ).fetchall()
+    created = errors = 0
+    for row in rows:
+        before = client.trigger_errors
+        client._handle_new_user(row)
+        if client.trigger_errors == before:
+            created += 1
+        else:
+            errors += 1
+    return [{'users_processed': len(rows), 'profiles_created': created, 'errors_encountered': errors}]
+
+
+def signup_flow(client, namespace, label, university_id, confirm):
+    """One user through test_signup_flow.py's steps. Returns the stand-in timings and whether the profile exists."""
+    response = client.auth.sign_up({
+        'email': namespace.email(label),
+        'password': 'correct horse battery staple',
+        'options': {'data': {'full_name': f'Invited Alumni {label}', 'role': 'alumni', 'university_id': university_id}},
+    })
+    user = response.user
+    timing = dict(response.timing)
+    profile = client.table('profiles').select('id, verified').eq('id', user.id).maybe_single().execute().data
+    if confirm:
+        confirmed = client.auth.admin.update_user_by_id(user.id, {'email_confirm': True}).timing
+        timing['lock_wait_s'] += confirmed['lock_wait_s']
+        timing['trigger_s'] += confirmed['trigger_s']
+    return timing, profile is not None
+
+
+async def burst(client, pool, namespace, rate, count, university_id, confirm, step):
+    """Start `count` signups at `rate` per second (all at once if rate is None)."""
+    loop = asyncio.get_running_loop()
+    latencies, triggers, lock_waits, missing, errors, finished = [], [], [], [], [], []
+
+    async def one(n, scheduled):
+        try:
+            timing, has_profile = await loop.run_in_executor(
+                pool, signup_flow, client, namespace, f'{step}-{n}', university_id, confirm
+            )
+        except Exception as e:
+            errors.append(str(e))
+            return
+        finished.append(time.perf_counter())
+        latencies.append(finished[-1] - scheduled)
+        triggers.append(timing['trigger_s'])
+        lock_waits.append(timing['lock_wait_s'])
+        if not has_profile:
+            missing.append(n)
+
+    started = time.perf_counter()
+    tasks = []
+    for n in range(count):
+        scheduled = started + (n / rate if rate else 0.0)
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(n, scheduled)))
+    await asyncio.gather(*tasks)
+    # completions per second between the first and last completion: equals the arrival rate while keeping up
+    span = max(finished) - min(finished) if len(finished) > 1 else 0.0
+    return {
+        'offered_per_s': rate,
+        'signups': count,
+        'achieved_per_s': round((len(finished) - 1) / span, 1) if span else 0.0,
+        'latency': latency_summary(latencies),
+        'trigger': latency_summary(triggers),
+        'lock_wait': latency_summary(lock_waits),
+        # without handle_new_user nothing creates profiles, so there is nothing to miss
+        'missing_profiles': len(missing) if 'on_auth_user_created' in client.auth_triggers else None,
+        'errors': len(errors),
+    }
+
+
+def sustainable(steps, keep_up, slo_ms):
+    """Highest offered rate that kept up, stayed within the p95 SLO and lost no signup or profile."""
+    best = None
+    for step in steps:
+        if (step['achieved_per_s'] >= keep_up * step['offered_per_s'] and step['latency']['p95_ms'] <= slo_ms
+                and not step['errors'] and not step['missing_profiles']):
+            best = step['offered_per_s']
+    return best
+
+
+async def run(rates=(25, 50, 100, 200, 400), signups=400, invites=5000, concurrency=32, round_trip=0.02,
+              triggers='011', confirm=False, keep_up=0.95, slo_ms=1000.0, path=':memory:'):
+    client = StandInClient(path)
+    client.set_auth_triggers(triggers)
+    client.register_rpc('sync_existing_auth_users', sync_existing_auth_users)
+    university = seed_university(client, 'Bulk Invite University')
+    client.round_trip = round_trip
+    namespace = Namespace('signup_burst')
+
+    steps = []
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for n, rate in enumerate(rates):
+            steps.append(await burst(client, pool, namespace, rate, signups, university['id'], confirm, f's{n}'))
+        invite = None
+        if invites:
+            invite = await burst(client, pool, namespace, None, invites, university['id'], confirm, 'invite')
+    sync = client.rpc('sync_existing_auth_users').execute().data[0]
+    client.round_trip = 0.0
+    return {
+        'steps': steps,
+        'sustainable_per_s': sustainable(steps, keep_up, slo_ms),
+        'invite_burst': invite,
+        'trigger_errors': client.trigger_errors,
+        'sync_existing_auth_users': sync,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Signup bursts against the handle_new_user trigger (local stand-in)')
+    parser.add_argument('--rates', default='25,50,100,200,400', help='comma-separated arrival rates (signups/s)')
+    parser.add_argument('--signups', type=int, default=400, help='signups per rate step')
+    parser.add_argument('--invites', type=int, default=5000, help='size of the final all-at-once burst (0 to skip)')
+    parser.add_argument('--concurrency', type=int, default=32, help='signups the auth server handles at once')
+    parser.add_argument('--round-trip', type=float, default=0.02, help='simulated API latency per request (s)')
+    parser.add_argument('--triggers', choices=('010', '011', 'none'), default='011',
+                        help='auth.users triggers as left by this script (none: trigger-free baseline)')
+    parser.add_argument('--confirm', action='store_true', help='confirm each email after signing up')
+    parser.add_argument('--keep-up', type=float, default=0.95, help='fraction of the offered rate a step must achieve')
+    parser.add_argument('--slo-ms', type=float, default=1000.0, help='p95 signup latency a step must stay within')
+    parser.add_argument('--db', default=':memory:', help='stand-in SQLite path')
+    args = parser.parse_args()
+
+    rates = [float(rate) for rate in args.rates.split(',') if rate]
+    triggers = None if args.triggers == 'none' else args.triggers
+    print(f'📨 Signup bursts ({args.signups} per step, triggers from {args.triggers}, '
+          f'{args.concurrency} concurrent, {args.round_trip * 1000:.0f} ms round trip)')
+    report = asyncio.run(run(rates, args.signups, args.invites, args.concurrency, args.round_trip, triggers,
+                             args.confirm, args.keep_up, args.slo_ms, args.db))
+    for step in report['steps'] + ([report['invite_burst']] if report['invite_burst'] else []):
+        label = f'{step["offered_per_s"]:g}/s' if step['offered_per_s'] else f'burst of {step["signups"]}'
+        print(f'  {label}: achieved {step["achieved_per_s"]}/s, latency p50 {step["latency"]["p50_ms"]} ms '
+              f'p95 {step["latency"]["p95_ms"]} ms, trigger p95 {step["trigger"]["p95_ms"]} ms, '
+              f'lock wait p95 {step["lock_wait"]["p95_ms"]} ms, {step["missing_profiles"] or 0} missing profiles, '
+              f'{step["errors"]} errors')
+    print(f'  trigger errors: {report["trigger_errors"]}, '
+          f'sync_existing_auth_users: {report["sync_existing_auth_users"]}')
+    if report['sustainable_per_s'] is None:
+        print('  ❌ no step kept up; lower --rates')
+        raise SystemExit(1)
+    print(f'  ✅ sustainable: {report["sustainable_per_s"]:g} signups/s')
+
+
+if __name__ == '__main__':
+    main()
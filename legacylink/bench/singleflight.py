@@ -0,0 +1,113 @@
+"""
+Request coalescing under a thundering herd.
+
+Releases many threads at once against the local stand-in (with a simulated
+API round trip) and counts upstream requests with and without the single
+flight layer:
+
+  - the admin dashboard's pending-verification query,
+  - universities right after the reference cache entry expired,
+  - identical writes, which must not be coalesced.
+
+    python -m legacylink.bench.singleflight --threads 64 --round-trip 0.05
+"""
+
+import argparse
+import threading
+import time
+
+from legacylink.bench import latency_summary, seed_people, seed_university
+from legacylink.refcache import ReferenceCache
+from legacylink.singleflight import CoalescingClient
+from legacylink.standin import StandInClient
+
+
+def _pending(client):
+    return client.table('profiles').select(
+        '*, university:universities(*)'
+    ).eq('verified', False).in_('role', ['alumni', 'student']).order('created_at', desc=True).execute()
+
+
+def herd(threads, fn):
+    """Run fn() on `threads` threads released together. Returns (results, latencies)."""
+    barrier = threading.Barrier(threads)
+    results, latencies = [None] * threads, [0.0] * threads
+
+    def worker(n):
+        barrier.wait()
+        started = time.perf_counter()
+        results[n] = fn()
+        latencies[n] = time.perf_counter() - started
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return results, latencies
+
+
+def _upstream(raw, fn):
+    before = raw.calls
+    outcome = fn()
+    return raw.calls - before, outcome
+
+
+def run(threads=64, round_trip=0.05, people=2000):
+    raw = StandInClient()
+    university = seed_university(raw)
+    seed_people(raw, people, university['id'], verified=False)
+    raw.round_trip = round_trip
+    client = CoalescingClient(raw)
+
+    direct_calls, (direct, direct_lat) = _upstream(raw, lambda: herd(threads, lambda: _pending(raw)))
+    shared_calls, (shared, shared_lat) = _upstream(raw, lambda: herd(threads, lambda: _pending(client)))
+    same = all(r.data == direct[0].data for r in shared)
+    shared[0].data[0]['full_name'] = 'mutated'
+    isolated = all(r.data[0]['full_name'] != 'mutated' for r in shared[1:])
+
+    cache = ReferenceCache(client, ttl=0.05)
+    rows = [{'university_id': university['id']}]
+    cache.resolve(rows)
+    time.sleep(0.06)  # entry expired: every thread misses at once
+    expiry_calls, _ = _upstream(raw, lambda: herd(threads, lambda: cache.resolve([dict(r) for r in rows])))
+
+    write_calls, _ = _upstream(raw, lambda: herd(
+        threads, lambda: client.table('universities').update({'approved': True}).eq('id', university['id']).execute()
+    ))
+
+    raw.round_trip = 0.0
+    return {
+        'threads': threads,
+        'pending_upstream_direct': direct_calls,
+        'pending_upstream_coalesced': shared_calls,
+        'pending_latency_direct': latency_summary(direct_lat),
+        'pending_latency_coalesced': latency_summary(shared_lat),
+        'cache_expiry_upstream': expiry_calls,
+        'identical_writes_upstream': write_calls,
+        'results_match': same,
+        'copies_isolated': isolated,
+        'stats': client.coalescing_stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Single-flight request coalescing (local stand-in)')
+    parser.add_argument('--threads', type=int, default=64)
+    parser.add_argument('--round-trip', type=float, default=0.05, help='simulated API latency per request (s)')
+    parser.add_argument('--people', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f'🐘 Thundering herd benchmark ({args.threads} threads)')
+    report = run(args.threads, args.round_trip, args.people)
+    for key, value in report.items():
+        print(f'  {key}: {value}')
+    ok = (report['results_match'] and report['copies_isolated'] and report['cache_expiry_upstream'] == 1
+          and report['identical_writes_upstream'] == args.threads)
+    if not ok:
+        print('  ❌ coalescing did not behave as expected')
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Start-up budget for the `legacylink` CLI.
+
+Times fresh interpreters running `python -m legacylink --help` and a cheap
+subcommand against an in-memory stand-in, next to a bare `python -c pass`,
+and checks that --help imports none of the heavy dependencies. Exits 1 when
+the median overhead over the bare interpreter exceeds the budget.
+
+    python -m legacylink.bench.startup --runs 20 --budget-ms 40
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from legacylink.bench import percentile
+
+HEAVY_MODULES = ('supabase', 'postgrest', 'httpx', 'dotenv', 'numpy', 'pyarrow', 'legacylink.standin',
+                 'legacylink.telemetry', 'http.server', 'concurrent.futures')
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROBE = (
+    'import sys, contextlib, io\n'
+    'from legacylink.cli import main\n'
+    'with contextlib.redirect_stdout(io.StringIO()):\n'
+    '    try:\n'
+    '        main(["--help"])\n'
+    '    except SystemExit:\n'
+    '        pass\n'
+    'print(",".join(m for m in {heavy!r} if m in sys.modules))\n'
+)
+
+
+def _time(argv, runs, env):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(argv, env=env, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def run(runs=20):
+    env = {**os.environ, 'PYTHONPATH': ROOT}
+    env.pop('LEGACYLINK_STANDIN', None)
+    baseline = _time([sys.executable, '-c', 'pass'], runs, env)
+    help_ms = _time([sys.executable, '-m', 'legacylink', '--help'], runs, env)
+    stats_ms = _time([sys.executable, '-m', 'legacylink', '--standin', ':memory:', 'stats'], runs, env)
+    imported = subprocess.run(
+        [sys.executable, '-c', PROBE.format(heavy=HEAVY_MODULES)], env=env, cwd=ROOT,
+        capture_output=True, text=True, check=True,
+    ).stdout.strip()
+    base = percentile(baseline, 50)
+    return {
+        'python_p50_ms': round(base, 1),
+        'help_p50_ms': round(percentile(help_ms, 50), 1),
+        'help_overhead_ms': round(percentile(help_ms, 50) - base, 1),
+        'standin_stats_p50_ms': round(percentile(stats_ms, 50), 1),
+        'standin_stats_overhead_ms': round(percentile(stats_ms, 50) - base, 1),
+        'heavy_imported_by_help': imported or 'none',
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='legacylink CLI start-up budget')
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--budget-ms', type=float, default=40.0, help='allowed --help overhead over bare python')
+    args = parser.parse_args()
+
+    print(f'🚀 CLI start-up ({args.runs} runs each)')
+    report = run(args.runs)
+    for key, value in report.items():
+        print(f'  {key}: {value}')
+    if report['help_overhead_ms'] > args.budget_ms or report['heavy_imported_by_help'] != 'none':
+        print(f'  ❌ over budget ({args.budget_ms} ms) or heavy modules imported')
+        raise SystemExit(1)
+    print(f'  ✅ within {args.budget_ms} ms budget')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+Peak-memory benchmark: buffered vs streaming decoding of PostgREST responses.
+
+Serves a synthetic profiles table from a local PostgREST-shaped endpoint
+(chunked JSON, honouring select/offset/limit) and reads all of it twice:
+
+  buffered  - one request, body read whole and json.loads'd (what
+              supabase-py's .execute() does)
+  streaming - stream_http() pages with the incremental array parser
+
+Rows are only counted, as a full-scan diagnostic would, and peak traced
+memory is reported for each. The parser is also checked against random
+chunk boundaries (including split multi-byte characters).
+
+    python -m legacylink.bench.streaming --rows 100000
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from urllib.request import urlopen
+
+from legacylink.streaming import iter_json_array, stream_http
+
+
+def synthetic_row(n):
+    return {
+        'id': f'{n:08d}-0000-4000-8000-000000000000',
+        'email': f'user{n}@alumni.edu',
+        'full_name': f'Alumni Member {n} – Śrī',
+        'role': 'alumni' if n % 3 else 'student',
+        'verified': n % 5 != 0,
+        'created_at': '2025-09-14T10:21:33.123456+00:00',
+    }
+
+
+def make_handler(total):
+    class PostgRESTHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            offset = int(query.get('offset', ['0'])[0])
+            limit = int(query.get('limit', [str(total)])[0])
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            rows = range(offset, min(total, offset + limit))
+            pieces, size = ['['], 1
+            for i, n in enumerate(rows):
+                piece = (',' if i else '') + json.dumps(synthetic_row(n), ensure_ascii=False)
+                pieces.append(piece)
+                size += len(piece)
+                if size > 32 * 1024:
+                    self._chunk(''.join(pieces))
+                    pieces, size = [], 0
+            pieces.append(']')
+            self._chunk(''.join(pieces))
+            self.wfile.write(b'0\r\n\r\n')
+
+        def _chunk(self, text):
+            data = text.encode()
+            self.wfile.write(f'{len(data):x}\r\n'.encode() + data + b'\r\n')
+
+        def log_message(self, *args):
+            pass
+
+    return PostgRESTHandler
+
+
+def peak(fn):
+    """(result, peak traced bytes, untraced seconds) - timed first, then traced separately."""
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    result = fn()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak_bytes, elapsed
+
+
+def check_chunk_boundaries(rows=2000, trials=20, seed=4):
+    payload = json.dumps([synthetic_row(n) for n in range(rows)], ensure_ascii=False).encode()
+    expected = json.loads(payload)
+    rng = random.Random(seed)
+    for _ in range(trials):
+        cuts = sorted(rng.sample(range(1, len(payload)), rng.randint(1, 500)))
+        chunks = [payload[a:b] for a, b in zip([0] + cuts, cuts + [len(payload)])]
+        if list(iter_json_array(chunks)) != expected:
+            return False
+    return list(iter_json_array([b' [ 1 , 2.5,\n-3e2, "x" ] '])) == [1, 2.5, -300.0, 'x']
+
+
+def run(rows=100000, page_size=50000):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(rows))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    rest_url = f'http://127.0.0.1:{server.server_address[1]}/rest/v1'
+    try:
+        def buffered():
+            with urlopen(f'{rest_url}/profiles?select=*') as response:
+                data = json.loads(response.read())
+            return sum(1 for row in data if not row['verified'])
+
+        def streaming():
+            pending, offset = 0, 0
+            while True:
+                count = 0
+                for row in stream_http(rest_url, 'bench', 'profiles', offset=offset, limit=page_size):
+                    count += 1
+                    pending += not row['verified']
+                if count < page_size:
+                    return pending
+                offset += page_size
+
+        buffered_result, buffered_peak, buffered_s = peak(buffered)
+        streaming_result, streaming_peak, streaming_s = peak(streaming)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return {
+        'rows': rows,
+        'buffered_peak_mb': round(buffered_peak / 2**20, 1),
+        'streaming_peak_mb': round(streaming_peak / 2**20, 1),
+        'buffered_s': round(buffered_s, 2),
+        'streaming_s': round(streaming_s, 2),
+        'results_match': buffered_result == streaming_result,
+        'chunk_boundaries_ok': check_chunk_boundaries(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Buffered vs streaming PostgREST decoding')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--page-size', type=int, default=50000)
+    args = parser.parse_args()
+
+    print(f'🌊 Streaming decode benchmark ({args.rows} rows)')
+    report = run(args.rows, args.page_size)
+    for key, value in report.items():
+        print(f'  {key}: {value}')
+    if not (report['results_match'] and report['chunk_boundaries_ok']):
+        print('  ❌ streaming parser disagrees with json.loads')
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
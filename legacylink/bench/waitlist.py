@@ -0,0 +1,137 @@
+"""
+Load test for the waitlist promotion engine on the local stand-in.
+
+Fills events to capacity, queues a waitlist behind them, then cancels
+registrations from many threads at once and checks that:
+  - no event ever ends up over max_attendees,
+  - promotions follow waitlist created_at order,
+  - nobody is both registered and still waitlisted.
+
+    python -m legacylink.bench.waitlist --events 5 --capacity 200 --waitlist 300 --threads 16
+"""
+
+import argparse
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from legacylink.bench import latency_summary, seed_people, seed_university
+from legacylink.standin import StandInClient
+from legacylink.waitlist import WaitlistEngine
+
+
+def setup(client, events, capacity, waitlist):
+    university = seed_university(client)
+    people = seed_people(client, capacity + waitlist, university['id'])
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    plan = []
+    for n in range(events):
+        event = client.table('events').insert({
+            'university_id': university['id'],
+            'title': f'Load test event {n}',
+            'event_date': '2026-12-01T10:00:00Z',
+            'max_attendees': capacity,
+        }).execute().data[0]
+        registered = [p['id'] for p in people[:capacity]]
+        queued = [p['id'] for p in people[capacity:]]
+        client.table('event_registrations').insert(
+            [{'event_id': event['id'], 'user_id': uid} for uid in registered]
+        ).execute()
+        client.table('event_waitlist').insert([
+            {'event_id': event['id'], 'user_id': uid, 'created_at': (base + timedelta(seconds=i)).isoformat()}
+            for i, uid in enumerate(queued)
+        ]).execute()
+        plan.append((event['id'], registered, queued))
+    return plan
+
+
+def run(events=5, capacity=200, waitlist=300, threads=16, cancel_fraction=0.5, round_trip=0.001, seed=7):
+    client = StandInClient(round_trip=0.0)
+    plan = setup(client, events, capacity, waitlist)
+    client.round_trip = round_trip
+    engine = WaitlistEngine(client)
+
+    rng = random.Random(seed)
+    work = []
+    for event_id, registered, _ in plan:
+        for uid in rng.sample(registered, int(len(registered) * cancel_fraction)):
+            work.append((event_id, uid))
+    rng.shuffle(work)
+
+    latencies = []
+    latencies_lock = threading.Lock()
+    cursor = iter(work)
+    cursor_lock = threading.Lock()
+
+    def worker():
+        while True:
+            with cursor_lock:
+                item = next(cursor, None)
+            if item is None:
+                return
+            started = time.perf_counter()
+            engine.cancel(*item)
+            elapsed = time.perf_counter() - started
+            with latencies_lock:
+                latencies.append(elapsed)
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    failures = []
+    for event_id, _, queued in plan:
+        regs = client.table('event_registrations').select('user_id').eq('event_id', event_id).execute().data
+        still_waiting = client.table('event_waitlist').select('user_id').eq('event_id', event_id).execute().data
+        registered_ids = {r['user_id'] for r in regs}
+        waiting_ids = {r['user_id'] for r in still_waiting}
+        if len(registered_ids) > capacity:
+            failures.append(f'{event_id}: {len(registered_ids)} registered > capacity {capacity}')
+        if registered_ids & waiting_ids:
+            failures.append(f'{event_id}: users both registered and waitlisted')
+        promoted = [uid for uid in queued if uid in registered_ids]
+        if promoted != queued[:len(promoted)]:
+            failures.append(f'{event_id}: promotions out of FIFO order')
+        if engine.seats_left(event_id) != capacity - len(registered_ids):
+            failures.append(f'{event_id}: live counter drifted from event_registrations')
+
+    return {
+        'cancellations': len(work),
+        'promoted': engine.promoted_total,
+        'threads': threads,
+        'elapsed_s': round(elapsed, 3),
+        'cancellations_per_sec': round(len(work) / elapsed, 1) if elapsed else 0.0,
+        **latency_summary(latencies),
+        'failures': failures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent cancellation load test for WaitlistEngine')
+    parser.add_argument('--events', type=int, default=5)
+    parser.add_argument('--capacity', type=int, default=200)
+    parser.add_argument('--waitlist', type=int, default=300)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--cancel-fraction', type=float, default=0.5)
+    parser.add_argument('--round-trip', type=float, default=0.001, help='simulated API latency per call (s)')
+    args = parser.parse_args()
+
+    print('⏳ Waitlist promotion load test (local stand-in)')
+    report = run(args.events, args.capacity, args.waitlist, args.threads, args.cancel_fraction, args.round_trip)
+    for key, value in report.items():
+        if key != 'failures':
+            print(f'  {key}: {value}')
+    if report['failures']:
+        for failure in report['failures']:
+            print(f'  ❌ {failure}')
+        raise SystemExit(1)
+    print('  ✅ Capacity, FIFO order and counters held under concurrent cancellations')
+
+
+if __name__ == '__main__':
+    main()
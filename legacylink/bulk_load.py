@@ -0,0 +1,269 @@
+"""
+Bulk loader for profiles, alumni_profiles and events.
+
+Seeding scripts (add_realistic_alumni_data.sql, /api/debug/create-test-users,
+test_manual_profile.py) insert one row per statement or request. This loader
+streams rows from CSV / JSON lines / JSON files and writes them in large
+batches:
+
+  - with a database URL (--dsn or SUPABASE_DB_URL) it COPYs each batch into a
+    temporary staging table and merges it with one INSERT ... SELECT ... ON
+    CONFLICT, one transaction per batch (needs psycopg 3),
+  - otherwise it sends chunked multi-row upserts through PostgREST, a few
+    requests in flight at a time, paced and retried by ratelimit.py so 429 /
+    503 responses slow the load down instead of failing it.
+
+Conflicts on the primary key either update the existing row (`update`), keep
+it (`skip`) or fail the batch (`error`). Note profiles.id references
+auth.users(id) on a real project, so profiles for users that do not exist in
+auth yet will be rejected by the foreign key.
+
+    python -m legacylink.bulk_load profiles seed/profiles.csv --conflict skip
+    python -m legacylink.bulk_load alumni_profiles seed/alumni.jsonl --dsn "$SUPABASE_DB_URL"
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from itertools import islice
+
+from legacylink.client import STANDIN_ENV, get_client, load_env
+from legacylink.ratelimit import rate_limited
+from legacylink.streaming import iter_json_array
+
+DSN_ENV = 'SUPABASE_DB_URL'
+CONFLICT_MODES = ('update', 'skip', 'error')
+
+# table -> (primary key, loadable columns)
+LOAD_TABLES = {
+    'profiles': ('id', (
+        'id', 'email', 'full_name', 'role', 'university_id', 'linkedin_url', 'verified', 'created_at', 'updated_at',
+    )),
+    'alumni_profiles': ('user_id', (
+        'user_id', 'skills', 'current_job', 'current_company', 'achievements', 'photo_url', 'graduation_year',
+        'degree', 'bio', 'available_for_mentoring', 'created_at', 'updated_at',
+    )),
+    'events': ('id', (
+        'id', 'university_id', 'title', 'description', 'event_date', 'location', 'max_attendees', 'created_by',
+        'created_at', 'updated_at',
+    )),
+}
+
+CSV_TYPES = {
+    'verified': 'bool', 'available_for_mentoring': 'bool',
+    'graduation_year': 'int', 'max_attendees': 'int',
+    'skills': 'list',
+}
+
+
+def _csv_value(column, value):
+    if value == '':
+        return None
+    kind = CSV_TYPES.get(column)
+    if kind == 'bool':
+        return value.strip().lower() in ('true', 't', '1', 'yes')
+    if kind == 'int':
+        return int(value)
+    if kind == 'list':
+        return json.loads(value) if value.startswith('[') else [s.strip() for s in value.split(';') if s.strip()]
+    return value
+
+
+def read_rows(path):
+    """Stream rows from .csv, .jsonl/.ndjson or .json (a top-level array)."""
+    if path.endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as f:
+            for record in csv.DictReader(f):
+                yield {column: _csv_value(column, value) for column, value in record.items()}
+    elif path.endswith(('.jsonl', '.ndjson')):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, 'rb') as f:
+            yield from iter_json_array(iter(lambda: f.read(256 * 1024), b''))
+
+
+def batched(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+class LoadProgress:
+    """Counts loaded rows and prints throughput every `interval` seconds."""
+
+    def __init__(self, table, interval=5.0, quiet=False):
+        self.table = table
+        self.interval = interval
+        self.quiet = quiet
+        self.rows = 0
+        self.batches = 0
+        self.started = time.perf_counter()
+        self._last_report = self.started
+
+    def add(self, count):
+        self.rows += count
+        self.batches += 1
+        now = time.perf_counter()
+        if not self.quiet and now - self._last_report >= self.interval:
+            self._last_report = now
+            print(f'  ⏳ {self.table}: {self.rows:,} rows ({self.rate:,.0f} rows/s)')
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return {
+            'table': self.table,
+            'rows': self.rows,
+            'batches': self.batches,
+            'elapsed_s': round(self.elapsed, 2),
+            'rows_per_s': round(self.rate),
+        }
+
+
+def _clean(table, rows):
+    """Keep only loadable columns, and only the last row for a repeated key.
+
+    Postgres rejects an ON CONFLICT statement that touches the same row twice.
+    """
+    key, columns = LOAD_TABLES[table]
+    latest = {row[key]: row for row in rows}
+    return [{c: row[c] for c in columns if c in row} for row in latest.values()]
+
+
+class UpsertLoader:
+    """Chunked multi-row upserts through PostgREST (or the stand-in)."""
+
+    def __init__(self, client, chunk_size=1000, workers=4):
+        self.client = client
+        self.chunk_size = chunk_size
+        self.workers = workers
+
+    def _write(self, table, rows, conflict):
+        key = LOAD_TABLES[table][0]
+        query = self.client.table(table)
+        if conflict == 'error':
+            query = query.insert(rows)
+        else:
+            if conflict == 'update' and 'updated_at' in LOAD_TABLES[table][1]:
+                # Like merge_sql's updated_at = NOW(); every row gets it so the batch keeps one column set
+                now = datetime.now(timezone.utc).isoformat()
+                rows = [row if 'updated_at' in row else {**row, 'updated_at': now} for row in rows]
+            query = query.upsert(rows, on_conflict=key, ignore_duplicates=conflict == 'skip')
+        query.execute()
+        return len(rows)
+
+    def load(self, table, rows, conflict='update', progress=None):
+        progress = progress or LoadProgress(table, quiet=True)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = set()
+            for batch in batched(rows, self.chunk_size):
+                if len(pending) >= self.workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        progress.add(future.result())
+                pending.add(pool.submit(self._write, table, _clean(table, batch), conflict))
+            for future in pending:
+                progress.add(future.result())
+        return progress.summary()
+
+
+class CopyLoader:
+    """COPY FROM STDIN into a staging table, merged with one INSERT ... ON CONFLICT per batch."""
+
+    def __init__(self, dsn, chunk_size=50000):
+        import psycopg
+
+        self.connection = psycopg.connect(dsn, autocommit=True)
+        self.chunk_size = chunk_size
+
+    def close(self):
+        self.connection.close()
+
+    @staticmethod
+    def merge_sql(table, columns, conflict):
+        key = LOAD_TABLES[table][0]
+        column_list = ', '.join(columns)
+        sql = f'INSERT INTO public.{table} ({column_list}) SELECT {column_list} FROM _bulk_stage'
+        if conflict == 'error':
+            return sql
+        updates = [f'{c} = EXCLUDED.{c}' for c in columns if c != key] if conflict == 'update' else []
+        if updates and 'updated_at' not in columns and 'updated_at' in LOAD_TABLES[table][1]:
+            updates.append('updated_at = NOW()')
+        if not updates:
+            return f'{sql} ON CONFLICT ({key}) DO NOTHING'
+        return f'{sql} ON CONFLICT ({key}) DO UPDATE SET {", ".join(updates)}'
+
+    def _write(self, table, rows, conflict):
+        rows = _clean(table, rows)
+        columns = [c for c in LOAD_TABLES[table][1] if any(c in row for row in rows)]
+        with self.connection.transaction(), self.connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TEMP TABLE _bulk_stage (LIKE public.{table} INCLUDING DEFAULTS) ON COMMIT DROP'
+            )
+            with cursor.copy(f'COPY _bulk_stage ({", ".join(columns)}) FROM STDIN') as copy:
+                for row in rows:
+                    copy.write_row([row.get(c) for c in columns])
+            cursor.execute(self.merge_sql(table, columns, conflict))
+        return len(rows)
+
+    def load(self, table, rows, conflict='update', progress=None):
+        progress = progress or LoadProgress(table, quiet=True)
+        for batch in batched(rows, self.chunk_size):
+            progress.add(self._write(table, batch, conflict))
+        return progress.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk load profiles / alumni_profiles / events')
+    parser.add_argument('table', choices=sorted(LOAD_TABLES))
+    parser.add_argument('path', help='.csv, .jsonl/.ndjson or .json file')
+    parser.add_argument('--conflict', choices=CONFLICT_MODES, default='update')
+    parser.add_argument('--dsn', help=f'Postgres URL for COPY (default: ${DSN_ENV}; PostgREST upserts if unset)')
+    parser.add_argument('--chunk-size', type=int, help='rows per batch (default 50000 COPY / 1000 upsert)')
+    parser.add_argument('--workers', type=int, default=4, help='concurrent upsert requests')
+    parser.add_argument('--rps', type=float, default=20.0, help='upsert request budget per second (PostgREST)')
+    args = parser.parse_args()
+
+    if not args.dsn and not os.getenv(STANDIN_ENV):
+        load_env()
+    dsn = args.dsn or os.getenv(DSN_ENV)
+    if dsn:
+        loader = CopyLoader(dsn, args.chunk_size or 50000)
+        mode = 'COPY'
+    else:
+        client = rate_limited(get_client(service_role=True), default_budget=args.rps,
+                              concurrency=args.workers, max_concurrency=args.workers)
+        loader = UpsertLoader(client, args.chunk_size or 1000, args.workers)
+        mode = 'PostgREST upserts'
+
+    print(f'🚚 Loading {args.table} from {args.path} via {mode} (conflict: {args.conflict})')
+    progress = LoadProgress(args.table)
+    try:
+        summary = loader.load(args.table, read_rows(args.path), args.conflict, progress)
+    except Exception as e:
+        print(f'❌ Load failed after {progress.rows:,} rows: {e}')
+        raise SystemExit(1)
+    finally:
+        if isinstance(loader, CopyLoader):
+            loader.close()
+    print(f'✅ {summary["rows"]:,} rows in {summary["elapsed_s"]}s ({summary["rows_per_s"]:,} rows/s)')
+
+
+if __name__ == '__main__':
+    main()
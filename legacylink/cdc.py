@@ -0,0 +1,200 @@
+"""
+Change-data-capture consumer over the change outbox.
+
+Triggers from scripts/014_change_outbox.sql append every insert, update and
+delete on profiles, alumni_profiles, events and mentorships to change_outbox
+(universities too with scripts/016_capture_universities.sql).
+ChangeConsumer reads it in id order, hands each batch to the registered
+handlers (filtered to the tables they asked for) and then checkpoints the
+last id to a small JSON file, so a restart resumes where it stopped.
+
+Delivery is at-least-once: if a handler raises, the checkpoint does not move
+and the whole batch is offered again, so handlers must be idempotent. ids are
+allocated before commit, so a gap can be a transaction still in flight; the
+consumer waits up to `gap_timeout` seconds for it before moving past.
+
+The outbox was chosen over logical replication because it works through
+PostgREST with the service-role key alone (no replication slot or direct
+database connection) and is mirrored by the local stand-in
+(StandInClient.enable_change_capture()).
+
+    python -m legacylink.cdc --checkpoint cdc_checkpoint.json --follow
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from legacylink.client import get_client
+
+CAPTURED_TABLES = ('profiles', 'alumni_profiles', 'events', 'mentorships', 'universities')
+PROFILE_TABLES = ('profiles', 'alumni_profiles')
+
+Change = namedtuple('Change', 'id table op row_id record old_record changed_at')
+
+
+class Checkpoint:
+    """Last processed outbox id, persisted atomically (or kept in memory without a path)."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.position = None
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.position = json.load(f)['position']
+
+    def save(self, position):
+        self.position = position
+        if not self.path:
+            return
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'position': position, 'saved_at': datetime.now(timezone.utc).isoformat()}, f)
+        os.replace(tmp, self.path)
+
+
+class ChangeConsumer:
+    """Reads change_outbox in order and delivers batches to registered handlers."""
+
+    def __init__(self, client, checkpoint_path=None, batch_size=500, gap_timeout=10.0):
+        self.client = client
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.batch_size = batch_size
+        self.gap_timeout = gap_timeout
+        self._handlers = []
+        self._gap = None
+        self._gap_since = 0.0
+        self.stats = {'batches': 0, 'changes': 0, 'ids_skipped': 0}
+
+    @property
+    def position(self):
+        return self.checkpoint.position
+
+    def register(self, handler, tables=None):
+        """handler(changes) receives Change tuples in id order, only for `tables` if given."""
+        self._handlers.append((handler, frozenset(tables) if tables else None))
+        return handler
+
+    def _fetch(self):
+        query = self.client.table('change_outbox').select('*')
+        if self.position is not None:
+            query = query.gt('id', self.position)
+        rows = query.order('id').limit(self.batch_size).execute().data or []
+        return [
+            Change(r['id'], r['table_name'], r['op'], r['row_id'], r.get('record'), r.get('old_record'),
+                   r.get('changed_at'))
+            for r in rows
+        ]
+
+    def _ready(self, changes):
+        """The prefix of changes that can be delivered without skipping a possibly in-flight id."""
+        if not changes:
+            return []
+        expected = changes[0].id if self.position is None else self.position + 1
+        ready = []
+        for change in changes:
+            if change.id != expected:
+                now = time.monotonic()
+                if self._gap != expected:
+                    self._gap, self._gap_since = expected, now
+                if now - self._gap_since < self.gap_timeout:
+                    break
+                self.stats['ids_skipped'] += change.id - expected
+                self._gap = None
+            ready.append(change)
+            expected = change.id + 1
+        return ready
+
+    def poll_once(self):
+        """Deliver at most one batch. Returns the number of changes delivered."""
+        ready = self._ready(self._fetch())
+        if not ready:
+            return 0
+        for handler, tables in self._handlers:
+            subset = ready if tables is None else [c for c in ready if c.table in tables]
+            if subset:
+                handler(subset)
+        self.checkpoint.save(ready[-1].id)
+        self.stats['batches'] += 1
+        self.stats['changes'] += len(ready)
+        return len(ready)
+
+    def drain(self):
+        """Deliver until caught up. Returns the number of changes delivered."""
+        total = 0
+        while True:
+            delivered = self.poll_once()
+            total += delivered
+            if delivered < self.batch_size:
+                return total
+
+    def run(self, interval=1.0, stop=None):
+        """Poll until `stop` (a threading.Event) is set, sleeping only when caught up."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            if self.poll_once() < self.batch_size:
+                stop.wait(interval)
+
+
+def profile_index_handler(client, target, lookup_chunk=200):
+    """Handler keeping a PeopleSearchIndex or FacetEngine current (anything with apply_changes()).
+
+    Register it for PROFILE_TABLES.
+
+    Changed users are re-read in batches, so the index always sees current rows
+    however many changes a user had in the batch.
+    """
+
+    def handle(changes):
+        changes = [c for c in changes if c.table in PROFILE_TABLES]
+        deleted = {c.row_id for c in changes if c.table == 'profiles' and c.op == 'DELETE'}
+        touched = list(dict.fromkeys(c.row_id for c in changes if c.row_id not in deleted))
+        profiles, alumni = [], {}
+        for start in range(0, len(touched), lookup_chunk):
+            chunk = touched[start:start + lookup_chunk]
+            profiles.extend(client.table('profiles').select('*').in_('id', chunk).execute().data or [])
+            for row in client.table('alumni_profiles').select('*').in_('user_id', chunk).execute().data or []:
+                alumni[row['user_id']] = row
+        profiles.extend({'id': user_id, 'deleted': True} for user_id in deleted)
+        target.apply_changes(profiles, alumni)
+
+    return handle
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tail the change outbox')
+    parser.add_argument('--checkpoint', default='cdc_checkpoint.json', help='position file')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--tables', help=f'comma-separated subset of: {", ".join(CAPTURED_TABLES)}')
+    parser.add_argument('--follow', action='store_true', help='keep polling instead of exiting when caught up')
+    parser.add_argument('--interval', type=float, default=1.0)
+    args = parser.parse_args()
+
+    client = get_client(service_role=True)
+    if hasattr(client, 'enable_change_capture'):
+        client.enable_change_capture()
+    consumer = ChangeConsumer(client, args.checkpoint, args.batch_size)
+
+    def show(changes):
+        for change in changes:
+            print(f'  🔄 #{change.id} {change.changed_at} {change.table} {change.op} {change.row_id}')
+
+    consumer.register(show, args.tables.split(',') if args.tables else None)
+
+    print(f'📡 Reading change_outbox from position {consumer.position}')
+    try:
+        if args.follow:
+            consumer.run(args.interval)
+        else:
+            consumer.drain()
+    except KeyboardInterrupt:
+        pass
+    print(f'✅ {consumer.stats["changes"]} changes, checkpoint at {consumer.position}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,395 @@
+"""
+High-throughput event check-in ingestion.
+
+/api/events/[id]/checkin pays an auth + insert round trip per QR scan. This
+service buffers scans in a bounded in-memory queue and flushes them to
+event_checkins as multi-row upserts on UNIQUE(event_id, user_id), so a burst of
+thousands of scans becomes a handful of writes. Repeat scans are acknowledged
+idempotently without touching the database.
+
+Scans are validated before they are acknowledged: the user id must be a UUID
+and the event must exist (looked up once per event, then cached). Rows the
+database still rejects at flush time (e.g. a user_id with no profile) are
+isolated by bisecting the batch and written to a dead-letter file, so one bad
+scan never holds back the rest of its batch.
+
+Run it next to the scanners:
+
+    CHECKIN_SCANNER_TOKEN=... python -m legacylink.checkins --port 8787
+
+POST /events/<event_id>/checkin   {"user_id": "..."}   -> {"success": true, "duplicate": false}
+GET  /metrics                                          -> scans/sec, flush latency, queue depth
+"""
+
+import argparse
+import hmac
+import json
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from legacylink.client import get_client
+from legacylink.ratelimit import rejects_rows
+
+CHECKIN_PATH = re.compile(r'^/events/([0-9a-fA-F-]{36})/checkin/?$')
+
+
+class CheckinQueueFull(Exception):
+    """Raised when the pending-scan buffer is full; scanners should retry shortly."""
+
+
+class CheckinRejected(Exception):
+    """Raised for scans that can never be written (malformed user id, unknown event)."""
+
+
+class CheckinIngestor:
+    """Buffers check-in scans and flushes them as batched upserts.
+
+    submit() is safe to call from many threads. A background flusher drains the
+    queue every flush_interval seconds or as soon as batch_size scans are waiting.
+    Repeat-scan memory expires seen_ttl seconds after the first scan.
+    """
+
+    def __init__(self, client, max_pending=10000, batch_size=500, flush_interval=0.25, rate_window=10.0,
+                 seen_ttl=6 * 3600.0, dead_letter_path=None):
+        self.client = client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.rate_window = rate_window
+        self.seen_ttl = seen_ttl
+        self.dead_letter_path = dead_letter_path
+        self.dead_letters = []
+        self._queue = queue.Queue(maxsize=max_pending)
+        # (event_id, user_id) -> monotonic time of the first scan, oldest first
+        self._seen = OrderedDict()
+        self._events = set()
+        self._seen_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+        self.started_at = time.monotonic()
+        self.scans_total = 0
+        self.duplicates_total = 0
+        self.rejected_total = 0
+        self.written_total = 0
+        self.flush_errors = 0
+        self._scan_times = deque()
+        self._flush_latencies = deque(maxlen=1000)
+
+    # -- intake -----------------------------------------------------------
+
+    def submit(self, event_id, user_id, checked_in_at=None, timeout=0.5):
+        """Accept one scan. Returns {'accepted': True, 'duplicate': bool}.
+
+        Raises CheckinRejected for a malformed user id or unknown event, and
+        CheckinQueueFull if the buffer stays full for `timeout` seconds.
+        """
+        try:
+            event_id, user_id = str(uuid.UUID(event_id)), str(uuid.UUID(user_id))
+        except (TypeError, ValueError, AttributeError):
+            with self._seen_lock:
+                self.rejected_total += 1
+            raise CheckinRejected('event_id and user_id must be UUIDs')
+        key = (event_id, user_id)
+        now = time.monotonic()
+        with self._seen_lock:
+            self.scans_total += 1
+            self._scan_times.append(now)
+            self._trim_scan_times(now)
+            self._expire_seen(now)
+            if key in self._seen:
+                self.duplicates_total += 1
+                return {'accepted': True, 'duplicate': True}
+        self._check_event(event_id)
+        with self._seen_lock:
+            if key in self._seen:
+                self.duplicates_total += 1
+                return {'accepted': True, 'duplicate': True}
+            self._seen[key] = now
+
+        row = {
+            'event_id': event_id,
+            'user_id': user_id,
+            'checked_in_at': checked_in_at or datetime.now(timezone.utc).isoformat(),
+        }
+        try:
+            self._queue.put(row, timeout=timeout)
+        except queue.Full:
+            with self._seen_lock:
+                self._seen.pop(key, None)
+            raise CheckinQueueFull(f'{self._queue.maxsize} scans pending')
+
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+        return {'accepted': True, 'duplicate': False}
+
+    def forget(self, event_id):
+        """Drop the duplicate-scan memory for an event once it has ended."""
+        with self._seen_lock:
+            for key in [key for key in self._seen if key[0] == event_id]:
+                del self._seen[key]
+            self._events.discard(event_id)
+
+    def _check_event(self, event_id):
+        """Reject scans for events that do not exist; known events are cached."""
+        if event_id in self._events:
+            return
+        found = self.client.table('events').select('id').eq('id', event_id).execute().data
+        if not found:
+            with self._seen_lock:
+                self.rejected_total += 1
+            raise CheckinRejected(f'Unknown event {event_id}')
+        with self._seen_lock:
+            self._events.add(event_id)
+
+    def _expire_seen(self, now):
+        cutoff = now - self.seen_ttl
+        while self._seen:
+            key, first_scan = next(iter(self._seen.items()))
+            if first_scan >= cutoff:
+                break
+            del self._seen[key]
+
+    # -- flushing ---------------------------------------------------------
+
+    def flush(self):
+        """Write everything currently buffered. Returns the number of new check-ins.
+
+        A batch the database rejects is bisected until the offending rows are
+        alone, and those are dead-lettered. Any other failure (network, 5xx)
+        re-queues the unwritten rows for the next flush.
+        """
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._drain(self.batch_size)
+                if not batch:
+                    break
+                inserted, failed = self._write(batch)
+                written += inserted
+                if failed:
+                    break
+        self.written_total += written
+        return written
+
+    def _write(self, batch):
+        """Upsert `batch`, bisecting around rejected rows. Returns (inserted, transient failure)."""
+        inserted = 0
+        pending = [batch]
+        while pending:
+            rows = pending.pop()
+            started = time.perf_counter()
+            try:
+                result = self.client.table('event_checkins').upsert(
+                    rows, on_conflict='event_id,user_id', ignore_duplicates=True
+                ).execute()
+            except Exception as e:
+                self.flush_errors += 1
+                if not rejects_rows(e):
+                    unwritten = [row for part in pending for row in part] + rows
+                    self._requeue(unwritten)
+                    print(f'❌ Check-in flush failed ({len(unwritten)} scans re-queued): {e}')
+                    return inserted, True
+                if len(rows) == 1:
+                    self._dead_letter(rows, e)
+                else:
+                    middle = len(rows) // 2
+                    pending.extend([rows[middle:], rows[:middle]])
+                continue
+            self._flush_latencies.append(time.perf_counter() - started)
+            count = len(result.data or [])
+            inserted += count
+            # Rows already in event_checkins (e.g. scanned before a restart) are duplicates too.
+            with self._seen_lock:
+                self.duplicates_total += len(rows) - count
+        return inserted, False
+
+    def _dead_letter(self, rows, error):
+        """Set rows aside that cannot be written; a rescan of the same user retries them."""
+        entries = [dict(row, error=str(error)) for row in rows]
+        with self._seen_lock:
+            for row in rows:
+                self._seen.pop((row['event_id'], row['user_id']), None)
+            self.dead_letters.extend(entries)
+        if self.dead_letter_path:
+            with open(self.dead_letter_path, 'a') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + '\n')
+        print(f'⚠️  {len(rows)} check-in(s) dead-lettered: {error}')
+
+    def _drain(self, limit):
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _requeue(self, batch):
+        overflow = []
+        for row in batch:
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                overflow.append(row)
+        if overflow:
+            self._dead_letter(overflow, 'queue full on re-queue')
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+        self.flush()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='checkin-flusher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the flusher after writing whatever is still buffered.
+
+        Returns the scans that could not be written (also dead-lettered).
+        """
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        else:
+            self.flush()
+        unflushed = self._drain(self._queue.qsize() or 1)
+        if unflushed:
+            self._dead_letter(unflushed, 'not flushed before shutdown')
+        return unflushed
+
+    # -- metrics ----------------------------------------------------------
+
+    def _trim_scan_times(self, now):
+        cutoff = now - self.rate_window
+        while self._scan_times and self._scan_times[0] < cutoff:
+            self._scan_times.popleft()
+
+    def metrics(self):
+        now = time.monotonic()
+        with self._seen_lock:
+            self._trim_scan_times(now)
+            recent = len(self._scan_times)
+        window = min(self.rate_window, max(now - self.started_at, 1e-9))
+        latencies = sorted(self._flush_latencies)
+
+        def pct(p):
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2)
+
+        return {
+            'scans_total': self.scans_total,
+            'scans_per_sec': round(recent / window, 1),
+            'duplicates_total': self.duplicates_total,
+            'rejected_total': self.rejected_total,
+            'dead_letters': len(self.dead_letters),
+            'written_total': self.written_total,
+            'queue_depth': self._queue.qsize(),
+            'flush_errors': self.flush_errors,
+            'flush_latency_ms': {'p50': pct(0.50), 'p95': pct(0.95), 'max': pct(1.0)},
+        }
+
+
+def make_handler(ingestor, token):
+    class CheckinHandler(BaseHTTPRequestHandler):
+        def _reply(self, status, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path.rstrip('/') == '/metrics':
+                return self._reply(200, ingestor.metrics())
+            return self._reply(404, {'error': 'Not found'})
+
+        def do_POST(self):
+            match = CHECKIN_PATH.match(self.path)
+            if not match:
+                return self._reply(404, {'error': 'Not found'})
+            # bytes, so a non-ASCII header is a mismatch rather than a TypeError
+            supplied = (self.headers.get('Authorization') or '').encode()
+            if not hmac.compare_digest(supplied, f'Bearer {token}'.encode()):
+                return self._reply(401, {'error': 'Unauthorized'})
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length) or b'{}')
+                user_id = body['user_id']
+            except (ValueError, KeyError):
+                return self._reply(400, {'error': 'user_id required'})
+            try:
+                ack = ingestor.submit(match.group(1), user_id)
+            except CheckinRejected as e:
+                return self._reply(400, {'error': str(e)})
+            except CheckinQueueFull:
+                return self._reply(503, {'error': 'Check-in queue full, retry'})
+            except Exception as e:
+                print(f'❌ Check-in scan failed: {e}')
+                return self._reply(503, {'error': 'Check-in unavailable, retry'})
+            return self._reply(202, {'success': True, 'duplicate': ack['duplicate']})
+
+        def log_message(self, format, *args):
+            pass
+
+    return CheckinHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batched event check-in ingestion service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--max-pending', type=int, default=10000)
+    parser.add_argument('--flush-interval', type=float, default=0.25)
+    parser.add_argument(
+        '--dead-letter', default='checkins.deadletter.jsonl', help='file for scans that cannot be written'
+    )
+    args = parser.parse_args()
+
+    token = os.getenv('CHECKIN_SCANNER_TOKEN')
+    if not token:
+        print('❌ CHECKIN_SCANNER_TOKEN is not set - refusing to accept unauthenticated scans')
+        return
+
+    # Scanners write on behalf of attendees, so this needs the service role key.
+    client = get_client(service_role=True)
+    ingestor = CheckinIngestor(
+        client, max_pending=args.max_pending, batch_size=args.batch_size, flush_interval=args.flush_interval,
+        dead_letter_path=args.dead_letter,
+    ).start()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(ingestor, token))
+    print(f'🎫 Check-in ingestion listening on {args.host}:{args.port}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        unflushed = ingestor.stop()
+        if unflushed:
+            print(f'⚠️  {len(unflushed)} scan(s) not flushed, see {args.dead_letter}')
+        print(f'📊 {json.dumps(ingestor.metrics())}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""
+`legacylink` command line: the diagnostic scripts behind one fast entry point.
+
+Subcommands replace the top-level scripts they are named after:
+
+  health        app_health_check.py: the queries the app needs on first load
+  stats         simple_verification.py / detailed_analysis.py: counts by role, status, table
+  verify-queue  debug_admin_dashboard.py: profiles waiting for admin approval
+  sync          create profiles for auth users that have none (runs the 010 / 009 sync RPC)
+  rls           diagnose_rls_policies.py: policies per table and what the anon key can read
+  migrate       check_database_state.py / test_migration_success.py: catalog probe of 009-011
+
+Only argparse is imported up front; supabase, dotenv and the rest of the
+toolkit are imported by the subcommand that needs them, so `--help` and
+argument errors cost little more than interpreter start-up
+(legacylink/bench/startup.py keeps that within budget).
+
+    python -m legacylink --help
+    python -m legacylink verify-queue --university <id> --limit 20
+    python -m legacylink --standin demo.db stats
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from legacylink.client import STANDIN_ENV
+
+ROLES = ('super_admin', 'university_admin', 'alumni', 'student')
+STAT_TABLES = ('universities', 'profiles', 'alumni_profiles', 'events', 'event_registrations', 'mentorships',
+               'donations')
+
+
+def _client(service_role=False):
+    from legacylink.client import get_client
+
+    return get_client(service_role=service_role)
+
+
+def _count(client, table, **eq):
+    query = client.table(table).select('*', count='exact')
+    for column, value in eq.items():
+        query = query.eq(column, value)
+    return query.limit(1).execute().count
+
+
+def cmd_health(args):
+    client = _client()
+    print('🔍 App Health Check (anon key)')
+    checks = [
+        ('Universities table', lambda: client.table('universities').select('id,name,approved').limit(1).execute()),
+        ('Profiles table', lambda: client.table('profiles').select('id,email,role').limit(1).execute()),
+    ]
+    if hasattr(client.auth, 'get_session'):
+        checks.append(('Auth check', client.auth.get_session))
+    failed = 0
+    for name, check in checks:
+        started = time.perf_counter()
+        try:
+            check()
+            print(f'  ✅ {name}: OK ({(time.perf_counter() - started) * 1000:.0f} ms)')
+        except Exception as e:
+            failed += 1
+            print(f'  ❌ {name}: FAILED - {e}')
+    if failed:
+        print('💡 Failed checks block the app from loading; see emergency_loading_fix.sql')
+    return 1 if failed else 0
+
+
+def cmd_stats(args):
+    from concurrent.futures import ThreadPoolExecutor
+
+    client = _client(args.service_role)
+    counts = {table: (table, {}) for table in STAT_TABLES}
+    counts.update({f'profiles role={role}': ('profiles', {'role': role}) for role in ROLES})
+    counts['profiles verified'] = ('profiles', {'verified': True})
+    counts['profiles pending'] = ('profiles', {'verified': False})
+    counts['universities approved'] = ('universities', {'approved': True})
+
+    def run(item):
+        label, (table, eq) = item
+        try:
+            return label, _count(client, table, **eq)
+        except Exception as e:
+            return label, f'error: {e}'
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        results = dict(pool.map(run, counts.items()))
+    print(f'📊 LegacyLink stats ({"service" if args.service_role else "anon"} key)')
+    for label, value in results.items():
+        print(f'  {label}: {value}')
+    return 0
+
+
+def cmd_verify_queue(args):
+    from legacylink.refcache import shared_cache
+
+    client = _client(args.service_role)
+    query = client.table('profiles').select(
+        'id, full_name, email, role, created_at, university_id', count='exact'
+    ).eq('verified', False)
+    if args.university:
+        query = query.eq('university_id', args.university)
+    if args.role:
+        query = query.eq('role', args.role)
+    result = query.order('created_at', desc=True).limit(args.limit).execute()
+    print(f'⏳ {result.count} profile(s) awaiting verification')
+    for row in shared_cache(client).resolve(result.data or []):
+        university = (row.get('universities') or {}).get('name') or row.get('university_id') or 'No university'
+        print(f'  • {row["full_name"]} ({row["email"]}) - {row["role"]} - {university} - {row["created_at"]}')
+    return 0
+
+
+def cmd_sync(args):
+    client = _client(service_role=True)
+    function = 'sync_missing_profiles' if args.missing_only else 'sync_existing_auth_users'
+    print(f'🔄 Running {function}()')
+    try:
+        data = client.rpc(function).execute().data
+    except Exception as e:
+        print(f'❌ {function} failed: {e}')
+        return 1
+    if args.missing_only:
+        for row in data or []:
+            print(f'  • {row.get("email")}: {row.get("action")}')
+        print(f'✅ {len(data or [])} profile(s) created')
+    else:
+        row = (data[0] if isinstance(data, list) and data else data) or {}
+        print(f'✅ Users processed: {row.get("users_processed", 0)}, profiles created: '
+              f'{row.get("profiles_created", 0)}, errors: {row.get("errors_encountered", 0)}')
+    return 0
+
+
+def cmd_rls(args):
+    from legacylink.migrations import MigrationProbeError, read_catalog
+
+    client = _client()
+    try:
+        # migration_catalog() is granted to service_role only; the access probe below stays anon
+        policies = read_catalog(_client(service_role=True)).get('policies', [])
+    except MigrationProbeError as e:
+        print(f'❌ {e}')
+        return 2
+    tables = [args.table] if args.table else sorted({p['table'] for p in policies} | set(STAT_TABLES))
+    print('🔐 RLS policies and anon read access')
+    for table in tables:
+        try:
+            visible = len(client.table(table).select('*').limit(1).execute().data or [])
+            access = 'rows visible' if visible else 'no rows visible'
+        except Exception as e:
+            access = f'read failed - {e}'
+        print(f'  📋 {table}: {access}')
+        for policy in (p for p in policies if p['table'] == table):
+            print(f'      • {policy["command"]}: {policy["name"]}')
+    return 0
+
+
+def cmd_migrate(args):
+    import json
+
+    from legacylink.migrations import MigrationProbeError, applied, print_checks, probe_migrations
+
+    try:
+        checks = probe_migrations(_client(service_role=True))
+    except MigrationProbeError as e:
+        print(f'❌ {e}')
+        return 2
+    if args.json:
+        print(json.dumps([check._asdict() for check in checks], indent=2))
+    else:
+        print('🔍 Migration Status (catalog probe):')
+        print_checks(checks)
+    return 0 if applied(checks) else 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='legacylink', description='LegacyLink diagnostics')
+    parser.add_argument('--standin', metavar='PATH', help='use the local SQLite stand-in instead of Supabase')
+    commands = parser.add_subparsers(dest='command', metavar='command', required=True)
+
+    commands.add_parser('health', help='check the queries the app needs on first load').set_defaults(func=cmd_health)
+
+    stats = commands.add_parser('stats', help='row counts by table, role and verification status')
+    stats.add_argument('--service-role', action='store_true', help='count past RLS with the service-role key')
+    stats.add_argument('--workers', type=int, default=8, help='concurrent count requests')
+    stats.set_defaults(func=cmd_stats)
+
+    queue = commands.add_parser('verify-queue', help='profiles awaiting admin verification')
+    queue.add_argument('--university', help='university id')
+    queue.add_argument('--role', choices=ROLES)
+    queue.add_argument('--limit', type=int, default=50)
+    queue.add_argument('--service-role', action='store_true')
+    queue.set_defaults(func=cmd_verify_queue)
+
+    sync = commands.add_parser('sync', help='create missing profiles for auth users (writes)')
+    sync.add_argument('--missing-only', action='store_true',
+                      help='use sync_missing_profiles() (confirmed users only) instead of sync_existing_auth_users()')
+    sync.set_defaults(func=cmd_sync)
+
+    rls = commands.add_parser('rls', help='RLS policies per table and anon read access')
+    rls.add_argument('--table')
+    rls.set_defaults(func=cmd_rls)
+
+    migrate = commands.add_parser('migrate', help='read-only status of migrations 009-011 (service role)')
+    migrate.add_argument('--json', action='store_true')
+    migrate.set_defaults(func=cmd_migrate)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.standin:
+        os.environ[STANDIN_ENV] = args.standin
+    try:
+        return args.func(args)
+    except RuntimeError as e:
+        print(f'❌ {e}')
+        return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Shared Supabase client for the LegacyLink Python toolkit
+"""
+
+import os
+
+STANDIN_ENV = 'LEGACYLINK_STANDIN'
+FIXTURES_ENV = 'LEGACYLINK_FIXTURES'
+
+
+def load_env():
+    """Load .env.local then .env, like the top-level scripts do."""
+    from dotenv import load_dotenv
+
+    load_dotenv('.env.local')
+    load_dotenv()
+
+
+def get_client(service_role=False):
+    """Create a Supabase client, or the local stand-in when LEGACYLINK_STANDIN is set.
+
+    LEGACYLINK_STANDIN holds a SQLite path (or ':memory:') for offline runs. Either
+    way the client is wrapped so table()/rpc() calls are timed (see telemetry.py)
+    and identical concurrent reads share one request (see singleflight.py).
+    LEGACYLINK_FIXTURES records to or replays from a fixture file (see fixtures.py).
+    """
+    from legacylink.singleflight import coalesce
+    from legacylink.telemetry import instrument
+
+    if os.getenv(FIXTURES_ENV):
+        from legacylink.fixtures import fixture_client
+
+        return coalesce(instrument(fixture_client(lambda: _connect(service_role), service_role)))
+    return coalesce(instrument(_connect(service_role)))
+
+
+def _connect(service_role):
+    standin_path = os.getenv(STANDIN_ENV)
+    if standin_path:
+        from legacylink.standin import StandInClient
+
+        return StandInClient(standin_path)
+
+    load_env()
+    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    if service_role:
+        key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+    else:
+        key = os.getenv('NEXT_PUBLIC_SUPABASE_ANON_KEY')
+
+    if not url or not key:
+        missing = 'SUPABASE_SERVICE_ROLE_KEY' if service_role else 'NEXT_PUBLIC_SUPABASE_ANON_KEY'
+        raise RuntimeError(f'Missing Supabase environment variables: NEXT_PUBLIC_SUPABASE_URL / {missing}')
+
+    from supabase import create_client
+
+    return create_client(url, key)
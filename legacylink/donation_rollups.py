@@ -0,0 +1,206 @@
+"""
+Donation rollups per university, month and graduation-year cohort.
+
+Instead of the dashboards aggregating donations on every view, this engine
+extracts completed donations into columns (numpy arrays), aggregates them
+vectorized, and publishes the result to donation_rollups
+(scripts/013_donation_rollups.sql), which the dashboards read directly.
+
+Refreshes are incremental: only donations created after the last processed
+created_at are extracted and merged into the running sums. The running sums
+and watermark live in a small local state file. Status changes on old
+donations (refunds) are not seen by incremental refreshes - run `--rebuild`
+periodically for that.
+
+    python -m legacylink.donation_rollups --state donation_rollups.json
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from legacylink.client import get_client
+
+UNKNOWN_COHORT = 0
+
+
+class DonationRollups:
+    """Incremental university x month x cohort aggregation of completed donations."""
+
+    def __init__(self, client, state_path=None, page_size=5000, lookup_chunk=200):
+        self.client = client
+        self.state_path = state_path
+        self.page_size = page_size
+        self.lookup_chunk = lookup_chunk
+        self.cells = {}
+        self.watermark = None
+        self.watermark_ids = set()
+        self._cohorts = {}
+        if state_path and os.path.exists(state_path):
+            self._load_state()
+
+    # -- state ------------------------------------------------------------
+
+    def _load_state(self):
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        self.watermark = state['watermark']
+        self.watermark_ids = set(state['watermark_ids'])
+        self.cells = {(u, m, int(c)): [t, n] for u, m, c, t, n in state['cells']}
+
+    def _save_state(self):
+        if not self.state_path:
+            return
+        state = {
+            'watermark': self.watermark,
+            'watermark_ids': sorted(self.watermark_ids),
+            'cells': [[u, m, c, t, n] for (u, m, c), (t, n) in self.cells.items()],
+        }
+        tmp = f'{self.state_path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_path)
+
+    # -- extract ----------------------------------------------------------
+
+    def extract(self):
+        """Page new completed donations into a columnar dict of numpy arrays."""
+        ids, universities, donors, amounts, created = [], [], [], [], []
+        start = 0
+        while True:
+            query = self.client.table('donations').select(
+                'id, donor_id, university_id, amount, created_at'
+            ).eq('payment_status', 'completed')
+            if self.watermark:
+                query = query.gte('created_at', self.watermark)
+            rows = query.order('created_at').order('id').range(start, start + self.page_size - 1).execute().data or []
+            for row in rows:
+                if row['created_at'] == self.watermark and row['id'] in self.watermark_ids:
+                    continue
+                ids.append(row['id'])
+                universities.append(row['university_id'] or '')
+                donors.append(row['donor_id'] or '')
+                amounts.append(row['amount'])
+                created.append(row['created_at'])
+            if len(rows) < self.page_size:
+                break
+            start += self.page_size
+
+        return {
+            'id': np.array(ids, dtype=object),
+            'university_id': np.array(universities, dtype=object),
+            'donor_id': np.array(donors, dtype=object),
+            'amount': np.array(amounts, dtype=np.float64),
+            'created_at': np.array(created, dtype=object),
+        }
+
+    def _cohort_lookup(self, donor_ids):
+        """graduation_year per donor, fetched once per donor and remembered."""
+        missing = [d for d in donor_ids if d and d not in self._cohorts]
+        for start in range(0, len(missing), self.lookup_chunk):
+            chunk = missing[start:start + self.lookup_chunk]
+            rows = self.client.table('alumni_profiles').select('user_id, graduation_year').in_(
+                'user_id', chunk
+            ).execute().data or []
+            for row in rows:
+                self._cohorts[row['user_id']] = row.get('graduation_year') or UNKNOWN_COHORT
+            for donor in chunk:
+                self._cohorts.setdefault(donor, UNKNOWN_COHORT)
+        return self._cohorts
+
+    # -- aggregate --------------------------------------------------------
+
+    def aggregate(self, columns):
+        """Group columns by (university, month, cohort). Returns {key: (total, count)}."""
+        if not len(columns['amount']):
+            return {}
+        university_keys, university_idx = np.unique(columns['university_id'].astype(str), return_inverse=True)
+        months = np.array([c[:7] for c in columns['created_at']], dtype='U7')
+        month_keys, month_idx = np.unique(months, return_inverse=True)
+
+        donor_keys, donor_idx = np.unique(columns['donor_id'].astype(str), return_inverse=True)
+        lookup = self._cohort_lookup(list(donor_keys))
+        donor_cohorts = np.array([lookup.get(d, UNKNOWN_COHORT) for d in donor_keys], dtype=np.int64)
+        cohorts = donor_cohorts[donor_idx]
+        cohort_keys, cohort_idx = np.unique(cohorts, return_inverse=True)
+
+        combined = (university_idx * len(month_keys) + month_idx) * len(cohort_keys) + cohort_idx
+        groups, group_idx = np.unique(combined, return_inverse=True)
+        totals = np.bincount(group_idx, weights=columns['amount'])
+        counts = np.bincount(group_idx)
+
+        cohort_of = groups % len(cohort_keys)
+        month_of = (groups // len(cohort_keys)) % len(month_keys)
+        university_of = groups // (len(cohort_keys) * len(month_keys))
+        return {
+            (str(university_keys[u]), str(month_keys[m]), int(cohort_keys[c])): (float(t), int(n))
+            for u, m, c, t, n in zip(university_of, month_of, cohort_of, totals, counts)
+        }
+
+    # -- refresh ----------------------------------------------------------
+
+    def refresh(self):
+        """Fold donations created since the watermark into the rollups. Returns rows published."""
+        columns = self.extract()
+        partial = self.aggregate(columns)
+        for key, (total, count) in partial.items():
+            cell = self.cells.setdefault(key, [0.0, 0])
+            cell[0] += total
+            cell[1] += count
+
+        if len(columns['created_at']):
+            latest = max(columns['created_at'])
+            at_latest = set(columns['id'][columns['created_at'] == latest])
+            self.watermark_ids = (self.watermark_ids | at_latest) if latest == self.watermark else at_latest
+            self.watermark = latest
+
+        published = self.publish(partial.keys())
+        self._save_state()
+        return published
+
+    def rebuild(self):
+        """Drop all state and aggregate every completed donation again."""
+        self.cells, self.watermark, self.watermark_ids = {}, None, set()
+        self.client.table('donation_rollups').delete().gte('donation_count', 0).execute()
+        return self.refresh()
+
+    def rows(self, keys=None):
+        """The rollup table as dicts, shaped like donation_rollups."""
+        keys = self.cells.keys() if keys is None else keys
+        out = []
+        for university_id, month, cohort in keys:
+            total, count = self.cells[(university_id, month, cohort)]
+            out.append({
+                'university_id': university_id or None,
+                'month': f'{month}-01',
+                'graduation_year': cohort,
+                'total_amount': round(total, 2),
+                'donation_count': count,
+                'avg_amount': round(total / count, 2) if count else 0.0,
+            })
+        return out
+
+    def publish(self, keys, chunk=1000):
+        rows = [row for row in self.rows(keys) if row['university_id']]
+        for start in range(0, len(rows), chunk):
+            self.client.table('donation_rollups').upsert(
+                rows[start:start + chunk], on_conflict='university_id,month,graduation_year'
+            ).execute()
+        return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh donation rollups (university x month x cohort)')
+    parser.add_argument('--state', default='donation_rollups.json', help='local watermark/state file')
+    parser.add_argument('--rebuild', action='store_true', help='recompute from scratch (picks up refunds)')
+    args = parser.parse_args()
+
+    engine = DonationRollups(get_client(service_role=True), state_path=args.state)
+    published = engine.rebuild() if args.rebuild else engine.refresh()
+    print(f'📊 Donation rollups: {published} rows published, {len(engine.cells)} cells, watermark {engine.watermark}')
+
+
+if __name__ == '__main__':
+    main()
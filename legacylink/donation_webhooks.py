@@ -0,0 +1,321 @@
+"""
+Idempotent, batched donation webhook processing.
+
+/api/donations/webhook inserts a donations row synchronously per webhook, so
+provider retries create duplicates and slow inserts hold connections open.
+Here the receiver only appends the raw payload to a local durable queue
+(SQLite in WAL mode) and answers 200 straight away; a worker drains the queue
+in batches and upserts donations ON CONFLICT (payment_id), which needs
+scripts/012_unique_donation_payment_id.sql.
+
+Because the upsert is keyed on payment_id and leaves existing donations alone
+(a refund recorded since is never flipped back to completed), draining is
+at-least-once and safe to replay: replay() just re-marks queue entries as
+unprocessed. A batch the database rejects is bisected until the offending
+payloads are isolated; those are written to a dead-letter file and marked
+processed, so one bad payload cannot stall the queue. Fix the cause and
+replay from its seq to retry it.
+
+    python -m legacylink.donation_webhooks serve --port 8789 --queue webhooks.db
+    python -m legacylink.donation_webhooks drain --queue webhooks.db
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from legacylink.client import get_client
+from legacylink.ratelimit import rejects_rows
+
+QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS webhook_queue (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    payment_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    received_at REAL NOT NULL,
+    processed_at REAL
+);
+CREATE INDEX IF NOT EXISTS webhook_queue_pending ON webhook_queue(seq) WHERE processed_at IS NULL;
+"""
+
+
+def payment_id_for(body):
+    """The provider's id, or a demo id fixed at receive time and stored with the entry so replays are stable.
+
+    The demo route uses a millisecond timestamp, which two id-less deliveries
+    can share; under UNIQUE(payment_id) the second would be dropped as a
+    duplicate, so the fallback is a uuid4 instead.
+    """
+    return str(body.get('id') or f'pay_demo_{uuid.uuid4().hex}')
+
+
+def donation_row(body, payment_id):
+    """Map a webhook payload to a donations row, or None if it is incomplete.
+
+    Mirrors app/api/donations/webhook/route.ts: notes.* wins over top-level
+    fields and amount arrives in paise.
+    """
+    notes = body.get('notes')
+    notes = notes if isinstance(notes, dict) else {}
+    donor_id = notes.get('donor_id') or body.get('donor_id')
+    university_id = notes.get('university_id') or body.get('university_id')
+    try:
+        amount = float(body.get('amount') or 0)
+    except (TypeError, ValueError):
+        amount = 0
+    if not (donor_id and university_id and amount):
+        return None
+    return {
+        'donor_id': donor_id,
+        'university_id': university_id,
+        'amount': amount / 100,
+        'payment_status': 'completed',
+        'payment_id': payment_id,
+        'receipt_url': None,
+    }
+
+
+class WebhookQueue:
+    """Append-only durable queue of raw webhook payloads."""
+
+    def __init__(self, path='donation_webhooks.db'):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ':memory:':
+            self.conn.execute('PRAGMA journal_mode = WAL')
+            # WAL + NORMAL survives process crashes; only an OS crash can lose the last commits.
+            self.conn.execute('PRAGMA synchronous = NORMAL')
+        self.conn.executescript(QUEUE_SCHEMA)
+
+    def append(self, body):
+        """Persist one payload and return its queue sequence number."""
+        payment_id = payment_id_for(body)
+        with self._lock:
+            cursor = self.conn.execute(
+                'INSERT INTO webhook_queue (payment_id, payload, received_at) VALUES (?, ?, ?)',
+                (payment_id, json.dumps(body), time.time()),
+            )
+        return cursor.lastrowid
+
+    def pending(self, limit):
+        with self._lock:
+            return self.conn.execute(
+                'SELECT seq, payment_id, payload FROM webhook_queue WHERE processed_at IS NULL ORDER BY seq LIMIT ?',
+                (limit,),
+            ).fetchall()
+
+    def mark_processed(self, seqs):
+        now = time.time()
+        with self._lock:
+            self.conn.execute('BEGIN')
+            self.conn.executemany('UPDATE webhook_queue SET processed_at = ? WHERE seq = ?', [(now, s) for s in seqs])
+            self.conn.execute('COMMIT')
+
+    def replay(self, since_seq=0):
+        """Re-queue everything from since_seq onwards. Returns how many entries were reset."""
+        with self._lock:
+            cursor = self.conn.execute('UPDATE webhook_queue SET processed_at = NULL WHERE seq >= ?', (since_seq,))
+        return cursor.rowcount
+
+    def compact(self, older_than_s=7 * 24 * 3600):
+        """Delete processed entries older than the retention window."""
+        with self._lock:
+            cursor = self.conn.execute(
+                'DELETE FROM webhook_queue WHERE processed_at IS NOT NULL AND processed_at < ?',
+                (time.time() - older_than_s,),
+            )
+        return cursor.rowcount
+
+    def depth(self):
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM webhook_queue WHERE processed_at IS NULL').fetchone()[0]
+
+
+class DonationWebhookWorker:
+    """Drains WebhookQueue into donations with batched upserts keyed on payment_id."""
+
+    def __init__(self, client, webhook_queue, batch_size=500, dead_letter_path=None):
+        self.client = client
+        self.queue = webhook_queue
+        self.batch_size = batch_size
+        self.dead_letter_path = dead_letter_path
+        self.dead_letters = []
+        self.stats = {'payloads': 0, 'upserted': 0, 'duplicates': 0, 'skipped': 0, 'dead_lettered': 0, 'batches': 0}
+
+    def drain_once(self):
+        """Process one batch. Returns the number of queue entries consumed."""
+        entries = self.queue.pending(self.batch_size)
+        if not entries:
+            return 0
+
+        rows, seqs = {}, {}
+        for seq, payment_id, payload in entries:
+            try:
+                row = donation_row(json.loads(payload), payment_id)
+            except Exception as e:
+                # a malformed body can never succeed; set it aside instead of blocking the queue
+                self._dead_letter(payment_id, [seq], e, payload=payload)
+                continue
+            if row is None:
+                self.stats['skipped'] += 1
+                continue
+            if payment_id in rows:
+                self.stats['duplicates'] += 1
+            # Later deliveries of the same payment win.
+            rows[payment_id] = row
+            seqs.setdefault(payment_id, []).append(seq)
+
+        upserted = self._upsert(list(rows.values()), seqs) if rows else 0
+        self.queue.mark_processed([seq for seq, _, _ in entries])
+
+        self.stats['payloads'] += len(entries)
+        self.stats['upserted'] += upserted
+        self.stats['batches'] += 1
+        return len(entries)
+
+    def _upsert(self, rows, seqs):
+        """Insert donations not already recorded, bisecting around rows the database rejects.
+
+        Existing payment_ids are left untouched (ignore_duplicates), so replays
+        never overwrite a donation that has since been refunded or failed.
+        Errors other than rejected rows propagate and the batch is retried.
+        Returns the number of rows written or already present.
+        """
+        written = 0
+        pending = [rows]
+        while pending:
+            part = pending.pop()
+            try:
+                self.client.table('donations').upsert(part, on_conflict='payment_id', ignore_duplicates=True).execute()
+            except Exception as e:
+                if not rejects_rows(e):
+                    raise
+                if len(part) == 1:
+                    self._dead_letter(part[0]['payment_id'], seqs[part[0]['payment_id']], e, row=part[0])
+                else:
+                    middle = len(part) // 2
+                    pending.extend([part[middle:], part[:middle]])
+                continue
+            written += len(part)
+        return written
+
+    def _dead_letter(self, payment_id, seqs, error, row=None, payload=None):
+        entry = {'payment_id': payment_id, 'seqs': seqs, 'error': str(error), 'failed_at': time.time()}
+        if row is not None:
+            entry['row'] = row
+        if payload is not None:
+            entry['payload'] = payload
+        self.dead_letters.append(entry)
+        self.stats['dead_lettered'] += 1
+        if self.dead_letter_path:
+            with open(self.dead_letter_path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+        print(f'⚠️  Donation {payment_id} dead-lettered (queue seq {seqs[0]}): {error}')
+
+    def drain(self):
+        """Process until the queue is empty. Returns the number of entries consumed."""
+        total = 0
+        while True:
+            consumed = self.drain_once()
+            if not consumed:
+                return total
+            total += consumed
+
+    def run(self, stop_event, idle_sleep=0.5):
+        while not stop_event.is_set():
+            try:
+                if not self.drain_once():
+                    stop_event.wait(idle_sleep)
+            except Exception as e:
+                print(f'❌ Donation webhook batch failed, will retry: {e}')
+                stop_event.wait(idle_sleep)
+
+
+def verify_signature(raw_body, signature, secret):
+    """Razorpay-style X-Razorpay-Signature: hex HMAC-SHA256 of the raw body."""
+    expected = hmac.new(secret.encode(), raw_body, hashlib.sha256).hexdigest()
+    return bool(signature) and hmac.compare_digest(expected, signature)
+
+
+def make_handler(webhook_queue, secret=None):
+    class WebhookHandler(BaseHTTPRequestHandler):
+        def _reply(self, status, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self):
+            if self.path.rstrip('/') != '/donations/webhook':
+                return self._reply(404, {'error': 'Not found'})
+            raw = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            if secret and not verify_signature(raw, self.headers.get('X-Razorpay-Signature'), secret):
+                return self._reply(401, {'error': 'Invalid signature'})
+            try:
+                body = json.loads(raw or b'{}')
+            except ValueError:
+                body = {}
+            if not isinstance(body, dict):
+                body = {}
+            seq = webhook_queue.append(body)
+            return self._reply(200, {'received': True, 'queued': seq})
+
+        def log_message(self, format, *args):
+            pass
+
+    return WebhookHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Durable, batched donation webhook processing')
+    parser.add_argument('command', choices=['serve', 'drain', 'replay'])
+    parser.add_argument('--queue', default='donation_webhooks.db')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8789)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--since', type=int, default=0, help='replay: first queue seq to reprocess')
+    parser.add_argument('--dead-letter', default='donation_webhooks.deadletter.jsonl',
+                        help='file for payloads the database rejects')
+    args = parser.parse_args()
+
+    webhook_queue = WebhookQueue(args.queue)
+    if args.command == 'replay':
+        print(f'🔁 Re-queued {webhook_queue.replay(args.since)} webhook payloads')
+        return
+
+    worker = DonationWebhookWorker(get_client(service_role=True), webhook_queue, args.batch_size, args.dead_letter)
+    if args.command == 'drain':
+        worker.drain()
+        print(f'✅ Drained: {worker.stats}')
+        return
+
+    secret = os.getenv('RAZORPAY_WEBHOOK_SECRET')
+    if not secret:
+        print('⚠️  RAZORPAY_WEBHOOK_SECRET not set - accepting unsigned webhooks (demo mode)')
+    stop = threading.Event()
+    threading.Thread(target=worker.run, args=(stop,), name='donation-worker', daemon=True).start()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(webhook_queue, secret))
+    print(f'💸 Donation webhooks listening on {args.host}:{args.port} (queue: {args.queue})')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        stop.set()
+        worker.drain()
+        print(f'📊 {worker.stats}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,345 @@
+"""
+Faceted alumni directory engine over precomputed bitmaps.
+
+The directory (app/dashboard/alumni) turns every filter combination into a
+fresh profiles ⋈ alumni_profiles query. This engine loads that join once and
+keeps a bitmap per facet value - a sorted uint32 id array while the value is
+rare, a dense bool mask once it covers more than 1/16th of the directory (the
+roaring-bitmap container trick). Filters are OR within a facet and AND across
+facets; facet counts are disjunctive (each facet is counted with every *other*
+filter applied) so the UI can show "2019 (41)" next to an already-ticked 2020.
+
+Change batches (rows from profiles / alumni_profiles) are applied with
+apply_changes(), touching only the bitmaps whose membership moved.
+
+    python -m legacylink.facets --filter graduation_year=2020 --filter skills=python
+"""
+
+import argparse
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import numpy as np
+
+from legacylink.client import get_client
+from legacylink.streaming import rows_in
+
+DIRECTORY_ROLES = ('alumni', 'student')
+PROFILE_FACETS = ('university_id', 'role', 'verified')
+ALUMNI_FACETS = ('graduation_year', 'degree', 'current_company', 'available_for_mentoring')
+MULTI_FACETS = ('skills',)
+FACETS = PROFILE_FACETS + ALUMNI_FACETS + MULTI_FACETS
+
+DENSE_FRACTION = 16
+
+
+class FacetBitmap:
+    """Set of document slots: sorted uint32 array when sparse, bool mask when dense."""
+
+    __slots__ = ('ids', 'mask', 'count')
+
+    def __init__(self):
+        self.ids = np.empty(0, dtype=np.uint32)
+        self.mask = None
+        self.count = 0
+
+    def update(self, adds, removes, capacity):
+        if self.mask is not None:
+            if len(self.mask) < capacity:
+                self.mask = np.concatenate([self.mask, np.zeros(capacity - len(self.mask), dtype=bool)])
+            self.mask[removes] = False
+            self.mask[adds] = True
+            self.count = int(self.mask.sum())
+        else:
+            ids = self.ids
+            if len(removes):
+                ids = np.setdiff1d(ids, removes, assume_unique=True)
+            if len(adds):
+                ids = np.union1d(ids, adds).astype(np.uint32)
+            self.ids = ids
+            self.count = len(ids)
+        self._rebalance(capacity)
+
+    def _rebalance(self, capacity):
+        dense_at = max(64, capacity // DENSE_FRACTION)
+        if self.mask is None and self.count > dense_at:
+            self.mask = np.zeros(capacity, dtype=bool)
+            self.mask[self.ids] = True
+            self.ids = np.empty(0, dtype=np.uint32)
+        elif self.mask is not None and self.count < dense_at // 2:
+            self.ids = np.flatnonzero(self.mask).astype(np.uint32)
+            self.mask = None
+
+    def grow(self, capacity):
+        if self.mask is not None and len(self.mask) < capacity:
+            self.mask = np.concatenate([self.mask, np.zeros(capacity - len(self.mask), dtype=bool)])
+
+    def or_into(self, target):
+        if self.mask is not None:
+            target[:len(self.mask)] |= self.mask
+        else:
+            target[self.ids] = True
+
+    def count_in(self, selection):
+        """|self ∩ selection| without materialising the intersection."""
+        if self.mask is not None:
+            return int(np.count_nonzero(self.mask & selection[:len(self.mask)]))
+        return int(np.count_nonzero(selection[self.ids]))
+
+    def nbytes(self):
+        return self.mask.nbytes if self.mask is not None else self.ids.nbytes
+
+
+def created_micros(value):
+    """ISO timestamp -> epoch microseconds (0 when missing), for newest-first paging."""
+    if not value:
+        return 0
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1_000_000)
+
+
+def facet_values(profile, alumni):
+    """{facet: [values]} for one directory entry."""
+    alumni = alumni or {}
+    values = {facet: [profile.get(facet)] for facet in PROFILE_FACETS}
+    for facet in ALUMNI_FACETS:
+        values[facet] = [alumni.get(facet)]
+    values['available_for_mentoring'] = [bool(alumni.get('available_for_mentoring'))]
+    values['skills'] = sorted({s.strip().lower() for s in alumni.get('skills') or [] if s and s.strip()})
+    return {facet: [v for v in vals if v is not None] for facet, vals in values.items()}
+
+
+class FacetEngine:
+    """In-memory directory index answering filters and facet counts with bitmap ops."""
+
+    def __init__(self):
+        self.users = []
+        self.slots = {}
+        self.capacity = 1024
+        self.alive = np.zeros(self.capacity, dtype=bool)
+        self.recency = np.zeros(self.capacity, dtype=np.int64)
+        self.bitmaps = {facet: defaultdict(FacetBitmap) for facet in FACETS}
+        # Current value of each single-valued facet per slot, as a code into _values.
+        self._codes = {facet: np.full(self.capacity, -1, dtype=np.int32) for facet in FACETS if facet not in MULTI_FACETS}
+        self._values = {facet: [] for facet in self._codes}
+        self._value_codes = {facet: {} for facet in self._codes}
+        self._multi = {facet: {} for facet in MULTI_FACETS}
+
+    def __len__(self):
+        return int(self.alive.sum())
+
+    # -- maintenance ------------------------------------------------------
+
+    def _ensure_capacity(self, size):
+        if size <= self.capacity:
+            return
+        while self.capacity < size:
+            self.capacity *= 2
+        self.alive = np.concatenate([self.alive, np.zeros(self.capacity - len(self.alive), dtype=bool)])
+        self.recency = np.concatenate([self.recency, np.zeros(self.capacity - len(self.recency), dtype=np.int64)])
+        for facet, codes in self._codes.items():
+            self._codes[facet] = np.concatenate([codes, np.full(self.capacity - len(codes), -1, dtype=np.int32)])
+        for values in self.bitmaps.values():
+            for bitmap in values.values():
+                bitmap.grow(self.capacity)
+
+    def apply_changes(self, profiles, alumni_by_user=None):
+        """Upsert (or remove) directory entries and patch only the bitmaps that changed.
+
+        profiles: profile rows; rows with `deleted: True`, or whose role is not
+        alumni/student, leave the directory. alumni_by_user: {user_id: alumni row}.
+        """
+        alumni_by_user = alumni_by_user or {}
+        adds = defaultdict(list)
+        removes = defaultdict(list)
+
+        for profile in profiles:
+            user_id = profile['id']
+            slot = self.slots.get(user_id)
+            leaving = profile.get('deleted') or profile.get('role') not in DIRECTORY_ROLES
+            new_values = {} if leaving else facet_values(profile, alumni_by_user.get(user_id))
+
+            if slot is None:
+                if leaving:
+                    continue
+                slot = len(self.users)
+                self._ensure_capacity(slot + 1)
+                self.users.append(user_id)
+                self.slots[user_id] = slot
+
+            for facet in FACETS:
+                before = set(self._current(facet, slot))
+                after = set(new_values.get(facet, ()))
+                for value in before - after:
+                    removes[(facet, value)].append(slot)
+                for value in after - before:
+                    adds[(facet, value)].append(slot)
+                self._remember(facet, slot, new_values.get(facet, ()))
+
+            self.alive[slot] = not leaving
+            if not leaving:
+                self.recency[slot] = created_micros(profile.get('created_at'))
+
+        for key in set(adds) | set(removes):
+            facet, value = key
+            bitmap = self.bitmaps[facet][value]
+            bitmap.update(
+                np.array(sorted(adds.get(key, ())), dtype=np.uint32),
+                np.array(sorted(removes.get(key, ())), dtype=np.uint32),
+                self.capacity,
+            )
+            if bitmap.count == 0:
+                del self.bitmaps[facet][value]
+
+    def _current(self, facet, slot):
+        if facet in MULTI_FACETS:
+            return self._multi[facet].get(slot, ())
+        code = self._codes[facet][slot]
+        return () if code < 0 else (self._values[facet][code],)
+
+    def _remember(self, facet, slot, values):
+        if facet in MULTI_FACETS:
+            if values:
+                self._multi[facet][slot] = tuple(values)
+            else:
+                self._multi[facet].pop(slot, None)
+            return
+        if not values:
+            self._codes[facet][slot] = -1
+            return
+        codes = self._value_codes[facet]
+        code = codes.get(values[0])
+        if code is None:
+            code = codes[values[0]] = len(self._values[facet])
+            self._values[facet].append(values[0])
+        self._codes[facet][slot] = code
+
+    @classmethod
+    def build(cls, client, page_size=1000, lookup_chunk=200):
+        """Load the directory (profiles with role alumni/student ⋈ alumni_profiles)."""
+        engine = cls()
+        start = 0
+        while True:
+            profiles = client.table('profiles').select(
+                'id, role, university_id, verified, created_at'
+            ).in_('role', list(DIRECTORY_ROLES)).order('id').range(start, start + page_size - 1).execute().data or []
+            if profiles:
+                alumni = rows_in(
+                    client, 'alumni_profiles',
+                    'user_id, graduation_year, degree, current_company, skills, available_for_mentoring',
+                    'user_id', [p['id'] for p in profiles], lookup_chunk,
+                )
+                engine.apply_changes(profiles, {a['user_id']: a for a in alumni})
+            if len(profiles) < page_size:
+                break
+            start += page_size
+        return engine
+
+    # -- queries ----------------------------------------------------------
+
+    def _facet_mask(self, facet, values, match_all=False):
+        if match_all:
+            mask = self.alive.copy()
+            for value in values:
+                part = np.zeros(self.capacity, dtype=bool)
+                bitmap = self.bitmaps[facet].get(value)
+                if bitmap is not None:
+                    bitmap.or_into(part)
+                mask &= part
+            return mask
+        mask = np.zeros(self.capacity, dtype=bool)
+        for value in values:
+            bitmap = self.bitmaps[facet].get(value)
+            if bitmap is not None:
+                bitmap.or_into(mask)
+        return mask
+
+    def query(self, filters=None, match_all=(), offset=0, limit=50, count_facets=FACETS, top_values=20):
+        """Filter the directory and count facets.
+
+        filters: {facet: [values]} - OR within a facet, AND across facets.
+        match_all: facets (e.g. 'skills') whose values must all be present.
+        Returns {'total', 'user_ids' (newest first), 'facets': {facet: {value: count}}}.
+        """
+        filters = {f: list(v) for f, v in (filters or {}).items() if v}
+        masks = {f: self._facet_mask(f, v, f in match_all) for f, v in filters.items()}
+
+        selection = self.alive.copy()
+        for mask in masks.values():
+            selection &= mask
+
+        slots = np.flatnonzero(selection)
+        newest = -self.recency[slots]
+        wanted = offset + limit
+        if wanted < len(slots):
+            head = np.argpartition(newest, wanted)[:wanted]
+            page = slots[head[np.argsort(newest[head], kind='stable')]][offset:]
+        else:
+            page = slots[np.argsort(newest, kind='stable')][offset:offset + limit]
+
+        counts = {}
+        for facet in count_facets:
+            base = self.alive.copy()
+            for other, mask in masks.items():
+                if other != facet:
+                    base &= mask
+            counts[facet] = self._count(facet, base, top_values)
+
+        return {
+            'total': len(slots),
+            'user_ids': [self.users[s] for s in page],
+            'facets': counts,
+        }
+
+    def _count(self, facet, base, top_values):
+        if facet in MULTI_FACETS:
+            pairs = [(value, bitmap.count_in(base)) for value, bitmap in self.bitmaps[facet].items()]
+        else:
+            # Single-valued facets: one bincount over the value codes beats one AND per value.
+            codes = self._codes[facet][base]
+            tally = np.bincount(codes[codes >= 0], minlength=len(self._values[facet]))
+            top = np.argsort(-tally, kind='stable')[:top_values]
+            pairs = [(self._values[facet][i], int(tally[i])) for i in top]
+        pairs.sort(key=lambda pair: -pair[1])
+        return {value: n for value, n in pairs[:top_values] if n}
+
+    def memory_bytes(self):
+        bitmaps = sum(b.nbytes() for values in self.bitmaps.values() for b in values.values())
+        codes = sum(c.nbytes for c in self._codes.values())
+        return bitmaps + codes + self.alive.nbytes + self.recency.nbytes
+
+
+def parse_filter(text):
+    facet, _, raw = text.partition('=')
+    if facet not in FACETS:
+        raise argparse.ArgumentTypeError(f'unknown facet {facet!r}; expected one of {", ".join(FACETS)}')
+    values = []
+    for value in raw.split(','):
+        if facet == 'graduation_year':
+            values.append(int(value))
+        elif facet in ('verified', 'available_for_mentoring'):
+            values.append(value.lower() == 'true')
+        else:
+            values.append(value.lower() if facet == 'skills' else value)
+    return facet, values
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Faceted alumni directory query')
+    parser.add_argument('--filter', action='append', type=parse_filter, default=[], help='facet=v1,v2')
+    parser.add_argument('--all-skills', action='store_true', help='require every listed skill')
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    engine = FacetEngine.build(get_client(service_role=True))
+    result = engine.query(dict(args.filter), match_all=('skills',) if args.all_skills else (), limit=args.limit)
+    print(f'🎓 {result["total"]} of {len(engine)} directory entries match')
+    for facet, counts in result['facets'].items():
+        shown = ', '.join(f'{value} ({n})' for value, n in list(counts.items())[:8])
+        print(f'  {facet}: {shown or "-"}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,572 @@
+"""
+Record/replay fixtures for the test_*.py scripts.
+
+The test scripts talk to the live project, so a full run takes seconds and its
+output depends on whoever last ran CREATE_TEST_UNVERIFIED_USERS.sql. Record
+them once and replay them offline:
+
+  - record runs each script against the project (or a --standin database)
+    and stores every table()/rpc()/auth exchange in fixtures/<script>.json,
+    keyed by client (anon or service) and the normalized request: table or
+    function, the builder calls and their arguments, with select lists
+    stripped of whitespace (auth calls by method and arguments, passwords
+    and tokens redacted on both sides),
+  - replay runs the scripts against those files instead. Identical requests
+    get their recorded responses in order (the last one repeats), errors are
+    raised again with the recorded message and code, and a request that was
+    never recorded fails with FixtureMiss instead of reaching the network,
+  - each script's output is stored with its exchanges and replay fails if it
+    changes, so the recordings double as expected results.
+
+Exchanges are captured at the query-builder level rather than as raw HTTP, so
+fixtures do not depend on the supabase-py version or its transport, and
+replay does not import supabase at all.
+
+No fixtures are committed: they hold whatever the project returned, and the
+scripts' expected output depends on that project's data. Record them once per
+checkout (a test project, or an offline stand-in database) before replaying;
+replay reports a script without a fixture as failed. Record and replay both
+exit non-zero if any script fails.
+
+    python -m legacylink.fixtures record                     # all test_*.py, live project
+    python -m legacylink.fixtures record --standin fixtures.db  # offline, local SQLite
+    python -m legacylink.fixtures replay
+    python -m legacylink.fixtures replay test_manual_profile.py
+
+get_client() honours LEGACYLINK_FIXTURES=<file> (with LEGACYLINK_FIXTURE_MODE
+record or replay) for toolkit code outside the test scripts.
+"""
+
+import argparse
+import atexit
+import contextlib
+import copy
+import glob
+import io
+import json
+import os
+import runpy
+import sys
+import threading
+import time
+import types
+from collections import deque
+from datetime import datetime, timezone
+
+from legacylink.client import FIXTURES_ENV
+from legacylink.singleflight import request_key, request_step
+
+FIXTURE_MODE_ENV = 'LEGACYLINK_FIXTURE_MODE'
+FIXTURES_DIR = 'fixtures'
+FORMAT_VERSION = 1
+# postgrest builder attributes that are read (.not_.eq(...)) rather than called
+BUILDER_PROPERTIES = frozenset({'not_'})
+# client.auth attributes that are namespaces of further methods (auth.admin.list_users())
+AUTH_NAMESPACES = frozenset({'admin', 'mfa'})
+# never written to a fixture, in auth requests or responses
+SECRET_FIELDS = frozenset({'password', 'access_token', 'refresh_token', 'provider_token', 'provider_refresh_token'})
+
+# Values the scripts need to find before they call create_client(); replay never uses them
+REPLAY_ENV = {
+    'NEXT_PUBLIC_SUPABASE_URL': 'http://replay.invalid',
+    'NEXT_PUBLIC_SUPABASE_ANON_KEY': 'replay-anon-key',
+    'SUPABASE_SERVICE_ROLE_KEY': 'replay-service-key',
+}
+
+
+class FixtureMiss(LookupError):
+    """A request was made during replay that the fixture file does not hold."""
+
+
+class ReplayedError(Exception):
+    """A recorded error raised again, with the attributes of the original (message, code, details, hint)."""
+
+    def __init__(self, error):
+        super().__init__(error.get('text'))
+        self.message = error.get('message')
+        self.code = error.get('code')
+        self.details = error.get('details')
+        self.hint = error.get('hint')
+        self.original_type = error.get('type')
+
+    def __str__(self):
+        return self.args[0] or ''
+
+
+class ReplayResponse:
+    """Same surface as postgrest's APIResponse."""
+
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+    def __repr__(self):
+        return f'ReplayResponse(data={self.data!r}, count={self.count!r})'
+
+
+class ReplayRecord(dict):
+    """A recorded auth response: a dict whose keys also read as attributes (response.user.id)."""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    @classmethod
+    def wrap(cls, value):
+        if isinstance(value, dict):
+            return cls({key: cls.wrap(item) for key, item in value.items()})
+        if isinstance(value, list):
+            return [cls.wrap(item) for item in value]
+        return value
+
+
+def _jsonable(value):
+    return json.loads(json.dumps(value, default=str))
+
+
+def _redacted(value):
+    if isinstance(value, dict):
+        return {key: '<redacted>' if key in SECRET_FIELDS else _redacted(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_redacted(item) for item in value]
+    return value
+
+
+def _plain(value):
+    """gotrue responses are pydantic models (the stand-in's are plain objects); reduce them to JSON values."""
+    if hasattr(value, 'model_dump'):
+        return value.model_dump(mode='json')
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if hasattr(value, '__dict__') and not isinstance(value, type):
+        return {key: _plain(item) for key, item in vars(value).items() if not key.startswith('_')}
+    return value
+
+
+def _auth_payload(response):
+    return _redacted(_jsonable(_plain(response)))
+
+
+def auth_request(path, args=(), kwargs=None):
+    """Key for one auth call, e.g. ('sign_up',) or ('admin', 'list_users'), with secrets redacted."""
+    return request_key([('auth', *path), request_step(path[-1], _redacted(list(args)), _redacted(kwargs or {}))])
+
+
+def _error_record(error):
+    record = {'type': type(error).__name__, 'text': str(error)}
+    for name in ('message', 'code', 'details', 'hint'):
+        value = getattr(error, name, None)
+        if value is not None:
+            record[name] = _jsonable(value)
+    return record
+
+
+class FixtureStore:
+    """The exchanges of one recording, in the order they happened."""
+
+    def __init__(self, path):
+        self.path = path
+        self.exchanges = []
+        self.stdout = None
+        self.misses = 0
+        self._queues = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        store = cls(path)
+        with open(path, encoding='utf-8') as f:
+            document = json.load(f)
+        if document.get('version') != FORMAT_VERSION:
+            raise ValueError(f'{path}: unsupported fixture version {document.get("version")}')
+        store.exchanges = document['exchanges']
+        store.stdout = document.get('stdout')
+        return store
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        document = {
+            'version': FORMAT_VERSION,
+            'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'stdout': self.stdout,
+            'exchanges': self.exchanges,
+        }
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(document, f, ensure_ascii=False, separators=(',', ':'))
+            f.write('\n')
+
+    def record(self, role, request, response=None, error=None):
+        exchange = {'client': role, 'request': request}
+        if error is not None:
+            exchange['error'] = _error_record(error)
+        else:
+            exchange['data'] = _jsonable(getattr(response, 'data', None))
+            exchange['count'] = getattr(response, 'count', None)
+        with self._lock:
+            self.exchanges.append(exchange)
+
+    def replay(self, role, request):
+        """The recorded response for this request, or raises the recorded error / FixtureMiss."""
+        exchange = self._next(role, request)
+        return ReplayResponse(copy.deepcopy(exchange['data']), exchange.get('count'))
+
+    def _next(self, role, request):
+        with self._lock:
+            if self._queues is None:
+                self._queues = {}
+                for exchange in self.exchanges:
+                    self._queues.setdefault((exchange['client'], exchange['request']), deque()).append(exchange)
+            queue = self._queues.get((role, request))
+            if not queue:
+                self.misses += 1
+                raise FixtureMiss(f'{self.path}: no recorded response for {role} {request}; record it again')
+            exchange = queue.popleft() if len(queue) > 1 else queue[0]
+        if 'error' in exchange:
+            raise ReplayedError(exchange['error'])
+        return exchange
+
+    def record_auth(self, role, request, response=None, error=None):
+        exchange = {'client': role, 'request': request}
+        if error is not None:
+            exchange['error'] = _error_record(error)
+        else:
+            exchange['data'] = _auth_payload(response)
+        with self._lock:
+            self.exchanges.append(exchange)
+
+    def replay_auth(self, role, request):
+        return ReplayRecord.wrap(copy.deepcopy(self._next(role, request)['data']))
+
+
+class _RecordingBuilder:
+    """Keeps the chain of builder calls; execute() runs the real request and stores the exchange."""
+
+    __slots__ = ('_builder', '_store', '_role', '_chain')
+
+    def __init__(self, builder, store, role, chain):
+        self._builder = builder
+        self._store = store
+        self._role = role
+        self._chain = chain
+
+    def _wrap(self, result, step):
+        if result is self._builder:
+            self._chain.append(step)
+            return self
+        return _RecordingBuilder(result, self._store, self._role, self._chain + [step])
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if hasattr(attr, 'execute'):
+            return self._wrap(attr, (name,))
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if not hasattr(result, 'execute'):
+                return result
+            return self._wrap(result, request_step(name, args, kwargs))
+
+        return call
+
+    def execute(self):
+        request = request_key(self._chain)
+        try:
+            response = self._builder.execute()
+        except Exception as e:
+            self._store.record(self._role, request, error=e)
+            raise
+        self._store.record(self._role, request, response)
+        return response
+
+
+class _RecordingAuth:
+    """Records every call on client.auth (and its admin namespace) with its result or error."""
+
+    def __init__(self, auth, store, role, path=()):
+        self._auth = auth
+        self._store = store
+        self._role = role
+        self._path = path
+
+    def __getattr__(self, name):
+        attr = getattr(self._auth, name)
+        if name in AUTH_NAMESPACES:
+            return _RecordingAuth(attr, self._store, self._role, self._path + (name,))
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            request = auth_request(self._path + (name,), args, kwargs)
+            try:
+                response = attr(*args, **kwargs)
+            except Exception as e:
+                self._store.record_auth(self._role, request, error=e)
+                raise
+            self._store.record_auth(self._role, request, response)
+            return response
+
+        return call
+
+
+class RecordingClient:
+    """Proxy that stores every table()/rpc()/auth exchange of `client` in a FixtureStore."""
+
+    def __init__(self, client, store, role='anon'):
+        object.__setattr__(self, '_client', client)
+        object.__setattr__(self, 'store', store)
+        object.__setattr__(self, 'role', role)
+
+    @property
+    def auth(self):
+        return _RecordingAuth(self._client.auth, self.store, self.role)
+
+    def table(self, name):
+        return _RecordingBuilder(self._client.table(name), self.store, self.role, [('table', name)])
+
+    from_ = table
+
+    def rpc(self, name, params=None, *args, **kwargs):
+        builder = self._client.rpc(name, params, *args, **kwargs)
+        chain = [('rpc', name, params, args, sorted(kwargs.items()))]
+        return _RecordingBuilder(builder, self.store, self.role, chain)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._client, name, value)
+
+
+class _ReplayQuery:
+    __slots__ = ('_store', '_role', '_chain')
+
+    def __init__(self, store, role, chain):
+        self._store = store
+        self._role = role
+        self._chain = chain
+
+    def _extend(self, step):
+        return _ReplayQuery(self._store, self._role, self._chain + [step])
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        if name in BUILDER_PROPERTIES:
+            return self._extend((name,))
+
+        def call(*args, **kwargs):
+            return self._extend(request_step(name, args, kwargs))
+
+        return call
+
+    def execute(self):
+        return self._store.replay(self._role, request_key(self._chain))
+
+
+class _ReplayAuth:
+    """Answers client.auth calls with the recorded responses (as ReplayRecord) or errors."""
+
+    def __init__(self, store, role, path=()):
+        self._store = store
+        self._role = role
+        self._path = path
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        if name in AUTH_NAMESPACES:
+            return _ReplayAuth(self._store, self._role, self._path + (name,))
+
+        def call(*args, **kwargs):
+            return self._store.replay_auth(self._role, auth_request(self._path + (name,), args, kwargs))
+
+        return call
+
+
+class ReplayClient:
+    """Answers table()/rpc()/auth from a FixtureStore without a network or the supabase package."""
+
+    def __init__(self, store, role='anon'):
+        self.store = store
+        self.role = role
+        self.auth = _ReplayAuth(store, role)
+
+    def table(self, name):
+        return _ReplayQuery(self.store, self.role, [('table', name)])
+
+    from_ = table
+
+    def rpc(self, name, params=None, *args, **kwargs):
+        return _ReplayQuery(self.store, self.role, [('rpc', name, params, args, sorted(kwargs.items()))])
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def fixture_client(client_factory, service_role=False):
+    """The client get_client() returns when LEGACYLINK_FIXTURES is set, or None when it is not."""
+    path = os.getenv(FIXTURES_ENV)
+    if not path:
+        return None
+    mode = os.getenv(FIXTURE_MODE_ENV, 'replay')
+    role = 'service' if service_role else 'anon'
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            if mode == 'record':
+                store = _stores[path] = FixtureStore(path)
+                atexit.register(store.save)
+            else:
+                store = _stores[path] = FixtureStore.load(path)
+    if mode == 'record':
+        return RecordingClient(client_factory(), store, role)
+    return ReplayClient(store, role)
+
+
+def _role_for_key(key):
+    return 'service' if key and key == os.getenv('SUPABASE_SERVICE_ROLE_KEY') else 'anon'
+
+
+def fixture_path(script, directory=FIXTURES_DIR):
+    return os.path.join(directory, os.path.splitext(os.path.basename(script))[0] + '.json')
+
+
+@contextlib.contextmanager
+def _patched_supabase(create_client):
+    """Point `from supabase import create_client` at our factory for the duration of one script."""
+    previous = sys.modules.get('supabase')
+    module = types.ModuleType('supabase')
+    if previous is not None:
+        module.__dict__.update(previous.__dict__)
+    module.create_client = create_client
+    module.Client = getattr(previous, 'Client', object)
+    sys.modules['supabase'] = module
+    try:
+        yield
+    finally:
+        if previous is None:
+            sys.modules.pop('supabase', None)
+        else:
+            sys.modules['supabase'] = previous
+
+
+@contextlib.contextmanager
+def _environment(values):
+    saved = {name: os.environ.get(name) for name in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _run_script(script):
+    """Run a script as __main__. Returns (stdout, error)."""
+    out = io.StringIO()
+    error = None
+    with contextlib.redirect_stdout(out):
+        try:
+            runpy.run_path(script, run_name='__main__')
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                error = f'exited with {e.code}'
+        except Exception as e:
+            error = f'{type(e).__name__}: {e}'
+    return out.getvalue(), error
+
+
+def record_script(script, directory=FIXTURES_DIR, standin=None):
+    """Run a script against the project (or a stand-in database) and save its fixture. Returns a result dict."""
+    store = FixtureStore(fixture_path(script, directory))
+    if standin:
+        from legacylink.standin import StandInClient
+
+        shared = StandInClient(standin)
+        make_client = lambda url, key, *args, **kwargs: shared
+    else:
+        from supabase import create_client as make_client
+
+    def create_client(url, key, *args, **kwargs):
+        return RecordingClient(make_client(url, key, *args, **kwargs), store, _role_for_key(key))
+
+    started = time.perf_counter()
+    with _patched_supabase(create_client), _environment(REPLAY_ENV if standin else {}):
+        stdout, error = _run_script(script)
+    store.stdout = stdout
+    store.save()
+    return {'script': script, 'seconds': time.perf_counter() - started, 'exchanges': len(store.exchanges),
+            'error': error, 'stdout': stdout}
+
+
+def replay_script(script, directory=FIXTURES_DIR, compare=True):
+    """Run a script against its fixture. Returns a result dict; `error` is None when it passed."""
+    path = fixture_path(script, directory)
+    if not os.path.exists(path):
+        error = f'no fixture at {path}; record it first (python -m legacylink.fixtures record {script})'
+        return {'script': script, 'seconds': 0.0, 'exchanges': 0, 'error': error, 'stdout': ''}
+    store = FixtureStore.load(path)
+
+    def create_client(url, key, *args, **kwargs):
+        return ReplayClient(store, _role_for_key(key))
+
+    # scripts skip their checks when the keys are missing, so replay supplies placeholders
+    env = {name: value for name, value in REPLAY_ENV.items() if not os.getenv(name)}
+    started = time.perf_counter()
+    with _patched_supabase(create_client), _environment(env):
+        stdout, error = _run_script(script)
+    seconds = time.perf_counter() - started
+    if error is None and store.misses:
+        error = f'{store.misses} request(s) not in {path}'
+    if error is None and compare and store.stdout is not None and stdout != store.stdout:
+        error = 'output differs from the recording'
+    return {'script': script, 'seconds': seconds, 'exchanges': len(store.exchanges), 'error': error,
+            'stdout': stdout}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record or replay the test scripts against fixture files')
+    parser.add_argument('mode', choices=('record', 'replay'))
+    parser.add_argument('scripts', nargs='*', help='scripts to run (default: test_*.py)')
+    parser.add_argument('--dir', default=FIXTURES_DIR, help='fixture directory')
+    parser.add_argument('--standin', metavar='PATH', help='record against a local stand-in database')
+    parser.add_argument('--no-compare', action='store_true', help='do not compare output with the recording')
+    parser.add_argument('-v', '--verbose', action='store_true', help='print each script\'s output')
+    args = parser.parse_intermixed_args()
+
+    scripts = args.scripts or sorted(glob.glob('test_*.py'))
+    label = 'Recording' if args.mode == 'record' else 'Replaying'
+    print(f'🎞️  {label} {len(scripts)} script(s) ({args.dir}/)')
+    started = time.perf_counter()
+    failed = 0
+    for script in scripts:
+        if args.mode == 'record':
+            result = record_script(script, args.dir, args.standin)
+        else:
+            result = replay_script(script, args.dir, not args.no_compare)
+        icon = '❌' if result['error'] else '✅'
+        print(f'  {icon} {script}: {result["exchanges"]} exchanges, {result["seconds"] * 1000:.1f} ms'
+              + (f' - {result["error"]}' if result['error'] else ''))
+        if args.verbose:
+            print(result['stdout'])
+        failed += bool(result['error'])
+    print(f'{"❌" if failed else "✅"} {len(scripts) - failed}/{len(scripts)} passed in '
+          f'{(time.perf_counter() - started) * 1000:.1f} ms')
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+"""
+Bulk iCalendar feeds for universities and registered users.
+
+/api/events/[id]/ical renders one event per request. This module renders whole
+calendars - every event of a university, or every event a user registered for -
+by paging through events / event_registrations ⋈ events, and caches the result:
+
+  - within `ttl` seconds a poll is served straight from memory,
+  - after that the feed's rows are fetched and every rendered column is hashed;
+    the body is re-rendered only when that fingerprint changes,
+  - the fingerprint is the ETag, so If-None-Match polls get a bodiless 304.
+
+events has no updated_at trigger, so the fingerprint cannot rely on updated_at
+alone; hashing every column the body is built from means any visible edit
+(description included) changes the ETag. Calendar clients polling every 15
+minutes therefore cost one query and no render (or nothing at all).
+
+    python -m legacylink.ical --port 8788
+    GET /calendars/universities/<id>.ics?token=...
+    GET /calendars/users/<id>.ics?token=...
+
+Feed URLs carry an HMAC token (ICAL_FEED_SECRET) since calendar apps cannot
+send Supabase sessions; see feed_token().
+"""
+
+import argparse
+import hashlib
+import hmac
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from legacylink.client import get_client
+
+EVENT_COLUMNS = 'id, title, description, event_date, location, updated_at'
+FEED_PATH = re.compile(r'^/calendars/(universities|users)/([0-9a-fA-F-]{36})\.ics$')
+
+
+def escape_ics(text):
+    """Same rules as escapeICS in app/api/events/[id]/ical/route.ts."""
+    if not text:
+        return ''
+    return text.replace('\\', '\\\\').replace('\n', '\\n').replace(',', '\\,').replace(';', '\\;')
+
+
+def ics_timestamp(value):
+    """2026-03-01T10:00:00+05:30 -> 20260301T043000Z (UTC, like toISOString())."""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def render_vevent(event):
+    starts = ics_timestamp(event['event_date'])
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:{event["id"]}@legacylink',
+        f'DTSTAMP:{starts}',
+        f'DTSTART:{starts}',
+        f'SUMMARY:{escape_ics(event["title"])}',
+    ]
+    if event.get('location'):
+        lines.append(f'LOCATION:{escape_ics(event["location"])}')
+    if event.get('description'):
+        lines.append(f'DESCRIPTION:{escape_ics(event["description"])}')
+    lines.append('END:VEVENT')
+    return '\r\n'.join(lines)
+
+
+def render_calendar(events, name=None):
+    parts = ['BEGIN:VCALENDAR', 'VERSION:2.0', 'PRODID:-//LegacyLink//EN']
+    if name:
+        parts.append(f'X-WR-CALNAME:{escape_ics(name)}')
+    parts.extend(render_vevent(event) for event in events)
+    parts.append('END:VCALENDAR')
+    return '\r\n'.join(parts)
+
+
+def feed_token(kind, feed_id, secret=None):
+    """HMAC token that authorises a calendar URL for one university or user."""
+    secret = secret or os.getenv('ICAL_FEED_SECRET', '')
+    return hmac.new(secret.encode(), f'{kind}:{feed_id}'.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+class FeedGenerator:
+    """Streams feed rows page by page and caches rendered calendars by fingerprint."""
+
+    def __init__(self, client, page_size=1000, ttl=60.0, max_entries=5000):
+        self.client = client
+        self.page_size = page_size
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'revalidated': 0, 'rendered': 0, 'not_modified': 0}
+
+    def _pages(self, kind, feed_id, columns):
+        start = 0
+        while True:
+            if kind == 'universities':
+                query = self.client.table('events').select(columns).eq('university_id', feed_id)
+                query = query.order('event_date').order('id')
+            else:
+                query = self.client.table('event_registrations').select(
+                    f'event_id, events({columns})'
+                ).eq('user_id', feed_id).order('event_id')
+            rows = query.range(start, start + self.page_size - 1).execute().data or []
+            for row in rows:
+                event = row if kind == 'universities' else row.get('events')
+                if event:
+                    yield event
+            if len(rows) < self.page_size:
+                return
+            start += self.page_size
+
+    def _events(self, kind, feed_id):
+        events = list(self._pages(kind, feed_id, EVENT_COLUMNS))
+        if kind == 'users':
+            events.sort(key=lambda e: (e['event_date'], e['id']))
+        return events
+
+    @staticmethod
+    def fingerprint(events):
+        """Hash of every column the feed is rendered from."""
+        digest = hashlib.sha256()
+        columns = [c.strip() for c in EVENT_COLUMNS.split(',')]
+        for event in events:
+            digest.update(('\x1f'.join(str(event.get(c)) for c in columns) + '\x1e').encode())
+        return digest.hexdigest()[:32]
+
+    def get(self, kind, feed_id):
+        """Return (etag, body) for a feed, rendering only when it changed."""
+        key = (kind, feed_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry and now - entry['checked_at'] < self.ttl:
+                self._cache.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry['etag'], entry['body']
+
+        events = self._events(kind, feed_id)
+        etag = self.fingerprint(events)
+        if entry and entry['etag'] == etag:
+            self.stats['revalidated'] += 1
+            body = entry['body']
+        else:
+            self.stats['rendered'] += 1
+            body = render_calendar(events, name='LegacyLink events').encode()
+
+        with self._lock:
+            self._cache[key] = {'etag': etag, 'body': body, 'checked_at': time.monotonic()}
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return etag, body
+
+    def respond(self, kind, feed_id, if_none_match=None):
+        """HTTP-shaped answer: (status, headers, body)."""
+        etag, body = self.get(kind, feed_id)
+        quoted = f'"{etag}"'
+        headers = {
+            'ETag': quoted,
+            'Cache-Control': f'private, max-age={int(self.ttl)}',
+        }
+        if if_none_match and quoted in [tag.strip() for tag in if_none_match.split(',')]:
+            self.stats['not_modified'] += 1
+            return 304, headers, b''
+        headers['Content-Type'] = 'text/calendar; charset=utf-8'
+        headers['Content-Disposition'] = f'attachment; filename={kind}_{feed_id}.ics'
+        return 200, headers, body
+
+    def invalidate(self, kind=None, feed_id=None):
+        """Drop cached feeds (all, one kind, or one feed)."""
+        with self._lock:
+            for key in list(self._cache):
+                if (kind is None or key[0] == kind) and (feed_id is None or key[1] == feed_id):
+                    del self._cache[key]
+
+
+def make_handler(generator, secret):
+    class FeedHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            match = FEED_PATH.match(url.path)
+            if not match:
+                return self._plain(404, 'Not found')
+            kind, feed_id = match.groups()
+            token = parse_qs(url.query).get('token', [''])[0]
+            if not secret or not hmac.compare_digest(token, feed_token(kind, feed_id, secret)):
+                return self._plain(403, 'Forbidden')
+
+            status, headers, body = generator.respond(kind, feed_id, self.headers.get('If-None-Match'))
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _plain(self, status, text):
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/plain')
+            self.end_headers()
+            self.wfile.write(text.encode())
+
+        def log_message(self, format, *args):
+            pass
+
+    return FeedHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cached iCalendar feeds for universities and users')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8788)
+    parser.add_argument('--ttl', type=float, default=60.0)
+    args = parser.parse_args()
+
+    secret = os.getenv('ICAL_FEED_SECRET')
+    if not secret:
+        print('❌ ICAL_FEED_SECRET is not set - refusing to serve unauthenticated feeds')
+        return
+
+    generator = FeedGenerator(get_client(service_role=True), ttl=args.ttl)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(generator, secret))
+    print(f'📅 Calendar feeds listening on {args.host}:{args.port}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f'📊 {generator.stats}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""
+Side-effect-free migration status.
+
+Reads the catalog through migration_catalog() (scripts/015_migration_catalog.sql)
+in a single RPC and compares it with what scripts 009-011 leave behind:
+functions (by signature, and by the fragments each script's version must or
+must not contain), the auth.users triggers, and the profiles insert policy.
+Nothing is called except the catalog read, so checking status never runs a
+sync. The catalog is granted to service_role only, so this needs
+SUPABASE_SERVICE_ROLE_KEY.
+
+Bodies are not compared byte for byte: the one-off fixes in the repository
+root (complete_trigger_fix.sql, URGENT_SQL_FIX.sql ...) install equivalent
+functions with different comments and error handling, and those are fine as
+long as they do what the numbered script does.
+
+    python -m legacylink.migrations
+    python -m legacylink.migrations --json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from collections import namedtuple
+
+from legacylink.client import get_client
+
+CATALOG_RPC = 'migration_catalog'
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts')
+PROBED_SCRIPTS = ('009_auth_debug_functions.sql', '010_fix_profile_creation.sql', '011_fix_auto_verification.sql')
+
+# (name, identity arguments, script that last defines it)
+EXPECTED_FUNCTIONS = (
+    ('get_auth_users_by_email', 'email_param text', '009'),
+    ('sync_missing_profiles', '', '009'),
+    ('get_user_comprehensive_info', 'email_param text', '009'),
+    ('handle_new_user', '', '011'),
+    ('handle_user_email_confirmed', '', '010'),
+    ('sync_existing_auth_users', '', '010'),
+)
+# (name, table, function, should exist, script)
+EXPECTED_TRIGGERS = (
+    ('on_auth_user_created', 'auth.users', 'handle_new_user', True, '010'),
+    ('on_auth_user_email_confirmed', 'auth.users', 'handle_user_email_confirmed', False, '011'),
+)
+# (name, table, command, script)
+EXPECTED_POLICIES = (
+    ('Users can insert their own profile', 'profiles', 'INSERT', '010'),
+)
+
+AUTH_USERS = ('reads auth.users', r'\bauth\.users\b')
+INSERTS_PROFILE = ('inserts into profiles', r'INSERT\s+INTO\s+(?:public\.)?profiles\b')
+# function -> ([(what, pattern) the body must match], [(what, pattern) it must not]), comments ignored
+FUNCTION_FRAGMENTS = {
+    'get_auth_users_by_email': ([AUTH_USERS], []),
+    'sync_missing_profiles': ([AUTH_USERS, INSERTS_PROFILE], []),
+    'get_user_comprehensive_info': ([AUTH_USERS, ('reads profiles', r'\bprofiles\b')], []),
+    # 011: new profiles are never verified automatically, whatever the confirmation state
+    'handle_new_user': ([INSERTS_PROFILE], [('verifies from email_confirmed_at', r'\bemail_confirmed_at\b')]),
+    'handle_user_email_confirmed': ([('sets verified', r'\bverified\b')], []),
+    'sync_existing_auth_users': ([AUTH_USERS, INSERTS_PROFILE], []),
+}
+
+Check = namedtuple('Check', 'kind name script status detail')
+
+FUNCTION_BODY = re.compile(
+    r'CREATE\s+OR\s+REPLACE\s+FUNCTION\s+(?:public\.)?(\w+)\s*\(.*?\bAS\s+\$\$(.*?)\$\$',
+    re.IGNORECASE | re.DOTALL,
+)
+SQL_COMMENT = re.compile(r'--[^\n]*|/\*.*?\*/', re.DOTALL)
+
+
+class MigrationProbeError(Exception):
+    pass
+
+
+def script_body_hashes(scripts_dir=SCRIPTS_DIR, scripts=PROBED_SCRIPTS):
+    """md5 of each function body as last defined across `scripts` (what pg_proc.prosrc holds)."""
+    hashes = {}
+    for script in scripts:
+        path = os.path.join(scripts_dir, script)
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            for name, body in FUNCTION_BODY.findall(f.read()):
+                hashes[name] = hashlib.md5(body.encode()).hexdigest()
+    return hashes
+
+
+def body_problem(name, body):
+    """Why a deployed function body does not match its script's behaviour, or None if it does."""
+    required, forbidden = FUNCTION_FRAGMENTS.get(name, ([], []))
+    code = SQL_COMMENT.sub(' ', body)
+    for what, pattern in required:
+        if not re.search(pattern, code, re.IGNORECASE):
+            return f'body no longer {what}'
+    for what, pattern in forbidden:
+        if re.search(pattern, code, re.IGNORECASE):
+            return f'body still {what}'
+    return None
+
+
+def read_catalog(client):
+    """One RPC returning {'functions': [...], 'triggers': [...], 'policies': [...]}."""
+    try:
+        data = client.rpc(CATALOG_RPC).execute().data
+    except Exception as e:
+        raise MigrationProbeError(
+            f'{CATALOG_RPC}() is not available ({e}); apply scripts/015_migration_catalog.sql first'
+        ) from e
+    if isinstance(data, list):
+        data = data[0] if data else {}
+    if isinstance(data, str):
+        data = json.loads(data)
+    return data or {}
+
+
+def compare(catalog, body_hashes=None):
+    """Checks for every expected function, trigger and policy against a catalog snapshot."""
+    body_hashes = script_body_hashes() if body_hashes is None else body_hashes
+    functions = {}
+    for row in catalog.get('functions', []):
+        functions.setdefault(row['name'], []).append(row)
+    triggers = {(row['name'], row['table']): row for row in catalog.get('triggers', [])}
+    policies = {(row['name'], row['table']): row for row in catalog.get('policies', [])}
+    checks = []
+
+    for name, arguments, script in EXPECTED_FUNCTIONS:
+        rows = functions.get(name, [])
+        match = next((r for r in rows if r['arguments'].lower() == arguments), None)
+        if match is None:
+            found = ', '.join(f'{name}({r["arguments"]})' for r in rows)
+            checks.append(Check('function', f'{name}({arguments})', script, 'missing',
+                                f'found {found}' if found else 'not defined'))
+        elif name in body_hashes and match.get('body_md5') == body_hashes[name]:
+            checks.append(Check('function', f'{name}({arguments})', script, 'ok', match['returns']))
+        elif match.get('body') is None:
+            # catalog from an older 015 without bodies: only the hash is there to go on
+            checks.append(Check('function', f'{name}({arguments})', script, 'outdated',
+                                f'body differs from scripts/{script}_*.sql (re-apply 015 for a fragment check)'))
+        else:
+            problem = body_problem(name, match['body'])
+            if problem:
+                checks.append(Check('function', f'{name}({arguments})', script, 'outdated',
+                                    f'{problem}; re-run scripts/{script}_*.sql'))
+            else:
+                checks.append(Check('function', f'{name}({arguments})', script, 'ok', match['returns']))
+
+    for name, table, function, present, script in EXPECTED_TRIGGERS:
+        row = triggers.get((name, table))
+        if not present:
+            status = 'unexpected' if row else 'ok'
+            detail = f'should have been dropped by scripts/{script}_*.sql' if row else 'absent as expected'
+        elif row is None:
+            status, detail = 'missing', f'not defined on {table}'
+        elif row['function'] != function:
+            status, detail = 'outdated', f'executes {row["function"]}() instead of {function}()'
+        elif not row['enabled']:
+            status, detail = 'outdated', 'disabled'
+        else:
+            status, detail = 'ok', f'{table} -> {function}()'
+        checks.append(Check('trigger', name, script, status, detail))
+
+    for name, table, command, script in EXPECTED_POLICIES:
+        row = policies.get((name, table))
+        if row is None:
+            status, detail = 'missing', f'no such policy on {table}'
+        elif row['command'] != command:
+            status, detail = 'outdated', f'FOR {row["command"]} instead of FOR {command}'
+        else:
+            status, detail = 'ok', f'{table} FOR {command}'
+        checks.append(Check('policy', name, script, status, detail))
+    return checks
+
+
+def probe_migrations(client, body_hashes=None):
+    """Catalog-based status of scripts 009-011. Costs one read-only RPC."""
+    return compare(read_catalog(client), body_hashes)
+
+
+def applied(checks):
+    return all(check.status == 'ok' for check in checks)
+
+
+STATUS_ICONS = {'ok': '✅', 'missing': '❌', 'outdated': '⚠️ ', 'unexpected': '⚠️ '}
+
+
+def print_checks(checks, indent='  '):
+    for check in checks:
+        print(f'{indent}{STATUS_ICONS[check.status]} {check.kind} {check.name} [{check.script}]: {check.detail}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migration status from the database catalog (read-only)')
+    parser.add_argument('--json', action='store_true', help='print the checks as JSON')
+    args = parser.parse_args()
+
+    try:
+        checks = probe_migrations(get_client(service_role=True))
+    except MigrationProbeError as e:
+        print(f'❌ {e}')
+        raise SystemExit(2)
+
+    if args.json:
+        print(json.dumps([check._asdict() for check in checks], indent=2))
+    else:
+        print('🔍 Migration Status (catalog probe):')
+        print_checks(checks)
+        print('🎉 Scripts 009-011 fully applied' if applied(checks) else '🔧 Re-run the flagged scripts in the SQL editor')
+    raise SystemExit(0 if applied(checks) else 1)
+
+
+if __name__ == '__main__':
+    main()
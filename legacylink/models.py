@@ -0,0 +1,138 @@
+"""
+Compact row models mirroring lib/types.ts.
+
+result.data hands back one dict per row, each with its own hash table and
+references to every key; a million profiles held that way costs gigabytes.
+These classes use __slots__ (no per-instance dict), share one interned
+string per enum value (role, status, payment_status) and intern
+low-cardinality columns such as university_id.
+
+from_row() is generated per class as straight-line attribute assignments, so
+decoding a page is about as fast as touching the dict keys once. Embedded rows
+are read from the aliases the app selects them under (university:universities,
+creator:profiles!created_by, mentor:mentor_id ...), which are also the field
+names in lib/types.ts:
+
+    profiles = Profile.from_rows(client.table('profiles').select('*, university:universities(*)').execute().data)
+"""
+
+import sys
+
+ROLES = ('super_admin', 'university_admin', 'alumni', 'student')
+MENTORSHIP_STATUSES = ('pending', 'active', 'completed', 'cancelled')
+PAYMENT_STATUSES = ('pending', 'completed', 'failed', 'refunded')
+
+
+def _interned(values):
+    return {value: sys.intern(value) for value in values}
+
+
+class Row:
+    """Base for slotted row models. Subclasses list FIELDS and optional ENUMS/INTERN/EMBEDS."""
+
+    __slots__ = ()
+    FIELDS = ()
+    ENUMS = {}
+    INTERN = ()
+    EMBEDS = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._compile_loader()
+
+    @classmethod
+    def _compile_loader(cls):
+        """Generate `from_row(data)` with one assignment per field."""
+        namespace = {'new': object.__new__, 'cls': cls, 'intern': sys.intern}
+        lines = ['def from_row(data):', '    row = new(cls)', '    get = data.get']
+        for name in cls.FIELDS:
+            if name in cls.ENUMS:
+                namespace[f'_{name}'] = _interned(cls.ENUMS[name])
+                lines.append(f'    value = get({name!r})')
+                lines.append(f'    row.{name} = _{name}.get(value, value)')
+            elif name in cls.INTERN:
+                lines.append(f'    value = get({name!r})')
+                lines.append(f'    row.{name} = intern(value) if value.__class__ is str else value')
+            else:
+                lines.append(f'    row.{name} = get({name!r})')
+        for name, (key, model) in cls.EMBEDS.items():
+            namespace[f'_{name}_model'] = model
+            lines.append(f'    value = get({key!r})')
+            lines.append(f'    row.{name} = _{name}_model.from_row(value) if value else None')
+        lines.append('    return row')
+        exec('\n'.join(lines), namespace)
+        cls.from_row = staticmethod(namespace['from_row'])
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_rows(cls, rows):
+        load = cls.from_row
+        return [load(row) for row in rows or ()]
+
+    def to_dict(self):
+        data = {name: getattr(self, name) for name in self.FIELDS}
+        for name, (key, _) in self.EMBEDS.items():
+            embedded = getattr(self, name)
+            if embedded is not None:
+                data[key] = embedded.to_dict()
+        return data
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __hash__(self):
+        # equal rows share their key (the first field), so hashing it alone stays consistent with __eq__
+        return hash((type(self), getattr(self, self.FIELDS[0])))
+
+    def __repr__(self):
+        key = self.FIELDS[0]
+        return f'{type(self).__name__}({key}={getattr(self, key)!r})'
+
+
+class University(Row):
+    FIELDS = ('id', 'name', 'domain', 'logo_url', 'approved', 'created_at', 'updated_at')
+    __slots__ = FIELDS
+
+
+class Profile(Row):
+    FIELDS = ('id', 'email', 'full_name', 'role', 'university_id', 'linkedin_url', 'verified',
+              'created_at', 'updated_at')
+    ENUMS = {'role': ROLES}
+    INTERN = ('university_id',)
+    EMBEDS = {'university': ('university', University)}
+    __slots__ = FIELDS + tuple(EMBEDS)
+
+
+class AlumniProfile(Row):
+    FIELDS = ('user_id', 'skills', 'current_job', 'current_company', 'achievements', 'photo_url',
+              'graduation_year', 'degree', 'bio', 'available_for_mentoring', 'created_at', 'updated_at')
+    INTERN = ('current_company', 'degree')
+    EMBEDS = {'profile': ('profile', Profile)}
+    __slots__ = FIELDS + tuple(EMBEDS)
+
+
+class Event(Row):
+    FIELDS = ('id', 'university_id', 'title', 'description', 'event_date', 'location', 'max_attendees',
+              'created_by', 'created_at', 'updated_at')
+    INTERN = ('university_id', 'location', 'created_by')
+    EMBEDS = {'university': ('university', University), 'creator': ('creator', Profile)}
+    __slots__ = FIELDS + tuple(EMBEDS)
+
+
+class Mentorship(Row):
+    FIELDS = ('id', 'mentor_id', 'mentee_id', 'status', 'message', 'created_at', 'updated_at')
+    ENUMS = {'status': MENTORSHIP_STATUSES}
+    EMBEDS = {'mentor': ('mentor', Profile), 'mentee': ('mentee', Profile)}
+    __slots__ = FIELDS + tuple(EMBEDS)
+
+
+class Donation(Row):
+    FIELDS = ('id', 'donor_id', 'university_id', 'amount', 'payment_status', 'payment_id', 'receipt_url',
+              'created_at', 'updated_at')
+    ENUMS = {'payment_status': PAYMENT_STATUSES}
+    INTERN = ('university_id',)
+    EMBEDS = {'donor': ('donor', Profile), 'university': ('university', University)}
+    __slots__ = FIELDS + tuple(EMBEDS)
@@ -0,0 +1,264 @@
+"""
+Continuous synthetic prober with latency SLOs.
+
+Runs the queries app_health_check.py checks once (universities, profiles,
+auth session) plus the admin dashboard's own queries (app/admin/page.tsx:
+pending verification list with embeds, all-users stats) on a jittered
+schedule. Every probe keeps a sliding window of latencies; once the window
+holds enough samples its p95/p99 are compared with the probe's SLOs and an
+alert is emitted as a JSON line when a target is breached or recovers.
+
+A probe that does not answer within --timeout counts as a sample at the
+timeout, so a dashboard that is stuck loading (the emergency_loading_fix.sql
+class of problem) breaches its SLO instead of only showing up as an error.
+Consecutive failures raise a separate `failing` alert. Latencies also go to
+the `legacylink_probe_seconds` histogram (--metrics-port serves /metrics).
+
+    python -m legacylink.prober --interval 30 --slo admin_pending=1500:4000
+    python -m legacylink.prober --duration 600 --alerts alerts.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import deque, namedtuple
+from datetime import datetime, timezone
+
+from legacylink.client import get_client
+from legacylink.telemetry import REGISTRY, JsonLinesSink, serve_metrics
+
+PROBE_SECONDS = REGISTRY.histogram('legacylink_probe_seconds', 'Synthetic probe latency')
+PROBE_FAILURES = REGISTRY.counter('legacylink_probe_failures_total', 'Failed or timed-out synthetic probes')
+
+# run(client, university_id) executes one query; key picks the anon or service-role client
+Probe = namedtuple('Probe', 'name key run p95_ms p99_ms')
+
+
+def _auth_session(client, university_id):
+    if hasattr(client.auth, 'get_session'):
+        return client.auth.get_session()
+    return None
+
+
+def _admin_pending(client, university_id):
+    query = client.table('profiles').select(
+        '*, university:universities(*), alumni_profile:alumni_profiles(*)'
+    ).eq('verified', False).in_('role', ['alumni', 'student'])
+    return query.order('created_at', desc=True).execute()
+
+
+def _admin_users(client, university_id):
+    query = client.table('profiles').select('*')
+    if university_id:
+        query = query.eq('university_id', university_id)
+    return query.execute()
+
+
+PROBES = (
+    Probe('universities', 'anon',
+          lambda c, u: c.table('universities').select('id,name,approved').limit(1).execute(), 300, 800),
+    Probe('profiles', 'anon', lambda c, u: c.table('profiles').select('id,email,role').limit(1).execute(), 300, 800),
+    Probe('auth_session', 'anon', _auth_session, 200, 500),
+    Probe('admin_pending', 'service', _admin_pending, 1000, 2500),
+    Probe('admin_users', 'service', _admin_users, 1000, 2500),
+)
+
+
+def _percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+
+
+class ProbeState:
+    def __init__(self, probe, window):
+        self.probe = probe
+        self.samples = deque(maxlen=window)
+        self.runs = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.breached = set()
+        self.failing = False
+        self.last_error = None
+        self.inflight = None
+
+    def percentiles(self):
+        if not self.samples:
+            return None, None
+        ordered = sorted(self.samples)
+        return _percentile(ordered, 95), _percentile(ordered, 99)
+
+    def snapshot(self):
+        p95, p99 = self.percentiles()
+        return {
+            'probe': self.probe.name,
+            'runs': self.runs,
+            'failures': self.failures,
+            'p95_ms': round(p95, 1) if p95 is not None else None,
+            'p99_ms': round(p99, 1) if p99 is not None else None,
+            'slo_p95_ms': self.probe.p95_ms,
+            'slo_p99_ms': self.probe.p99_ms,
+            'breached': sorted(self.breached),
+            'failing': self.failing,
+        }
+
+
+class Prober:
+    """Schedules probes with jitter and evaluates them against their SLOs."""
+
+    def __init__(self, clients, probes=PROBES, interval=30.0, jitter=0.2, timeout=10.0, window=100,
+                 min_samples=20, failure_threshold=3, university_id=None, emit=None):
+        self.clients = clients
+        self.interval = interval
+        self.jitter = jitter
+        self.timeout = timeout
+        self.min_samples = min_samples
+        self.failure_threshold = failure_threshold
+        self.university_id = university_id
+        self.emit = emit or (lambda alert: print(json.dumps(alert), flush=True))
+        self.states = {probe.name: ProbeState(probe, window) for probe in probes}
+
+    def _alert(self, state, kind, status, **detail):
+        self.emit({
+            'type': 'alert',
+            'ts': datetime.now(timezone.utc).isoformat(),
+            'probe': state.probe.name,
+            'alert': kind,
+            'status': status,
+            'samples': len(state.samples),
+            **detail,
+        })
+
+    async def run_probe(self, state):
+        """Run one probe now and evaluate its SLOs. Returns the latency in ms."""
+        probe = state.probe
+        client = self.clients[probe.key]
+        started = time.perf_counter()
+        error, timed_out = None, False
+        try:
+            if state.inflight is not None and not state.inflight.done():
+                # the previous call is still stuck; do not pile another thread on top of it
+                raise asyncio.TimeoutError
+            state.inflight = asyncio.ensure_future(asyncio.to_thread(probe.run, client, self.university_id))
+            await asyncio.wait_for(asyncio.shield(state.inflight), self.timeout)
+        except asyncio.TimeoutError:
+            error, timed_out = f'timed out after {self.timeout}s', True
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        elapsed_ms = self.timeout * 1000 if timed_out else (time.perf_counter() - started) * 1000
+
+        state.runs += 1
+        PROBE_SECONDS.observe(elapsed_ms / 1000, probe=probe.name)
+        if error:
+            state.failures += 1
+            state.consecutive_failures += 1
+            state.last_error = error
+            PROBE_FAILURES.inc(probe=probe.name)
+        else:
+            state.consecutive_failures = 0
+        # failed requests that returned quickly say nothing about latency
+        if not error or timed_out:
+            state.samples.append(elapsed_ms)
+        self._evaluate(state)
+        return elapsed_ms
+
+    def _evaluate(self, state):
+        if state.consecutive_failures >= self.failure_threshold and not state.failing:
+            state.failing = True
+            self._alert(state, 'failing', 'firing', consecutive=state.consecutive_failures, error=state.last_error)
+        elif state.consecutive_failures == 0 and state.failing:
+            state.failing = False
+            self._alert(state, 'failing', 'resolved')
+
+        if len(state.samples) < self.min_samples:
+            return
+        for metric, value, target in zip(('p95', 'p99'), state.percentiles(), (state.probe.p95_ms,
+                                                                               state.probe.p99_ms)):
+            if value > target and metric not in state.breached:
+                state.breached.add(metric)
+                self._alert(state, f'slo_{metric}', 'firing', value_ms=round(value, 1), slo_ms=target)
+            elif value <= target and metric in state.breached:
+                state.breached.discard(metric)
+                self._alert(state, f'slo_{metric}', 'resolved', value_ms=round(value, 1), slo_ms=target)
+
+    async def _loop(self, state, stop):
+        # spread the first runs so probes do not fire in lockstep
+        await asyncio.sleep(random.uniform(0, self.interval * self.jitter))
+        while not stop.is_set():
+            await self.run_probe(state)
+            delay = self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+            try:
+                await asyncio.wait_for(stop.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self, duration=None):
+        """Probe until `duration` seconds pass (forever if None). Returns the final snapshots."""
+        stop = asyncio.Event()
+        tasks = [asyncio.create_task(self._loop(state, stop)) for state in self.states.values()]
+        try:
+            if duration is None:
+                await asyncio.gather(*tasks)
+            else:
+                await asyncio.sleep(duration)
+        finally:
+            stop.set()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return self.status()
+
+    def status(self):
+        return [state.snapshot() for state in self.states.values()]
+
+
+def parse_slo(text):
+    """'admin_pending=1500:4000' -> ('admin_pending', 1500.0, 4000.0)."""
+    name, _, targets = text.partition('=')
+    p95, _, p99 = targets.partition(':')
+    return name, float(p95), float(p99 or p95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Synthetic health prober with latency SLOs')
+    parser.add_argument('--interval', type=float, default=30.0, help='seconds between runs of each probe')
+    parser.add_argument('--jitter', type=float, default=0.2, help='fraction of the interval to randomize')
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--window', type=int, default=100, help='latency samples kept per probe')
+    parser.add_argument('--min-samples', type=int, default=20, help='samples needed before SLOs are evaluated')
+    parser.add_argument('--slo', action='append', default=[], metavar='PROBE=P95:P99',
+                        help='override SLO targets in ms (repeatable)')
+    parser.add_argument('--probes', help=f'comma-separated subset of: {", ".join(p.name for p in PROBES)}')
+    parser.add_argument('--university', help='scope admin probes to a university admin view')
+    parser.add_argument('--duration', type=float, help='stop after this many seconds')
+    parser.add_argument('--alerts', help='append alerts to this JSON lines file instead of stdout')
+    parser.add_argument('--metrics-port', type=int, help='serve Prometheus /metrics on this port')
+    args = parser.parse_args()
+
+    overrides = dict((name, (p95, p99)) for name, p95, p99 in map(parse_slo, args.slo))
+    selected = set(args.probes.split(',')) if args.probes else None
+    probes = [
+        probe._replace(p95_ms=overrides.get(probe.name, (probe.p95_ms,))[0],
+                       p99_ms=overrides.get(probe.name, (None, probe.p99_ms))[1])
+        for probe in PROBES if selected is None or probe.name in selected
+    ]
+    clients = {'anon': get_client(), 'service': get_client(service_role=True)}
+    emit = JsonLinesSink(args.alerts).write if args.alerts else None
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+
+    prober = Prober(clients, probes, args.interval, args.jitter, args.timeout, args.window, args.min_samples,
+                    university_id=args.university, emit=emit)
+    print(f'📡 Probing {", ".join(p.name for p in probes)} every ~{args.interval}s', file=sys.stderr)
+    try:
+        status = asyncio.run(prober.run(args.duration))
+    except KeyboardInterrupt:
+        status = prober.status()
+    for snapshot in status:
+        icon = '❌' if snapshot['breached'] or snapshot['failing'] else '✅'
+        print(f'{icon} {snapshot["probe"]}: p95 {snapshot["p95_ms"]} ms (SLO {snapshot["slo_p95_ms"]}), '
+              f'p99 {snapshot["p99_ms"]} ms (SLO {snapshot["slo_p99_ms"]}), '
+              f'{snapshot["failures"]}/{snapshot["runs"]} failed', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,301 @@
+"""
+Adaptive rate limiting and retries for bulk jobs against PostgREST.
+
+Sync, verification and seeding jobs send requests as fast as their threads
+allow, run into 429 / 503 from the API gateway and (in the top-level scripts)
+print the error and move on. RateLimitedClient paces them instead:
+
+  - every endpoint (table, or rpc:<name>) draws from its own token bucket,
+    started at its budget; a 429 cuts that endpoint's rate to 70% and each
+    second's worth of successes adds 5% of the budget back (AIMD), capped at
+    the budget,
+  - requests in flight across all endpoints are capped by a limit that grows
+    by one per round of successful requests and halves on 503, pool or
+    statement timeouts and network errors,
+  - a burst of rejections from requests already in flight counts once: only
+    requests started after the last decrease can decrease again,
+  - idempotent calls (select, upsert, update, delete, read-only RPCs) are
+    retried with full-jitter exponential backoff; inserts and other RPCs
+    only on 429, which the gateway returns before running anything.
+
+Throughput therefore settles just under what the project tier sustains, and
+jobs stop losing rows to errors they never retried.
+
+    client = rate_limited(get_client(service_role=True), budgets={'profiles': 50}, default_budget=20)
+    client.table('profiles').upsert(rows).execute()
+    client.limiter.stats()
+"""
+
+import random
+import threading
+import time
+
+from legacylink.singleflight import READ_ONLY_RPCS
+from legacylink.telemetry import record_retry
+
+THROTTLE_CODES = frozenset({'429'})
+OVERLOAD_CODES = frozenset({'503', '502', '504', '408', 'PGRST003', '57014'})
+TRANSIENT_ERRORS = frozenset({
+    'TimeoutException', 'ConnectError', 'ReadError', 'WriteError', 'RemoteProtocolError', 'PoolTimeout',
+    'ConnectionError', 'TimeoutError',
+})
+
+
+def error_status(error):
+    code = getattr(error, 'code', None) or getattr(getattr(error, 'response', None), 'status_code', None)
+    return str(code) if code is not None else None
+
+
+def classify(error):
+    """'throttle' (429), 'overload' (503s, timeouts, network errors) or None (not retryable)."""
+    status = error_status(error)
+    if status in THROTTLE_CODES:
+        return 'throttle'
+    if status in OVERLOAD_CODES or any(cls.__name__ in TRANSIENT_ERRORS for cls in type(error).__mro__):
+        return 'overload'
+    return None
+
+
+def rejects_rows(error):
+    """True when the database refused the rows themselves (SQLSTATE class 22/23), so a retry cannot succeed."""
+    status = error_status(error) or ''
+    return status.startswith('22') or status.startswith('23')
+
+
+class AIMD:
+    """Additive-increase / multiplicative-decrease controller for one value."""
+
+    def __init__(self, value, minimum, maximum, increase=1.0, decrease=0.5, clock=time.monotonic):
+        self.value = float(value)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.clock = clock
+        self._last_decrease = float('-inf')
+
+    def success(self):
+        # +increase after roughly `value` successes, i.e. once per round
+        self.value = min(self.maximum, self.value + self.increase / max(self.value, 1.0))
+
+    def failure(self, started):
+        """Decrease unless the request was already in flight at the last decrease."""
+        if started < self._last_decrease:
+            return False
+        self.value = max(self.minimum, self.value * self.decrease)
+        self._last_decrease = self.clock()
+        return True
+
+
+class TokenBucket:
+    """Blocking token bucket whose refill rate follows an AIMD controller."""
+
+    def __init__(self, rate, burst=None, minimum_rate=0.5, rate_increase=None, decrease=0.7, clock=time.monotonic,
+                 sleep=time.sleep):
+        # by default: a tenth of a second of burst, and +5% of the budget per second of successes
+        increase = rate_increase if rate_increase is not None else max(1.0, rate * 0.05)
+        self.control = AIMD(rate, minimum_rate, rate, increase, decrease, clock=clock)
+        self.burst = burst or max(1.0, rate / 10)
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.burst
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self):
+        return self.control.value
+
+    def acquire(self):
+        """Take one token, sleeping until one is available. Returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            self.sleep(delay)
+            waited += delay
+
+    def success(self):
+        with self._lock:
+            self.control.success()
+
+    def throttled(self, started):
+        with self._lock:
+            if self.control.failure(started):
+                # drop the tokens accumulated at the old rate
+                self._tokens = min(self._tokens, 0.0)
+
+
+class ConcurrencyLimit:
+    """Caps requests in flight at an AIMD-controlled limit."""
+
+    def __init__(self, initial=4, minimum=1, maximum=64, clock=time.monotonic):
+        self.control = AIMD(initial, minimum, maximum, clock=clock)
+        self.clock = clock
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self):
+        return self.control.value
+
+    def acquire(self):
+        """Wait for a slot. Returns the start time to pass back to release()."""
+        with self._cond:
+            while self.in_flight >= int(self.control.value):
+                self._cond.wait()
+            self.in_flight += 1
+            return self.clock()
+
+    def release(self, started, outcome):
+        with self._cond:
+            self.in_flight -= 1
+            if outcome == 'ok':
+                self.control.success()
+            elif outcome == 'overload':
+                self.control.failure(started)
+            self._cond.notify_all()
+
+
+class RetryPolicy:
+    """Full-jitter exponential backoff: sleep uniform(0, min(cap, base * 2**attempt))."""
+
+    def __init__(self, attempts=6, base=0.1, cap=10.0, rng=random.random):
+        self.attempts = attempts
+        self.base = base
+        self.cap = cap
+        self.rng = rng
+
+    def delay(self, attempt):
+        return self.rng() * min(self.cap, self.base * 2 ** attempt)
+
+
+class RateLimiter:
+    """Per-endpoint token buckets, a shared concurrency limit and retries."""
+
+    def __init__(self, budgets=None, default_budget=20.0, concurrency=4, max_concurrency=32, retry=None,
+                 sleep=time.sleep):
+        self.budgets = dict(budgets or {})
+        self.default_budget = default_budget
+        self.concurrency = ConcurrencyLimit(concurrency, 1, max_concurrency)
+        self.retry = retry or RetryPolicy()
+        self.sleep = sleep
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._stats = {'calls': 0, 'retries': 0, 'throttled': 0, 'overloaded': 0, 'failed': 0, 'waited_s': 0.0}
+
+    def bucket(self, endpoint):
+        with self._lock:
+            bucket = self._buckets.get(endpoint)
+            if bucket is None:
+                budget = self.budgets.get(endpoint, self.default_budget)
+                bucket = self._buckets[endpoint] = TokenBucket(budget, sleep=self.sleep)
+            return bucket
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def call(self, endpoint, fn, idempotent=True):
+        """Run fn() within the endpoint's budget, retrying transient failures."""
+        bucket = self.bucket(endpoint)
+        attempt = 0
+        while True:
+            self._count('waited_s', bucket.acquire())
+            started = self.concurrency.acquire()
+            self._count('calls')
+            try:
+                result = fn()
+            except Exception as e:
+                kind = classify(e)
+                self.concurrency.release(started, kind)
+                if kind == 'throttle':
+                    self._count('throttled')
+                    bucket.throttled(started)
+                elif kind == 'overload':
+                    self._count('overloaded')
+                retryable = kind == 'throttle' or (kind == 'overload' and idempotent)
+                if not retryable or attempt + 1 >= self.retry.attempts:
+                    self._count('failed')
+                    raise
+                self._count('retries')
+                record_retry(endpoint, error_status(e) or type(e).__name__)
+                self.sleep(self.retry.delay(attempt))
+                attempt += 1
+                continue
+            self.concurrency.release(started, 'ok')
+            bucket.success()
+            return result
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['waited_s'] = round(stats['waited_s'], 2)
+            stats['concurrency_limit'] = round(self.concurrency.limit, 1)
+            stats['rates'] = {endpoint: round(bucket.rate, 1) for endpoint, bucket in self._buckets.items()}
+        return stats
+
+
+class _LimitedBuilder:
+    __slots__ = ('_builder', '_limiter', '_endpoint', '_idempotent')
+
+    def __init__(self, builder, limiter, endpoint, idempotent):
+        self._builder = builder
+        self._limiter = limiter
+        self._endpoint = endpoint
+        self._idempotent = idempotent
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if hasattr(attr, 'execute'):
+            return _LimitedBuilder(attr, self._limiter, self._endpoint, self._idempotent)
+        if not callable(attr):
+            return attr
+        idempotent = self._idempotent and name != 'insert'
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if hasattr(result, 'execute'):
+                return _LimitedBuilder(result, self._limiter, self._endpoint, idempotent)
+            return result
+
+        return call
+
+    def execute(self):
+        return self._limiter.call(self._endpoint, self._builder.execute, self._idempotent)
+
+
+class RateLimitedClient:
+    """Proxy sending every table()/rpc() call through a RateLimiter."""
+
+    def __init__(self, client, limiter, idempotent_rpcs=READ_ONLY_RPCS):
+        object.__setattr__(self, '_client', client)
+        object.__setattr__(self, 'limiter', limiter)
+        object.__setattr__(self, 'idempotent_rpcs', frozenset(idempotent_rpcs))
+
+    def table(self, name):
+        return _LimitedBuilder(self._client.table(name), self.limiter, name, True)
+
+    from_ = table
+
+    def rpc(self, name, params=None, *args, **kwargs):
+        builder = self._client.rpc(name, params, *args, **kwargs)
+        return _LimitedBuilder(builder, self.limiter, f'rpc:{name}', name in self.idempotent_rpcs)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._client, name, value)
+
+
+def rate_limited(client, budgets=None, default_budget=20.0, concurrency=4, max_concurrency=32, retry=None):
+    """Wrap a client for a bulk job. budgets maps endpoint -> requests per second."""
+    limiter = RateLimiter(budgets, default_budget, concurrency, max_concurrency, retry)
+    return RateLimitedClient(client, limiter)
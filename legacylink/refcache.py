@@ -0,0 +1,194 @@
+"""
+Process-local read-through cache for reference data.
+
+Universities are read by every health check and admin view and embedded in
+most profile queries (`universities(name)`), but change maybe weekly.
+ReferenceCache serves them from memory:
+
+  - entries expire after `ttl` seconds and the cache holds at most `maxsize`
+    rows per table (least recently used first out),
+  - ids that do not exist are remembered for `negative_ttl` so a dangling
+    university_id does not cost a request per row,
+  - invalidate() drops entries explicitly, and change_handler() does it from
+    the change outbox (scripts/016_capture_universities.sql) so edits show up
+    before the TTL runs out,
+  - resolve() fills in the embed PostgREST would have returned, so profile
+    queries can select university_id and skip the join.
+
+    cache = shared_cache(client)
+    rows = client.table('profiles').select('id, full_name, university_id').execute().data
+    cache.resolve(rows)   # row['universities'] == {'name': ...} or None
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+# table -> key column
+REFERENCE_TABLES = {'universities': 'id'}
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded LRU map whose entries expire `ttl` seconds after they were stored."""
+
+    def __init__(self, maxsize=1024, ttl=3600.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= self.clock():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = (self.clock() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hits / total, 3) if total else None,
+        }
+
+
+class ReferenceCache:
+    """Read-through cache over REFERENCE_TABLES for one client."""
+
+    def __init__(self, client, ttl=3600.0, maxsize=10000, negative_ttl=60.0, lookup_chunk=200):
+        self.client = client
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.negative_ttl = negative_ttl
+        self.lookup_chunk = lookup_chunk
+        self._caches = {table: TTLCache(maxsize, ttl) for table in REFERENCE_TABLES}
+
+    def _cache(self, table):
+        if table not in self._caches:
+            raise KeyError(f'{table} is not a reference table ({", ".join(REFERENCE_TABLES)})')
+        return self._caches[table]
+
+    def get(self, table, key):
+        """The row for `key`, or None if it does not exist."""
+        return self.get_many(table, [key]).get(key)
+
+    def get_many(self, table, keys):
+        """{key: row} for the keys that exist; misses are fetched with one in_() query per chunk."""
+        cache = self._cache(table)
+        key_column = REFERENCE_TABLES[table]
+        found, wanted = {}, []
+        for key in dict.fromkeys(k for k in keys if k is not None):
+            row = cache.get(key, None)
+            if row is None:
+                wanted.append(key)
+            elif row is not _MISSING:
+                found[key] = row
+        for start in range(0, len(wanted), self.lookup_chunk):
+            chunk = wanted[start:start + self.lookup_chunk]
+            rows = self.client.table(table).select('*').in_(key_column, chunk).execute().data or []
+            for row in rows:
+                cache.put(row[key_column], row)
+                found[row[key_column]] = row
+            for key in chunk:
+                if key not in found:
+                    cache.put(key, _MISSING, self.negative_ttl)
+        return found
+
+    def warm(self, table):
+        """Load a whole (small) reference table in one request. Returns the number of rows cached."""
+        cache = self._cache(table)
+        key_column = REFERENCE_TABLES[table]
+        rows = self.client.table(table).select('*').limit(self.maxsize).execute().data or []
+        for row in rows:
+            cache.put(row[key_column], row)
+        return len(rows)
+
+    def invalidate(self, table=None, key=None):
+        """Drop one entry, one table, or everything."""
+        for name in [table] if table else list(self._caches):
+            if key is None:
+                self._cache(name).clear()
+            else:
+                self._cache(name).pop(key)
+
+    def change_handler(self):
+        """ChangeConsumer handler; register it for REFERENCE_TABLES."""
+
+        def handle(changes):
+            for change in changes:
+                if change.table not in self._caches:
+                    continue
+                cache = self._caches[change.table]
+                if change.op == 'DELETE':
+                    cache.put(change.row_id, _MISSING, self.negative_ttl)
+                elif change.record:
+                    cache.put(change.row_id, change.record)
+                else:
+                    cache.pop(change.row_id)
+
+        return handle
+
+    def resolve(self, rows, table='universities', column='university_id', alias=None, columns=('name',)):
+        """Attach row[alias] = {columns...} (or None) like a PostgREST embed, from cache.
+
+        alias defaults to the table name (`universities(name)`); pass columns=None
+        for the whole row (`university:universities(*)`).
+        """
+        alias = alias or table
+        referenced = self.get_many(table, [row.get(column) for row in rows])
+        for row in rows:
+            match = referenced.get(row.get(column))
+            if match is None:
+                row[alias] = None
+            else:
+                row[alias] = dict(match) if columns is None else {c: match.get(c) for c in columns}
+        return rows
+
+    def stats(self):
+        return {table: cache.stats() for table, cache in self._caches.items()}
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def shared_cache(client, **options):
+    """The process-wide ReferenceCache for `client` (created on first use with `options`)."""
+    with _shared_lock:
+        cache = _shared.get(id(client))
+        if cache is None or cache.client is not client:
+            cache = _shared[id(client)] = ReferenceCache(client, **options)
+        return cache
@@ -0,0 +1,258 @@
+"""
+Trigram-indexed fuzzy people search.
+
+check_harsh_user.py and friends search with ilike('full_name', '%harsh%'),
+which cannot use a B-tree index and scans every profile. This service keeps an
+inverted index from character trigrams (pg_trgm-style padding) to documents
+built from profiles ⋈ alumni_profiles - full_name, email, current_company and
+skills - and ranks matches by trigram similarity, so "hrash" still finds
+"Harsh" and lookups stay in the milliseconds at a million profiles.
+
+Postings are numpy int32 arrays; updates go to small append-only delta arrays
+and deletions to a tombstone mask until compact() folds them in.
+
+    python -m legacylink.search "harsh jeswani" --limit 10
+"""
+
+import argparse
+import math
+import re
+import unicodedata
+from array import array
+
+import numpy as np
+
+from legacylink.client import get_client
+from legacylink.streaming import rows_in
+
+TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode()
+    return text.lower()
+
+
+def trigrams(text):
+    """pg_trgm-style trigrams: each word padded with two leading and one trailing space."""
+    grams = set()
+    for word in TOKEN.findall(normalize(text)):
+        padded = f'  {word} '
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+def document_text(profile, alumni=None):
+    alumni = alumni or {}
+    skills = alumni.get('skills') or []
+    parts = [
+        profile.get('full_name') or '',
+        (profile.get('email') or '').split('@')[0],
+        alumni.get('current_company') or '',
+        ' '.join(skills) if isinstance(skills, list) else str(skills),
+    ]
+    return ' '.join(p for p in parts if p)
+
+
+class PeopleSearchIndex:
+    """In-memory trigram inverted index over people documents."""
+
+    def __init__(self):
+        self._gram_ids = {}
+        self._base = []
+        self._delta = []
+        self._doc_user = []
+        self._slot = {}
+        self._gram_counts = array('H')
+        self._alive = array('b')
+        self._university = array('i')
+        self._university_ids = {}
+        self._names = []
+
+    def __len__(self):
+        return len(self._slot)
+
+    # -- updates ----------------------------------------------------------
+
+    def add(self, user_id, text, full_name='', university_id=None):
+        """Index (or re-index) one person."""
+        if user_id in self._slot:
+            self.remove(user_id)
+        doc = len(self._doc_user)
+        self._doc_user.append(user_id)
+        self._slot[user_id] = doc
+        self._names.append(normalize(full_name))
+        self._alive.append(1)
+        self._university.append(self._university_code(university_id))
+
+        grams = trigrams(text)
+        self._gram_counts.append(min(len(grams), 65535))
+        for gram in grams:
+            gid = self._gram_ids.get(gram)
+            if gid is None:
+                gid = self._gram_ids[gram] = len(self._base)
+                self._base.append(np.empty(0, dtype=np.int32))
+                self._delta.append(array('i'))
+            self._delta[gid].append(doc)
+
+    def add_profile(self, profile, alumni=None):
+        self.add(
+            profile['id'],
+            document_text(profile, alumni),
+            profile.get('full_name') or '',
+            profile.get('university_id'),
+        )
+
+    def remove(self, user_id):
+        doc = self._slot.pop(user_id, None)
+        if doc is not None:
+            self._alive[doc] = 0
+
+    def apply_changes(self, profiles, alumni_by_user=None):
+        """Apply a batch of changed profiles (rows with `deleted: True` are removed)."""
+        alumni_by_user = alumni_by_user or {}
+        for profile in profiles:
+            if profile.get('deleted'):
+                self.remove(profile['id'])
+            else:
+                self.add_profile(profile, alumni_by_user.get(profile['id']))
+
+    def compact(self):
+        """Fold delta postings into the base arrays and drop tombstoned documents.
+
+        Live documents are renumbered densely (in their original order, so
+        postings stay sorted) and the per-document arrays are rebuilt, so
+        memory tracks the live profiles rather than every version ever added.
+        Trigrams left without postings are dropped as well.
+        """
+        alive = np.frombuffer(self._alive, dtype=np.int8).astype(bool)
+        live = np.flatnonzero(alive)
+        renumber = np.full(len(alive), -1, dtype=np.int32)
+        renumber[live] = np.arange(len(live), dtype=np.int32)
+
+        gram_ids, base = {}, []
+        for gram, gid in self._gram_ids.items():
+            merged = self._base[gid]
+            if len(self._delta[gid]):
+                merged = np.concatenate([merged, np.frombuffer(self._delta[gid], dtype=np.int32)])
+            merged = renumber[merged[alive[merged]]] if len(merged) else merged
+            if len(merged):
+                gram_ids[gram] = len(base)
+                base.append(merged)
+        self._gram_ids, self._base = gram_ids, base
+        self._delta = [array('i') for _ in base]
+
+        self._doc_user = [self._doc_user[doc] for doc in live]
+        self._names = [self._names[doc] for doc in live]
+        self._slot = {user_id: doc for doc, user_id in enumerate(self._doc_user)}
+        self._gram_counts = array('H', np.frombuffer(self._gram_counts, dtype=np.uint16)[live].tobytes())
+        self._university = array('i', np.frombuffer(self._university, dtype=np.int32)[live].tobytes())
+        self._alive = array('b', [1]) * len(live)
+
+    def postings_bytes(self):
+        return sum(b.nbytes for b in self._base) + sum(len(d) * d.itemsize for d in self._delta)
+
+    def _university_code(self, university_id):
+        if university_id is None:
+            return -1
+        code = self._university_ids.get(university_id)
+        if code is None:
+            code = self._university_ids[university_id] = len(self._university_ids)
+        return code
+
+    # -- queries ----------------------------------------------------------
+
+    def search(self, query, limit=20, min_similarity=0.2, university_id=None):
+        """Ranked matches as [(user_id, similarity)], best first."""
+        grams = [self._gram_ids[g] for g in trigrams(query) if g in self._gram_ids]
+        total = len(trigrams(query))
+        if not grams or not total:
+            return []
+
+        postings = []
+        for gid in grams:
+            postings.append(self._base[gid])
+            if len(self._delta[gid]):
+                postings.append(np.frombuffer(self._delta[gid], dtype=np.int32))
+        counts = np.bincount(np.concatenate(postings), minlength=len(self._doc_user))
+        # similarity <= shared / total, so anything sharing fewer grams can never qualify.
+        candidates = np.flatnonzero(counts >= max(1, math.ceil(min_similarity * total)))
+        shared = counts[candidates]
+
+        alive = np.frombuffer(self._alive, dtype=np.int8)[candidates].astype(bool)
+        if university_id is not None:
+            code = self._university_ids.get(university_id, -2)
+            alive &= np.frombuffer(self._university, dtype=np.int32)[candidates] == code
+        candidates, shared = candidates[alive], shared[alive]
+        if not len(candidates):
+            return []
+
+        doc_grams = np.frombuffer(self._gram_counts, dtype=np.uint16)[candidates].astype(np.float64)
+        # Word similarity: how much of the query is covered, lightly penalising long documents.
+        similarity = shared / (total + 0.1 * (doc_grams - shared))
+        keep = similarity >= min_similarity
+        candidates, similarity = candidates[keep], similarity[keep]
+        if not len(candidates):
+            return []
+
+        top = min(limit * 3, len(candidates))
+        order = np.argpartition(-similarity, top - 1)[:top]
+        needle = normalize(query).strip()
+        ranked = []
+        for i in order:
+            doc = int(candidates[i])
+            score = float(similarity[i])
+            if needle and needle in self._names[doc]:
+                score += 0.5  # substring hits on the name beat fuzzy hits elsewhere
+            ranked.append((self._doc_user[doc], round(min(score, 1.5), 4)))
+        ranked.sort(key=lambda pair: -pair[1])
+        return ranked[:limit]
+
+    # -- loading ----------------------------------------------------------
+
+    @classmethod
+    def build(cls, client, page_size=1000, lookup_chunk=200):
+        """Load every profile (and alumni profile) from the client, page by page."""
+        index = cls()
+        start = 0
+        while True:
+            profiles = client.table('profiles').select('id, full_name, email, university_id').order(
+                'id'
+            ).range(start, start + page_size - 1).execute().data or []
+            if profiles:
+                alumni = rows_in(client, 'alumni_profiles', 'user_id, current_company, skills', 'user_id',
+                                 [p['id'] for p in profiles], lookup_chunk)
+                by_user = {a['user_id']: a for a in alumni}
+                for profile in profiles:
+                    index.add_profile(profile, by_user.get(profile['id']))
+            if len(profiles) < page_size:
+                break
+            start += page_size
+        index.compact()
+        return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fuzzy people search over profiles')
+    parser.add_argument('query')
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--university', help='restrict to one university_id')
+    args = parser.parse_args()
+
+    client = get_client(service_role=True)
+    index = PeopleSearchIndex.build(client)
+    results = index.search(args.query, limit=args.limit, university_id=args.university)
+    if not results:
+        print(f'❌ No matches for "{args.query}"')
+        return
+    ids = [user_id for user_id, _ in results]
+    rows = {r['id']: r for r in client.table('profiles').select('id, full_name, email, role').in_('id', ids).execute().data}
+    print(f'🔍 {len(results)} matches for "{args.query}" (of {len(index)} profiles):')
+    for user_id, score in results:
+        row = rows.get(user_id, {})
+        print(f'  • {row.get("full_name")} ({row.get("email")}) - {row.get("role")}  [{score}]')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+"""
+Request coalescing ("single flight") for the shared client.
+
+When a dashboard and a batch job in the same process ask for the same thing
+at the same moment (the pending-verification list, a per-university count,
+a reference table right after its cache entry expired) only the first call
+goes upstream; identical calls that arrive while it is in flight wait for it
+and get a copy of its response.
+
+Calls are identical when the table (or RPC name), the builder calls and their
+arguments match, with whitespace in select lists normalized. Only reads are
+coalesced: select() chains, and rpc() for functions listed as read-only.
+Writes always go through and fence the table they touch: when a write
+finishes, reads of that table still in flight stop accepting new joiners,
+so a read issued after a write through this client never shares a response
+fetched before it (a write RPC fences every table).
+
+get_client() applies this layer on top of the timing proxy, so telemetry
+sees upstream requests only; set LEGACYLINK_COALESCE=0 to turn it off.
+
+    client = get_client()
+    ...
+    client.coalescing_stats()   # {'requests': 120, 'upstream': 9, 'shared': 111, 'dedup_ratio': 0.925}
+"""
+
+import copy
+import json
+import os
+import re
+import threading
+
+from legacylink.telemetry import REGISTRY
+
+COALESCE_ENV = 'LEGACYLINK_COALESCE'
+# Functions that only read, so concurrent identical calls can share one result
+READ_ONLY_RPCS = frozenset({'migration_catalog', 'get_auth_users_by_email', 'get_user_comprehensive_info'})
+WRITE_METHODS = frozenset({'insert', 'upsert', 'update', 'delete'})
+
+COALESCED = REGISTRY.counter('legacylink_coalesced_requests_total', 'Reads by whether they went upstream or shared')
+
+
+RPC_SCOPE = '*rpc'
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error', 'waiters', 'scope')
+
+    def __init__(self, scope=None):
+        self.scope = scope
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs fn once per key at a time; concurrent callers with the same key share the outcome."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.upstream = 0
+
+    def do(self, key, fn, scope=None):
+        """Returns (result, shared). Errors are raised to every waiter."""
+        with self._lock:
+            self.requests += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call(scope)
+                self.upstream += 1
+            else:
+                call.waiters += 1
+        if not leader:
+            call.event.wait()
+            COALESCED.inc(result='shared')
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        COALESCED.inc(result='upstream')
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.event.set()
+        return call.result, False
+
+    def fence(self, scopes=None):
+        """Detach in-flight calls in `scopes` (all if None): their waiters keep them, new callers start fresh."""
+        with self._lock:
+            for key in [k for k, c in self._calls.items() if scopes is None or c.scope in scopes]:
+                del self._calls[key]
+
+    def stats(self):
+        with self._lock:
+            shared = self.requests - self.upstream
+            return {
+                'requests': self.requests,
+                'upstream': self.upstream,
+                'shared': shared,
+                'dedup_ratio': round(shared / self.requests, 3) if self.requests else 0.0,
+                'in_flight': len(self._calls),
+            }
+
+
+def request_step(name, args=(), kwargs=None):
+    """One builder call as a key component; select lists have their whitespace removed."""
+    if name == 'select' and args and isinstance(args[0], str):
+        args = (re.sub(r'\s+', '', args[0]),) + tuple(args[1:])
+    return (name, list(args), sorted((kwargs or {}).items()))
+
+
+def request_key(chain):
+    return json.dumps(chain, default=str, separators=(',', ':'), sort_keys=True)
+
+
+def _copy_response(response):
+    """A copy whose rows, embeds included, can be mutated without affecting the other waiters."""
+    duplicate = copy.copy(response)
+    data = getattr(response, 'data', None)
+    if isinstance(data, (list, dict)):
+        duplicate.data = copy.deepcopy(data)
+    return duplicate
+
+
+class _CoalescingBuilder:
+    """Records the builder calls that make up the query key; execute() goes through the flight group."""
+
+    __slots__ = ('_builder', '_flight', '_chain', '_coalesce', '_scope')
+
+    def __init__(self, builder, flight, chain, coalesce, scope):
+        self._builder = builder
+        self._flight = flight
+        self._chain = chain
+        self._coalesce = coalesce
+        # what this call reads when coalesced, or the tables it fences when not
+        self._scope = scope
+
+    def _wrap(self, result, step):
+        coalesce = self._coalesce and step[0] not in WRITE_METHODS
+        if result is self._builder:
+            # postgrest builders mutate and return themselves; keep one chain per builder
+            self._chain.append(step)
+            self._coalesce = coalesce
+            return self
+        return _CoalescingBuilder(result, self._flight, self._chain + [step], coalesce, self._scope)
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if hasattr(attr, 'execute'):
+            # properties such as .not_ return a builder
+            return self._wrap(attr, (name,))
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if not hasattr(result, 'execute'):
+                return result
+            return self._wrap(result, request_step(name, args, kwargs))
+
+        return call
+
+    def execute(self):
+        if not self._coalesce:
+            try:
+                return self._builder.execute()
+            finally:
+                # a table write fences that table and the RPCs that may read it; a write RPC fences everything
+                self._flight.fence(None if self._scope == RPC_SCOPE else {self._scope, RPC_SCOPE})
+        response, shared = self._flight.do(request_key(self._chain), self._builder.execute, self._scope)
+        return _copy_response(response) if shared else response
+
+
+class CoalescingClient:
+    """Proxy that coalesces identical concurrent reads made through table() and read-only rpc()."""
+
+    def __init__(self, client, read_only_rpcs=READ_ONLY_RPCS):
+        object.__setattr__(self, '_client', client)
+        object.__setattr__(self, '_flight', SingleFlight())
+        object.__setattr__(self, 'read_only_rpcs', frozenset(read_only_rpcs))
+
+    def table(self, name):
+        return _CoalescingBuilder(self._client.table(name), self._flight, [('table', name)], True, name)
+
+    from_ = table
+
+    def rpc(self, name, params=None, *args, **kwargs):
+        builder = self._client.rpc(name, params, *args, **kwargs)
+        chain = [('rpc', name, params, args, sorted(kwargs.items()))]
+        return _CoalescingBuilder(builder, self._flight, chain, name in self.read_only_rpcs, RPC_SCOPE)
+
+    def coalescing_stats(self):
+        return self._flight.stats()
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._client, name, value)
+
+
+def coalesce(client):
+    """Wrap a client unless LEGACYLINK_COALESCE=0."""
+    if os.getenv(COALESCE_ENV, '1') == '0' or isinstance(client, CoalescingClient):
+        return client
+    return CoalescingClient(client)
@@ -0,0 +1,284 @@
+"""
+Columnar snapshots of the core tables for offline analytics.
+
+detailed_analysis.py, verify_admin_dashboard.py and the dashboards all read
+the OLTP tables directly. This exporter pages universities, profiles,
+alumni_profiles, events, event_registrations, mentorships, donations and
+badges into Arrow IPC (default) or Parquet part files, one directory per
+table, with enum-like columns (role, status, payment_status, badge_type,
+university_id) dictionary-encoded and timestamps stored as UTC microseconds.
+
+Exports are incremental: each table keeps a watermark on its change column
+(updated_at, or the insert timestamp for append-only tables) in
+manifest.json, and each run appends one new part with the rows changed since.
+read_snapshot() memory-maps the parts and keeps the newest version of every
+row. Incremental runs rely on scripts/017 bumping updated_at on every update;
+on a project without it, and for hard deletes, use `--full` to rewrite.
+
+    python -m legacylink.snapshots --out snapshots
+    python -m legacylink.snapshots --out snapshots --tables donations,profiles --format parquet
+"""
+
+import argparse
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from legacylink.client import get_client
+from legacylink.streaming import stream_rows
+
+MANIFEST = 'manifest.json'
+FORMATS = {'arrow': 'arrow', 'parquet': 'parquet'}
+
+TYPES = {
+    'str': pa.string(),
+    'enum': pa.dictionary(pa.int32(), pa.string()),
+    'bool': pa.bool_(),
+    'int': pa.int32(),
+    'float': pa.float64(),
+    'ts': pa.timestamp('us', tz='UTC'),
+    'list': pa.list_(pa.string()),
+}
+
+# table -> (primary key, change column, [(column, type)])
+TABLES = {
+    'universities': ('id', 'updated_at', [
+        ('id', 'str'), ('name', 'str'), ('domain', 'str'), ('approved', 'bool'),
+        ('created_at', 'ts'), ('updated_at', 'ts'),
+    ]),
+    'profiles': ('id', 'updated_at', [
+        ('id', 'str'), ('email', 'str'), ('full_name', 'str'), ('role', 'enum'),
+        ('university_id', 'enum'), ('linkedin_url', 'str'), ('verified', 'bool'),
+        ('created_at', 'ts'), ('updated_at', 'ts'),
+    ]),
+    'alumni_profiles': ('user_id', 'updated_at', [
+        ('user_id', 'str'), ('skills', 'list'), ('current_job', 'str'), ('current_company', 'str'),
+        ('graduation_year', 'int'), ('degree', 'enum'), ('available_for_mentoring', 'bool'),
+        ('created_at', 'ts'), ('updated_at', 'ts'),
+    ]),
+    'events': ('id', 'updated_at', [
+        ('id', 'str'), ('university_id', 'enum'), ('title', 'str'), ('event_date', 'ts'),
+        ('location', 'str'), ('max_attendees', 'int'), ('created_by', 'str'),
+        ('created_at', 'ts'), ('updated_at', 'ts'),
+    ]),
+    'event_registrations': ('id', 'registered_at', [
+        ('id', 'str'), ('event_id', 'str'), ('user_id', 'str'), ('registered_at', 'ts'),
+    ]),
+    'mentorships': ('id', 'updated_at', [
+        ('id', 'str'), ('mentor_id', 'str'), ('mentee_id', 'str'), ('status', 'enum'),
+        ('created_at', 'ts'), ('updated_at', 'ts'),
+    ]),
+    'donations': ('id', 'updated_at', [
+        ('id', 'str'), ('donor_id', 'str'), ('university_id', 'enum'), ('amount', 'float'),
+        ('payment_status', 'enum'), ('payment_id', 'str'), ('created_at', 'ts'), ('updated_at', 'ts'),
+    ]),
+    'badges': ('id', 'earned_at', [
+        ('id', 'str'), ('user_id', 'str'), ('title', 'str'), ('points', 'int'),
+        ('badge_type', 'enum'), ('earned_at', 'ts'),
+    ]),
+}
+
+
+def arrow_schema(table):
+    _, _, columns = TABLES[table]
+    return pa.schema([(name, TYPES[kind]) for name, kind in columns])
+
+
+def to_batch(table, rows):
+    """Convert a page of PostgREST rows to a RecordBatch with the table's schema."""
+    schema = arrow_schema(table)
+    arrays = []
+    for field in schema:
+        values = [row.get(field.name) for row in rows]
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+        elif pa.types.is_timestamp(field.type):
+            arrays.append(pa.array(values, type=pa.string()).cast(field.type))
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _PartWriter:
+    """Streams record batches into one Arrow IPC or Parquet file."""
+
+    def __init__(self, path, schema, fmt):
+        self.path = path
+        self.rows = 0
+        if fmt == 'parquet':
+            self._writer = pq.ParquetWriter(path, schema, compression='zstd')
+        else:
+            self._sink = pa.OSFile(path, 'wb')
+            self._writer = ipc.new_file(self._sink, schema)
+
+    def write(self, batch):
+        self._writer.write_batch(batch)
+        self.rows += batch.num_rows
+
+    def close(self):
+        self._writer.close()
+        if hasattr(self, '_sink'):
+            self._sink.close()
+
+
+class SnapshotExporter:
+    """Incremental, paged export of the core tables into columnar part files."""
+
+    def __init__(self, client, out_dir, fmt='arrow', page_size=5000):
+        if fmt not in FORMATS:
+            raise ValueError(f'Unknown format: {fmt}')
+        self.client = client
+        self.out_dir = out_dir
+        self.page_size = page_size
+        self.manifest = self._load_manifest(fmt)
+        self.fmt = self.manifest['format']
+
+    def _load_manifest(self, fmt):
+        path = os.path.join(self.out_dir, MANIFEST)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest['format'] != fmt:
+                raise ValueError(f'{self.out_dir} holds {manifest["format"]} snapshots, not {fmt}')
+            return manifest
+        return {'format': fmt, 'tables': {}}
+
+    def _save_manifest(self):
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = os.path.join(self.out_dir, MANIFEST)
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, path)
+
+    def _pages(self, table, watermark, watermark_ids):
+        """Rows changed since the watermark, ordered by (change column, primary key), in batches.
+
+        Pages are read by keyset on (change column, primary key), so a large
+        export never scans past skipped OFFSET rows.
+        """
+        key, cursor, columns = TABLES[table]
+        select = ', '.join(name for name, _ in columns)
+        filters = [(cursor, 'gte', watermark)] if watermark else []
+        page = []
+        rows = stream_rows(self.client, table, select, filters, [cursor, key], page_size=self.page_size, keyset=True)
+        for row in rows:
+            if row.get(cursor) == watermark and row[key] in watermark_ids:
+                continue
+            page.append(row)
+            if len(page) == self.page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def export_table(self, table, full=False):
+        """Append one part with the table's changed rows. Returns the number of rows written."""
+        key, cursor, _ = TABLES[table]
+        table_dir = os.path.join(self.out_dir, table)
+        state = self.manifest['tables'].get(table)
+        if full or state is None:
+            shutil.rmtree(table_dir, ignore_errors=True)
+            state = {'watermark': None, 'watermark_ids': [], 'parts': [], 'rows': 0}
+        os.makedirs(table_dir, exist_ok=True)
+
+        watermark, watermark_ids = state['watermark'], set(state['watermark_ids'])
+        part = f'part-{len(state["parts"]):05d}.{FORMATS[self.fmt]}'
+        path = os.path.join(table_dir, part)
+        writer = None
+        try:
+            for rows in self._pages(table, state['watermark'], set(state['watermark_ids'])):
+                if writer is None:
+                    writer = _PartWriter(path, arrow_schema(table), self.fmt)
+                writer.write(to_batch(table, rows))
+                latest = rows[-1].get(cursor)
+                if latest is not None:
+                    at_latest = {r[key] for r in rows if r.get(cursor) == latest}
+                    watermark_ids = (watermark_ids | at_latest) if latest == watermark else at_latest
+                    watermark = latest
+        except Exception:
+            if writer is not None:
+                writer.close()
+                os.remove(path)
+            raise
+
+        written = 0
+        if writer is not None:
+            writer.close()
+            written = writer.rows
+            state['parts'].append({
+                'file': part,
+                'rows': written,
+                'exported_at': datetime.now(timezone.utc).isoformat(),
+            })
+        state.update(watermark=watermark, watermark_ids=sorted(watermark_ids), rows=state['rows'] + written)
+        self.manifest['tables'][table] = state
+        self._save_manifest()
+        return written
+
+    def export(self, tables=None, full=False):
+        return {table: self.export_table(table, full=full) for table in (tables or TABLES)}
+
+
+def read_snapshot(out_dir, table, columns=None, latest=True):
+    """Memory-map a table's parts into one pa.Table.
+
+    With latest=True only the newest version of each row (by primary key) is kept.
+    """
+    with open(os.path.join(out_dir, MANIFEST), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    state = manifest['tables'].get(table)
+    schema = arrow_schema(table)
+    if columns is not None:
+        schema = pa.schema([schema.field(name) for name in columns])
+    if not state or not state['parts']:
+        return schema.empty_table()
+
+    key = TABLES[table][0]
+    wanted = None if columns is None else list(dict.fromkeys([*columns, key]))
+    parts = []
+    for part in state['parts']:
+        path = os.path.join(out_dir, table, part['file'])
+        if manifest['format'] == 'parquet':
+            parts.append(pq.read_table(path, columns=wanted, memory_map=True))
+        else:
+            data = ipc.open_file(pa.memory_map(path, 'r')).read_all()
+            parts.append(data.select(wanted) if wanted else data)
+    data = pa.concat_tables(parts)
+
+    if latest and len(parts) > 1:
+        data = data.append_column('__row', pa.array(range(data.num_rows), type=pa.int64()))
+        newest = data.group_by(key, use_threads=False).aggregate([('__row', 'max')])['__row_max']
+        data = data.take(newest.sort()).drop_columns(['__row'])
+    return data.select(columns) if columns is not None else data
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export core tables to columnar snapshots')
+    parser.add_argument('--out', default='snapshots', help='snapshot directory')
+    parser.add_argument('--tables', help=f'comma-separated subset of: {", ".join(TABLES)}')
+    parser.add_argument('--format', choices=sorted(FORMATS), default='arrow')
+    parser.add_argument('--full', action='store_true', help='discard existing parts and re-export')
+    parser.add_argument('--page-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    tables = [t.strip() for t in args.tables.split(',')] if args.tables else list(TABLES)
+    unknown = [t for t in tables if t not in TABLES]
+    if unknown:
+        parser.error(f'unknown tables: {", ".join(unknown)}')
+
+    exporter = SnapshotExporter(get_client(service_role=True), args.out, args.format, args.page_size)
+    print(f'📦 Exporting {len(tables)} tables to {args.out} ({exporter.fmt})')
+    for table in tables:
+        written = exporter.export_table(table, full=args.full)
+        state = exporter.manifest['tables'][table]
+        print(f'  ✅ {table}: +{written} rows ({len(state["parts"])} parts, watermark {state["watermark"]})')
+
+
+if __name__ == '__main__':
+    main()
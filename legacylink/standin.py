@@ -0,0 +1,863 @@
+"""
+Local stand-in for the Supabase project.
+
+A SQLite database carrying the tables from scripts/001 and the later numbered
+migrations, exposed through the same table()/rpc() query-builder surface as
+supabase-py so toolkit code, load tests and benchmarks run offline without
+touching the live project.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+UUID_SQL = (
+    "(lower(hex(randomblob(4))) || '-' || lower(hex(randomblob(2))) || '-4' || "
+    "substr(lower(hex(randomblob(2))), 2) || '-' || "
+    "substr('89ab', abs(random()) % 4 + 1, 1) || substr(lower(hex(randomblob(2))), 2) || '-' || "
+    "lower(hex(randomblob(6))))"
+)
+NOW_SQL = "(strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))"
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS universities (
+    id TEXT PRIMARY KEY DEFAULT {UUID_SQL},
+    name TEXT NOT NULL,
+    domain TEXT UNIQUE NOT NULL,
+    logo_url TEXT,
+    approved BOOLEAN DEFAULT 0,
+    created_at TEXT DEFAULT {NOW_SQL},
+    updated_at TEXT DEFAULT {NOW_SQL}
+);
+
+CREATE TABLE IF NOT EXISTS profiles (
+    id TEXT PRIMARY KEY DEFAULT {UUID_SQL},
+    email TEXT NOT NULL,
+    full_name TEXT NOT NULL,
+    role TEXT NOT NULL CHECK (role IN ('super_admin', 'university_admin', 'alumni', 'student')),
+    university_id TEXT REFERENCES universities(id),
+    linkedin_url TEXT,
+    verified BOOLEAN DEFAULT 0,
+    created_at TEXT DEFAULT {NOW_SQL},
+    updated_at TEXT DEFAULT {NOW_SQL}
+);
+
+CREATE TABLE IF NOT EXISTS alumni_profiles (
+    user_id TEXT PRIMARY KEY REFERENCES profiles(id) ON DELETE CASCADE,
+    skills JSON,
+    current_job TEXT,
+    current_company TEXT,
+    achievements TEXT,
+    photo_url TEXT,
+    graduation_year INTEGER,
+    degree TEXT,
+    bio TEXT,
+    available_for_mentoring BOOLEAN DEFAULT 0,
+    created_at TEXT DEFAULT {NOW_SQL},
+    updated_at TEXT DEFAULT {NOW_SQL}
+);
+
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY DEFAULT {UUID_SQL},
+    university_id TEXT REFERENCES universities(id) ON DELETE CASCADE,
+    title TEXT NOT NULL,
+    description TEXT,
+    event_date TEXT NOT NULL,
+    location TEXT,
+    max_attendees INTEGER,
+    created_by TEXT REFERENCES profiles(id),
+    created_at TEXT DEFAULT {NOW_SQL},
+    updated_at TEXT DEFAULT {NOW_SQL}
+);
+
+CREATE TABLE IF NOT EXISTS event_registrations (
+    id TEXT PRIMARY KEY DEFAULT {UUID_SQL},
+    event_id TEXT REFERENCES events(id) ON DELETE CASCADE,
+    user_id TEXT REFERENCES profiles(id) ON DELETE CASCADE,
+    registered_at TEXT DEFAULT {NOW_SQL},
+    UNIQUE(event_id, user_id)
+);
+
+CREATE TABLE IF NOT EXISTS mentorships (
+    id TEXT PRIMARY KEY DEFAULT {UUID_SQL},
+    mentor_id TEXT REFERENCES profiles(id) ON DELETE CASCADE,
+    mentee_id TEXT REFERENCES profiles(id) ON DELETE CASCADE,
+    status TEXT NOT NULL CHECK (status IN ('pending', 'active', 'completed', 'cancelled')) DEFAULT 'pending',
+    message TEXT,
+    created_at TEXT DEFAULT {NOW_SQL},
+    updated_at TEXT DEFAULT {NOW_SQL},
+    UNIQUE(mentor_id, mentee_id)
+);
+
+CREATE TABLE IF NOT EXISTS donations (
+    id TEXT PRIMARY KEY DEFAULT {UUID_SQL},
+    donor_id TEXT REFERENCES profiles(id) ON DELETE CASCADE,
+    university_id TEXT REFERENCES universities(id) ON DELETE CASCADE,
+    amount REAL NOT NULL,
+    payment_status TEXT NOT NULL CHECK (payment_status IN ('pending', 'completed', 'failed', 'refunded')) DEFAULT 'pending',
+    payment_id TEXT UNIQUE,
+    receipt_url TEXT,
+    created_at TEXT DEFAULT {NOW_SQL},
+    updated_at TEXT DEFAULT {NOW_SQL}
+);
+
+CREATE TABLE IF NOT EXISTS badges (
+    id TEXT PRIMARY KEY DEFAULT {UUID_SQL},
+    user_id TEXT REFERENCES profiles(id) ON DELETE CASCADE,
+    title TEXT NOT NULL,
+    description TEXT,
+    points INTEGER DEFAULT 0,
+    badge_type TEXT NOT NULL CHECK (badge_type IN ('mentorship', 'donation', 'event', 'profile', 'community')),
+    earned_at TEXT DEFAULT {NOW_SQL}
+);
+
+CREATE TABLE IF NOT EXISTS messages (
+    id TEXT PRIMARY KEY DEFAULT {UUID_SQL},
+    sender_id TEXT REFERENCES profiles(id) ON DELETE CASCADE,
+    recipient_id TEXT REFERENCES profiles(id) ON DELETE CASCADE,
+    content TEXT NOT NULL,
+    created_at TEXT DEFAULT {NOW_SQL}
+);
+
+CREATE TABLE IF NOT EXISTS event_checkins (
+    id TEXT PRIMARY KEY DEFAULT {UUID_SQL},
+    event_id TEXT REFERENCES events(id) ON DELETE CASCADE,
+    user_id TEXT REFERENCES profiles(id) ON DELETE CASCADE,
+    checked_in_at TEXT DEFAULT {NOW_SQL},
+    UNIQUE(event_id, user_id)
+);
+
+CREATE TABLE IF NOT EXISTS event_waitlist (
+    id TEXT PRIMARY KEY DEFAULT {UUID_SQL},
+    event_id TEXT REFERENCES events(id) ON DELETE CASCADE,
+    user_id TEXT REFERENCES profiles(id) ON DELETE CASCADE,
+    created_at TEXT DEFAULT {NOW_SQL},
+    UNIQUE(event_id, user_id)
+);
+
+CREATE TABLE IF NOT EXISTS donation_rollups (
+    university_id TEXT REFERENCES universities(id) ON DELETE CASCADE,
+    month TEXT NOT NULL,
+    graduation_year INTEGER NOT NULL DEFAULT 0,
+    total_amount REAL NOT NULL DEFAULT 0,
+    donation_count INTEGER NOT NULL DEFAULT 0,
+    avg_amount REAL NOT NULL DEFAULT 0,
+    updated_at TEXT DEFAULT {NOW_SQL},
+    PRIMARY KEY (university_id, month, graduation_year)
+);
+
+-- auth.users: only the columns scripts/010 and 011 read
+CREATE TABLE IF NOT EXISTS auth_users (
+    id TEXT PRIMARY KEY DEFAULT {UUID_SQL},
+    email TEXT UNIQUE NOT NULL,
+    encrypted_password TEXT,
+    raw_user_meta_data JSON,
+    email_confirmed_at TEXT,
+    created_at TEXT DEFAULT {NOW_SQL},
+    updated_at TEXT DEFAULT {NOW_SQL}
+);
+
+CREATE TABLE IF NOT EXISTS change_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,
+    op TEXT NOT NULL CHECK (op IN ('INSERT', 'UPDATE', 'DELETE')),
+    row_id TEXT NOT NULL,
+    record JSON,
+    old_record JSON,
+    changed_at TEXT DEFAULT {NOW_SQL}
+);
+"""
+
+# Tables captured into change_outbox (scripts/014, 016), with their key column.
+CAPTURED_TABLES = {
+    'profiles': 'id', 'alumni_profiles': 'user_id', 'events': 'id', 'mentorships': 'id', 'universities': 'id',
+}
+
+# Triggers on auth.users as each migration leaves them: 010 adds both, 011 drops the confirmation one
+AUTH_TRIGGERS = {
+    '010': frozenset({'on_auth_user_created', 'on_auth_user_email_confirmed'}),
+    '011': frozenset({'on_auth_user_created'}),
+    None: frozenset(),
+}
+
+# (table, embedded table) -> (local column, remote column) for one-level embeds
+# such as profiles.select('id, universities(name)').
+FOREIGN_KEYS = {
+    ('profiles', 'universities'): ('university_id', 'id'),
+    ('profiles', 'alumni_profiles'): ('id', 'user_id'),
+    ('alumni_profiles', 'profiles'): ('user_id', 'id'),
+    ('events', 'universities'): ('university_id', 'id'),
+    ('events', 'profiles'): ('created_by', 'id'),
+    ('event_registrations', 'events'): ('event_id', 'id'),
+    ('event_registrations', 'profiles'): ('user_id', 'id'),
+    ('event_checkins', 'events'): ('event_id', 'id'),
+    ('event_checkins', 'profiles'): ('user_id', 'id'),
+    ('event_waitlist', 'events'): ('event_id', 'id'),
+    ('event_waitlist', 'profiles'): ('user_id', 'id'),
+    ('donations', 'universities'): ('university_id', 'id'),
+    ('donations', 'profiles'): ('donor_id', 'id'),
+    ('badges', 'profiles'): ('user_id', 'id'),
+}
+
+# Keep each statement well under SQLite's bound-parameter limit.
+MAX_PARAMS = 30000
+
+
+class StandInError(Exception):
+    """Raised for stand-in query failures, mirroring postgrest's APIError fields."""
+
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+class StandInResponse:
+    """Same shape as postgrest's APIResponse: .data and .count."""
+
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+    def __repr__(self):
+        return f'StandInResponse(data={self.data!r}, count={self.count!r})'
+
+
+def _split_columns(columns):
+    """Split a PostgREST select list (or logic tree) on top-level commas outside double quotes."""
+    parts, depth, current, quoted, escaped = [], 0, [], False, False
+    for char in columns:
+        if escaped:
+            escaped = False
+        elif char == '\\' and quoted:
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+        elif quoted:
+            pass
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        if char == ',' and depth == 0 and not quoted:
+            parts.append(''.join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    if ''.join(current).strip():
+        parts.append(''.join(current).strip())
+    return parts
+
+
+def _sql_value(value):
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+
+_TREE_OPERATORS = {'eq': '=', 'neq': '!=', 'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<='}
+_TREE_LITERALS = {'true': 1, 'false': 0, 'null': None}
+
+
+def _unquote(value):
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return re.sub(r'\\(.)', r'\1', value[1:-1])
+    return _TREE_LITERALS.get(value, value)
+
+
+def _logic_tree(text, joiner):
+    """SQL and parameters for the comma-separated conditions of an or=(...) / and(...) filter."""
+    clauses, params = [], []
+    for part in _split_columns(text):
+        head, _, inner = part.partition('(')
+        if head in ('and', 'or') and inner.endswith(')'):
+            sql, nested = _logic_tree(inner[:-1], head.upper())
+            clauses.append(f'({sql})')
+            params.extend(nested)
+            continue
+        column, op, value = part.split('.', 2)
+        if op == 'is':
+            clauses.append(f'"{column}" IS ?')
+            params.append(_TREE_LITERALS.get(value, value))
+        elif op == 'in':
+            values = _split_columns(value.strip('()'))
+            clauses.append(f'"{column}" IN ({", ".join("?" for _ in values)})' if values else '0')
+            params.extend(_unquote(v) for v in values)
+        else:
+            clauses.append(f'"{column}" {_TREE_OPERATORS[op]} ?')
+            params.append(_unquote(value))
+    return f' {joiner} '.join(clauses), params
+
+
+class StandInQuery:
+    """Query builder with the supabase-py surface the toolkit uses."""
+
+    def __init__(self, client, table):
+        self._client = client
+        self._table = table
+        self._op = 'select'
+        self._columns = '*'
+        self._count = None
+        self._payload = None
+        self._on_conflict = ''
+        self._ignore_duplicates = False
+        self._filters = []
+        self._order = []
+        self._limit = None
+        self._offset = None
+        self._single = None
+        self._head = False
+
+    # -- operations -------------------------------------------------------
+
+    def select(self, columns='*', count=None, head=False):
+        self._op, self._columns, self._count, self._head = 'select', columns, count, head
+        return self
+
+    def insert(self, json_rows, count=None):
+        self._op, self._payload, self._count = 'insert', json_rows, count
+        return self
+
+    def upsert(self, json_rows, count=None, ignore_duplicates=False, on_conflict=''):
+        self._op, self._payload, self._count = 'upsert', json_rows, count
+        self._ignore_duplicates = ignore_duplicates
+        self._on_conflict = on_conflict
+        return self
+
+    def update(self, json_values, count=None):
+        self._op, self._payload, self._count = 'update', json_values, count
+        return self
+
+    def delete(self, count=None):
+        self._op, self._count = 'delete', count
+        return self
+
+    # -- filters ----------------------------------------------------------
+
+    def _filter(self, sql, *params):
+        self._filters.append((sql, [_sql_value(p) for p in params]))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(f'"{column}" = ?', value)
+
+    def neq(self, column, value):
+        return self._filter(f'"{column}" != ?', value)
+
+    def gt(self, column, value):
+        return self._filter(f'"{column}" > ?', value)
+
+    def gte(self, column, value):
+        return self._filter(f'"{column}" >= ?', value)
+
+    def lt(self, column, value):
+        return self._filter(f'"{column}" < ?', value)
+
+    def lte(self, column, value):
+        return self._filter(f'"{column}" <= ?', value)
+
+    def like(self, column, pattern):
+        return self._filter(f'"{column}" GLOB ?', pattern.replace('%', '*').replace('_', '?'))
+
+    def ilike(self, column, pattern):
+        return self._filter(f'lower("{column}") LIKE lower(?)', pattern)
+
+    def is_(self, column, value):
+        if value is None or value == 'null':
+            return self._filter(f'"{column}" IS NULL')
+        return self._filter(f'"{column}" IS ?', value)
+
+    def in_(self, column, values):
+        values = list(values)
+        if not values:
+            return self._filter('0')
+        marks = ', '.join('?' for _ in values)
+        return self._filter(f'"{column}" IN ({marks})', *values)
+
+    def or_(self, filters, reference_table=None):
+        """PostgREST logic tree: 'a.eq.1,and(b.gt.2,c.is.null)' (eq/neq/gt/gte/lt/lte/is/in)."""
+        sql, params = _logic_tree(filters, 'OR')
+        self._filters.append((sql, params))
+        return self
+
+    def order(self, column, desc=False, nullsfirst=False):
+        direction = 'DESC' if desc else 'ASC'
+        nulls = 'NULLS FIRST' if nullsfirst else 'NULLS LAST'
+        self._order.append(f'"{column}" {direction} {nulls}')
+        return self
+
+    def limit(self, size):
+        self._limit = size
+        return self
+
+    def range(self, start, end):
+        self._offset, self._limit = start, end - start + 1
+        return self
+
+    def single(self):
+        self._single = 'single'
+        return self
+
+    def maybe_single(self):
+        self._single = 'maybe'
+        return self
+
+    # -- execution --------------------------------------------------------
+
+    def _where(self):
+        if not self._filters:
+            return '', []
+        sql = ' WHERE ' + ' AND '.join(f'({clause})' for clause, _ in self._filters)
+        params = [p for _, ps in self._filters for p in ps]
+        return sql, params
+
+    def execute(self):
+        self._client._simulate_round_trip()
+        handler = getattr(self, f'_execute_{self._op}')
+        try:
+            with self._client.lock:
+                response = handler()
+        except sqlite3.IntegrityError as e:
+            code = '23505' if 'UNIQUE' in str(e) else '23514'
+            raise StandInError(str(e), code=code) from e
+        except sqlite3.OperationalError as e:
+            raise StandInError(str(e), code='42P01' if 'no such table' in str(e) else None) from e
+
+        if self._single:
+            rows = response.data or []
+            if len(rows) > 1 or (self._single == 'single' and not rows):
+                raise StandInError(
+                    f'JSON object requested, multiple (or no) rows returned ({len(rows)})', code='PGRST116'
+                )
+            response.data = rows[0] if rows else None
+        return response
+
+    def _execute_select(self):
+        where, params = self._where()
+        count = None
+        if self._count:
+            count = self._client.conn.execute(f'SELECT COUNT(*) FROM "{self._table}"{where}', params).fetchone()[0]
+
+        if self._head:
+            return StandInResponse([], count)
+        if self._columns.strip() == 'count':
+            return StandInResponse([{'count': count if count is not None else self._client.conn.execute(
+                f'SELECT COUNT(*) FROM "{self._table}"{where}', params).fetchone()[0]}], count)
+
+        plain, embeds = [], []
+        for part in _split_columns(self._columns):
+            if '(' in part:
+                name, inner = part.split('(', 1)
+                alias, _, target = name.strip().rpartition(':')
+                target = target.split('!')[0]
+                embeds.append((alias or target, target, inner.rstrip(')')))
+            else:
+                plain.append(part.split(':')[-1].strip())
+
+        sql = f'SELECT * FROM "{self._table}"{where}'
+        if self._order:
+            sql += ' ORDER BY ' + ', '.join(self._order)
+        if self._limit is not None:
+            sql += f' LIMIT {int(self._limit)}'
+            if self._offset:
+                sql += f' OFFSET {int(self._offset)}'
+
+        rows = self._client._decode(self._table, self._client.conn.execute(sql, params))
+        for alias, target, inner in embeds:
+            self._attach_embed(rows, alias, target, inner)
+        if plain and '*' not in plain:
+            keep = set(plain) | {alias for alias, _, _ in embeds}
+            rows = [{k: v for k, v in row.items() if k in keep} for row in rows]
+        return StandInResponse(rows, count)
+
+    def _attach_embed(self, rows, alias, target, inner):
+        key = FOREIGN_KEYS.get((self._table, target))
+        if key is None:
+            raise StandInError(f'Could not find a relationship between {self._table} and {target}', code='PGRST200')
+        local, remote = key
+        ids = sorted({row[local] for row in rows if row.get(local) is not None})
+        related = {}
+        if ids:
+            nested = StandInQuery(self._client, target).select(f'{remote},{inner}').in_(remote, ids)
+            for row in nested._execute_select().data:
+                related[row[remote]] = row
+        wanted = [c.strip() for c in _split_columns(inner)]
+        for row in rows:
+            match = related.get(row.get(local))
+            if match is not None and '*' not in wanted and remote not in wanted:
+                match = {k: v for k, v in match.items() if k != remote}
+            row[alias] = match
+
+    def _rows(self):
+        rows = self._payload if isinstance(self._payload, list) else [self._payload]
+        return [{k: _sql_value(v) for k, v in row.items()} for row in rows]
+
+    def _write(self, rows, conflict_clause=''):
+        out = []
+        groups = {}
+        for row in rows:
+            groups.setdefault(tuple(row), []).append(row)
+        for columns, group in groups.items():
+            column_sql = ', '.join(f'"{c}"' for c in columns)
+            per_stmt = max(1, MAX_PARAMS // max(1, len(columns)))
+            for start in range(0, len(group), per_stmt):
+                chunk = group[start:start + per_stmt]
+                values = ', '.join('(' + ', '.join('?' for _ in columns) + ')' for _ in chunk)
+                sql = f'INSERT INTO "{self._table}" ({column_sql}) VALUES {values}{conflict_clause} RETURNING *'
+                params = [row[c] for row in chunk for c in columns]
+                out.extend(self._client._decode(self._table, self._client.conn.execute(sql, params)))
+        return out
+
+    def _execute_insert(self):
+        rows = self._write(self._rows())
+        return StandInResponse(rows, len(rows) if self._count else None)
+
+    def _execute_upsert(self):
+        target = self._on_conflict or ','.join(self._client.primary_key(self._table))
+        target_cols = [c.strip() for c in target.split(',')]
+        rows = self._rows()
+        if self._ignore_duplicates:
+            written = self._write(rows, f' ON CONFLICT ({", ".join(target_cols)}) DO NOTHING')
+        else:
+            written = []
+            groups = {}
+            for row in rows:
+                groups.setdefault(tuple(row), []).append(row)
+            for columns, group in groups.items():
+                updates = [c for c in columns if c not in target_cols]
+                if updates:
+                    action = 'DO UPDATE SET ' + ', '.join(f'"{c}" = excluded."{c}"' for c in updates)
+                else:
+                    action = 'DO NOTHING'
+                written.extend(self._write(group, f' ON CONFLICT ({", ".join(target_cols)}) {action}'))
+        return StandInResponse(written, len(written) if self._count else None)
+
+    def _execute_update(self):
+        values = {k: _sql_value(v) for k, v in self._payload.items()}
+        assignments = ', '.join(f'"{c}" = ?' for c in values)
+        where, params = self._where()
+        sql = f'UPDATE "{self._table}" SET {assignments}{where} RETURNING *'
+        rows = self._client._decode(self._table, self._client.conn.execute(sql, list(values.values()) + params))
+        return StandInResponse(rows, len(rows) if self._count else None)
+
+    def _execute_delete(self):
+        where, params = self._where()
+        sql = f'DELETE FROM "{self._table}"{where} RETURNING *'
+        rows = self._client._decode(self._table, self._client.conn.execute(sql, params))
+        return StandInResponse(rows, len(rows) if self._count else None)
+
+
+class StandInRpc:
+    def __init__(self, client, name, params):
+        self._client = client
+        self._name = name
+        self._params = params or {}
+
+    def execute(self):
+        self._client._simulate_round_trip()
+        func = self._client.rpc_functions.get(self._name)
+        if func is None:
+            raise StandInError(f'Could not find the function public.{self._name}', code='PGRST202')
+        with self._client.lock:
+            return StandInResponse(func(self._client, **self._params))
+
+
+def _b64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+class StandInUser:
+    def __init__(self, id, email=None, user_metadata=None, email_confirmed_at=None):
+        self.id = id
+        self.email = email
+        self.user_metadata = user_metadata or {}
+        self.email_confirmed_at = email_confirmed_at
+
+
+class StandInUserResponse:
+    """AuthResponse shape (.user, .session); timing holds the stand-in's lock/statement/trigger seconds."""
+
+    def __init__(self, user, session=None, timing=None):
+        self.user = user
+        self.session = session
+        self.timing = timing or {}
+
+
+def _auth_user(row):
+    metadata = row['raw_user_meta_data']
+    if isinstance(metadata, str):
+        metadata = json.loads(metadata)
+    return StandInUser(row['id'], row['email'], metadata, row['email_confirmed_at'])
+
+
+class StandInAuthAdmin:
+    """The part of supabase.auth.admin that confirms users."""
+
+    def __init__(self, client):
+        self._client = client
+
+    def update_user_by_id(self, uid, attributes):
+        self._client._simulate_round_trip()
+        confirmed_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()) if attributes.get('email_confirm') else None
+        with self._client.timed_lock() as timing:
+            with self._client.transaction():
+                old = self._client.conn.execute('SELECT * FROM auth_users WHERE id = ?', [uid]).fetchone()
+                if old is None:
+                    raise StandInError('User not found', code='404')
+                new = self._client.conn.execute(
+                    'UPDATE auth_users SET email_confirmed_at = COALESCE(email_confirmed_at, ?), '
+                    f'updated_at = {NOW_SQL} WHERE id = ? RETURNING *', [confirmed_at, uid]
+                ).fetchone()
+                self._client._run_auth_triggers('on_auth_user_email_confirmed', new, old, timing)
+        return StandInUserResponse(_auth_user(new), timing=timing)
+
+
+class StandInAuth:
+    """Enough of supabase.auth for server-side checks: HS256 tokens and get_user()."""
+
+    def __init__(self, client):
+        self._client = client
+        self._secret = os.urandom(32)
+        self.admin = StandInAuthAdmin(client)
+
+    def sign_up(self, credentials):
+        """Create an auth.users row; its triggers run in the same transaction, as on Postgres.
+
+        Like a project with email confirmation on, no session is returned.
+        """
+        self._client._simulate_round_trip()
+        metadata = (credentials.get('options') or {}).get('data') or {}
+        password = hashlib.sha256(credentials.get('password', '').encode()).hexdigest()
+        try:
+            with self._client.timed_lock() as timing:
+                with self._client.transaction():
+                    row = self._client.conn.execute(
+                        'INSERT INTO auth_users (email, encrypted_password, raw_user_meta_data) VALUES (?, ?, ?) '
+                        'RETURNING *', [credentials['email'], password, json.dumps(metadata)]
+                    ).fetchone()
+                    self._client._run_auth_triggers('on_auth_user_created', row, None, timing)
+        except sqlite3.IntegrityError as e:
+            raise StandInError('User already registered', code='422') from e
+        return StandInUserResponse(_auth_user(row), timing=timing)
+
+    def issue_token(self, user_id, email=None, ttl=3600):
+        """Mint an access token for user_id, shaped like a Supabase JWT."""
+        header = _b64url(json.dumps({'alg': 'HS256', 'typ': 'JWT'}).encode())
+        claims = {'sub': user_id, 'email': email, 'role': 'authenticated', 'exp': int(time.time()) + ttl}
+        payload = _b64url(json.dumps(claims).encode())
+        signature = hmac.new(self._secret, f'{header}.{payload}'.encode(), hashlib.sha256).digest()
+        return f'{header}.{payload}.{_b64url(signature)}'
+
+    def get_user(self, jwt=None):
+        self._client._simulate_round_trip()
+        try:
+            header, payload, signature = (jwt or '').split('.')
+            expected = hmac.new(self._secret, f'{header}.{payload}'.encode(), hashlib.sha256).digest()
+            if not hmac.compare_digest(_b64url(expected), signature):
+                raise ValueError('bad signature')
+            claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        except ValueError as e:
+            raise StandInError(f'invalid JWT: {e}', code='401') from e
+        if claims['exp'] < time.time():
+            raise StandInError('invalid JWT: token is expired', code='401')
+        return StandInUserResponse(StandInUser(claims['sub'], claims.get('email')))
+
+
+class StandInClient:
+    """SQLite-backed client exposing table(), rpc(), auth and transaction().
+
+    round_trip adds a per-call sleep (seconds) so batching and caching effects
+    show up in load tests the way they would against the hosted API; `calls`
+    counts those round trips. rate_limit = (requests per second, burst) and
+    max_in_flight reject excess calls with 429 / 503 like the API gateway;
+    `throttled` counts those rejections.
+    """
+
+    def __init__(self, path=':memory:', round_trip=0.0):
+        self.path = path
+        self.round_trip = round_trip
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        if path != ':memory:':
+            self.conn.execute('PRAGMA journal_mode = WAL')
+            self.conn.execute('PRAGMA synchronous = NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.rpc_functions = {}
+        self.calls = 0
+        self._calls_lock = threading.Lock()
+        self.rate_limit = None
+        self.max_in_flight = None
+        self.throttled = 0
+        self._bucket = None
+        self._in_flight = 0
+        self.auth = StandInAuth(self)
+        self.auth_triggers = AUTH_TRIGGERS['011']
+        self.trigger_errors = 0
+        self._column_types = {}
+
+    def table(self, name):
+        return StandInQuery(self, name)
+
+    from_ = table
+
+    def rpc(self, name, params=None):
+        return StandInRpc(self, name, params)
+
+    def register_rpc(self, name, func):
+        """Register func(client, **params) as a stand-in for a Postgres function."""
+        self.rpc_functions[name] = func
+
+    @contextmanager
+    def transaction(self):
+        """Run several table() calls atomically (BEGIN IMMEDIATE ... COMMIT)."""
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield self
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+            self.conn.execute('COMMIT')
+
+    @contextmanager
+    def timed_lock(self):
+        """Hold the write lock, yielding a dict that gets lock_wait_s and held_s."""
+        timing = {}
+        started = time.perf_counter()
+        with self.lock:
+            acquired = time.perf_counter()
+            timing['lock_wait_s'] = acquired - started
+            try:
+                yield timing
+            finally:
+                timing['held_s'] = time.perf_counter() - acquired
+
+    def set_auth_triggers(self, script='011'):
+        """Model auth.users triggers as scripts/010 or 011 leave them (None: no triggers)."""
+        self.auth_triggers = AUTH_TRIGGERS[script]
+
+    def _run_auth_triggers(self, name, new, old, timing):
+        """Run one AFTER trigger on auth_users inside the caller's transaction, timing it into `timing`."""
+        started = time.perf_counter()
+        if name in self.auth_triggers:
+            if name == 'on_auth_user_created':
+                self._handle_new_user(new)
+            elif new['email_confirmed_at'] is not None and old['email_confirmed_at'] is None:
+                self.conn.execute('UPDATE profiles SET verified = 1 WHERE id = ?', [new['id']])
+        timing['trigger_s'] = timing.get('trigger_s', 0.0) + time.perf_counter() - started
+
+    def _handle_new_user(self, new):
+        """public.handle_new_user(): errors are logged and swallowed so the signup itself succeeds."""
+        metadata = json.loads(new['raw_user_meta_data'] or '{}')
+        # 010 derives verified from the confirmation; 011 never auto-verifies
+        verified = 'on_auth_user_email_confirmed' in self.auth_triggers and new['email_confirmed_at'] is not None
+        self.conn.execute('SAVEPOINT handle_new_user')
+        try:
+            self.conn.execute(
+                'INSERT INTO profiles (id, email, full_name, role, university_id, verified) VALUES (?, ?, ?, ?, ?, ?)',
+                [new['id'], new['email'], metadata.get('full_name') or new['email'], metadata.get('role') or 'alumni',
+                 metadata.get('university_id'), int(verified)],
+            )
+        except sqlite3.Error:
+            self.conn.execute('ROLLBACK TO handle_new_user')
+            self.trigger_errors += 1
+        self.conn.execute('RELEASE handle_new_user')
+
+    def enable_change_capture(self, tables=None):
+        """Install the scripts/014 outbox triggers (opt-in, so bulk benchmarks skip the overhead)."""
+        with self.lock:
+            for table in tables or CAPTURED_TABLES:
+                key = CAPTURED_TABLES[table]
+                for op, ref in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+                    record = self._json_record(table, ref)
+                    if op == 'INSERT':
+                        values = f"'{table}', 'INSERT', NEW.\"{key}\", {record}, NULL"
+                    elif op == 'UPDATE':
+                        values = f"'{table}', 'UPDATE', NEW.\"{key}\", {record}, {self._json_record(table, 'OLD')}"
+                    else:
+                        values = f"'{table}', 'DELETE', OLD.\"{key}\", NULL, {record}"
+                    # Like scripts/014, no-op updates are not captured.
+                    when = f" WHEN {record} IS NOT {self._json_record(table, 'OLD')}" if op == 'UPDATE' else ''
+                    self.conn.execute(
+                        f'CREATE TRIGGER IF NOT EXISTS capture_{table}_{op.lower()} AFTER {op} ON "{table}"{when} '
+                        f'BEGIN INSERT INTO change_outbox (table_name, op, row_id, record, old_record) '
+                        f'VALUES ({values}); END'
+                    )
+
+    def _json_record(self, table, ref):
+        """SQL building a JSON object of NEW/OLD with booleans and JSON columns typed as on Postgres."""
+        parts = []
+        for column, kind in self._types(table).items():
+            value = f'{ref}."{column}"'
+            if kind == 'BOOLEAN':
+                value = f"CASE WHEN {value} IS NULL THEN NULL WHEN {value} THEN json('true') ELSE json('false') END"
+            elif kind == 'JSON':
+                value = f'json({value})'
+            parts.append(f"'{column}', {value}")
+        return f'json_object({", ".join(parts)})'
+
+    def primary_key(self, table):
+        info = self.conn.execute(f'PRAGMA table_info("{table}")').fetchall()
+        return [row['name'] for row in sorted(info, key=lambda r: r['pk']) if row['pk']]
+
+    def close(self):
+        self.conn.close()
+
+    def _simulate_round_trip(self):
+        with self._calls_lock:
+            self.calls += 1
+            if self.rate_limit:
+                rate, burst = self.rate_limit
+                now = time.monotonic()
+                tokens, last = self._bucket or (burst, now)
+                tokens = min(burst, tokens + (now - last) * rate)
+                if tokens < 1:
+                    self._bucket = (tokens, now)
+                    self.throttled += 1
+                    raise StandInError('Too Many Requests', code='429')
+                self._bucket = (tokens - 1, now)
+            if self.max_in_flight is not None and self._in_flight >= self.max_in_flight:
+                self.throttled += 1
+                raise StandInError('Service Unavailable', code='503')
+            self._in_flight += 1
+        try:
+            if self.round_trip:
+                time.sleep(self.round_trip)
+        finally:
+            with self._calls_lock:
+                self._in_flight -= 1
+
+    def _types(self, table):
+        types = self._column_types.get(table)
+        if types is None:
+            info = self.conn.execute(f'PRAGMA table_info("{table}")').fetchall()
+            types = {row['name']: row['type'].upper() for row in info}
+            self._column_types[table] = types
+        return types
+
+    def _decode(self, table, cursor):
+        types = self._types(table)
+        booleans = [c for c, t in types.items() if t == 'BOOLEAN']
+        arrays = [c for c, t in types.items() if t == 'JSON']
+        rows = []
+        for raw in cursor.fetchall():
+            row = dict(raw)
+            for column in booleans:
+                if row.get(column) is not None:
+                    row[column] = bool(row[column])
+            for column in arrays:
+                if row.get(column) is not None:
+                    row[column] = json.loads(row[column])
+            rows.append(row)
+        return rows
@@ -0,0 +1,247 @@
+"""
+Streaming reads of large PostgREST responses.
+
+supabase-py buffers the whole HTTP body and json-decodes it in one go, so a
+full-table fetch peaks at roughly three times the payload (bytes, decoded
+text, row dicts). stream_rows() instead reads the response in fixed-size
+chunks and parses the top-level JSON array incrementally, yielding one row
+(or row model) at a time. Tables are walked page by page (Supabase caps a
+response at its max-rows setting), so memory stays flat however large the
+table is. With keyset=True pages continue after the last row's order values
+instead of using OFFSET, so deep pages cost the same as the first one and
+rows changing mid-scan cannot shift a page boundary. rows_in() looks rows up
+by a list of keys in chunks, since a 1000-id in_() overruns PostgREST's URL
+limit (414).
+
+    python -m legacylink.streaming profiles --select id,role,verified --filter verified=eq.false
+"""
+
+import argparse
+import codecs
+import json
+import re
+import time
+from collections import Counter
+from urllib.error import HTTPError
+from urllib.parse import quote, urlencode
+from urllib.request import Request, urlopen
+
+from legacylink.client import get_client
+from legacylink.telemetry import record_query
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+PRIMARY_KEYS = {'alumni_profiles': 'user_id'}
+POSTGREST_OPS = {'is_': 'is', 'in_': 'in'}
+
+_decoder = json.JSONDecoder()
+
+
+class StreamError(Exception):
+    """A PostgREST error response or malformed JSON in the stream."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+def iter_json_array(chunks):
+    """Yield the elements of a JSON array arriving as an iterable of byte chunks."""
+    text = codecs.getincrementaldecoder('utf-8')()
+    buffer, pos, state = '', 0, 'start'
+    for chunk in chunks:
+        buffer += text.decode(chunk)
+        while True:
+            pos = WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            if state == 'start':
+                if buffer[pos] != '[':
+                    raise StreamError(f'Expected a JSON array, got {buffer[pos:pos + 40]!r}')
+                pos, state = pos + 1, 'first'
+            elif state == 'separator':
+                if buffer[pos] == ',':
+                    pos, state = pos + 1, 'value'
+                elif buffer[pos] == ']':
+                    return
+                else:
+                    raise StreamError(f'Unexpected {buffer[pos]!r} between array elements')
+            elif state == 'first' and buffer[pos] == ']':
+                return
+            else:
+                try:
+                    row, end = _decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    break  # element continues in the next chunk
+                if end == len(buffer):
+                    break  # a bare number could still continue; wait for the delimiter
+                yield row
+                pos, state = end, 'separator'
+        buffer, pos = buffer[pos:], 0
+    raise StreamError('Truncated JSON array')
+
+
+def _quote_list_item(value):
+    """One in.(...) element, double-quoted when it holds PostgREST's reserved characters."""
+    text = 'null' if value is None else str(value)
+    if re.search(r'[,()"\\:\s]', text):
+        return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+    return text
+
+
+def _tree_value(value):
+    """A scalar inside an or=(...) logic tree, where '.', ':' and ',' are reserved."""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def keyset_filter(order, last_row):
+    """An or_ filter for rows after last_row in `order` (ascending, nulls last), i.e. (a, b) > (a0, b0)."""
+    terms = []
+    for i, column in enumerate(order):
+        value = last_row.get(column)
+        if value is None:
+            continue  # nothing sorts after NULL
+        prefix = [f'{c}.is.null' if last_row.get(c) is None else f'{c}.eq.{_tree_value(last_row[c])}'
+                  for c in order[:i]]
+        after = f'or({column}.gt.{_tree_value(value)},{column}.is.null)'
+        terms.append(f'and({",".join(prefix + [after])})' if prefix else after)
+    if not terms:
+        raise ValueError(f'keyset paging needs a non-null key in {order}')
+    return ','.join(terms)
+
+
+def _postgrest_value(op, value):
+    if op == 'in_':
+        return '(' + ','.join(_quote_list_item(v) for v in value) + ')'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return 'null' if value is None else str(value)
+
+
+def stream_http(rest_url, key, table, select='*', filters=(), order=(), offset=0, limit=None,
+                chunk_size=64 * 1024, timeout=60):
+    """Stream one PostgREST request. filters are (column, op, value) with builder op names (eq, in_, is_ ...)."""
+    params = [('select', re.sub(r'\s+', '', select))]
+    for column, op, value in filters:
+        if op == 'or_':
+            params.append(('or', f'({value})'))
+            continue
+        params.append((column, f'{POSTGREST_OPS.get(op, op)}.{_postgrest_value(op, value)}'))
+    if order:
+        params.append(('order', ','.join(f'{column}.asc' for column in order)))
+    if offset:
+        params.append(('offset', str(offset)))
+    if limit is not None:
+        params.append(('limit', str(limit)))
+    request = Request(
+        # supabase-py 2.x exposes rest_url as a yarl.URL
+        f'{str(rest_url).rstrip("/")}/{quote(table)}?{urlencode(params, safe=",.()*")}',
+        headers={'apikey': key, 'Authorization': f'Bearer {key}', 'Accept': 'application/json'},
+    )
+    started = time.perf_counter()
+    try:
+        response = urlopen(request, timeout=timeout)
+    except HTTPError as e:
+        record_query(table, 'select', time.perf_counter() - started, status=str(e.code))
+        raise StreamError(f'PostgREST {e.code}: {e.read().decode(errors="replace")[:500]}', e.code) from e
+    received = rows = 0
+
+    def chunks():
+        nonlocal received
+        for chunk in iter(lambda: response.read(chunk_size), b''):
+            received += len(chunk)
+            yield chunk
+
+    with response:
+        for row in iter_json_array(chunks()):
+            rows += 1
+            yield row
+    record_query(table, 'select', time.perf_counter() - started, rows, received)
+
+
+def _client_rows(client, table, select, filters, order, offset, limit):
+    """One page through the client's query builder (the stand-in, or supabase-py without a REST URL)."""
+    query = client.table(table).select(select)
+    for column, op, value in filters:
+        query = query.or_(value) if op == 'or_' else getattr(query, op)(column, value)
+    for column in order:
+        query = query.order(column)
+    return query.range(offset, offset + limit - 1).execute().data or []
+
+
+def stream_rows(client, table, select='*', filters=(), order=None, model=None, page_size=1000,
+                chunk_size=64 * 1024, keyset=False):
+    """Yield every matching row of `table` (as model.from_row(row) if a model is given).
+
+    keyset=True pages on the order columns, which must end with a unique key
+    and be part of `select`.
+    """
+    order = list(order or [PRIMARY_KEYS.get(table, 'id')])
+    rest_url = getattr(client, 'rest_url', None) or (
+        f'{client.supabase_url}/rest/v1' if getattr(client, 'supabase_url', None) else None
+    )
+    convert = model.from_row if model is not None else None
+    offset, page_filters = 0, list(filters)
+    while True:
+        if rest_url:
+            rows = stream_http(rest_url, client.supabase_key, table, select, page_filters, order,
+                               offset, page_size, chunk_size)
+        else:
+            rows = _client_rows(client, table, select, page_filters, order, offset, page_size)
+        count, last = 0, None
+        for row in rows:
+            count += 1
+            last = row
+            yield convert(row) if convert else row
+        if count < page_size:
+            return
+        if keyset:
+            page_filters = list(filters) + [(None, 'or_', keyset_filter(order, last))]
+        else:
+            offset += page_size
+
+
+def rows_in(client, table, select, column, values, chunk=200):
+    """Every row of `table` whose `column` is in `values`, one in_() request per `chunk` values."""
+    values = list(values)
+    rows = []
+    for start in range(0, len(values), chunk):
+        rows.extend(client.table(table).select(select).in_(column, values[start:start + chunk]).execute().data or [])
+    return rows
+
+
+def parse_filter(text):
+    """'verified=eq.false' -> ('verified', 'eq', False) in builder terms."""
+    column, _, expression = text.partition('=')
+    op, _, value = expression.partition('.')
+    if not column or not value:
+        raise argparse.ArgumentTypeError(f'expected column=op.value, got {text!r}')
+    op = {'is': 'is_', 'in': 'in_'}.get(op, op)
+    if op == 'in_':
+        return column, op, value.strip('()').split(',')
+    return column, op, {'true': True, 'false': False, 'null': None}.get(value, value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Full-table scan with constant memory')
+    parser.add_argument('table')
+    parser.add_argument('--select', default='*')
+    parser.add_argument('--filter', action='append', type=parse_filter, default=[], help='column=op.value')
+    parser.add_argument('--page-size', type=int, default=1000)
+    parser.add_argument('--group-by', help='count rows per value of this column')
+    args = parser.parse_args()
+
+    client = get_client(service_role=True)
+    total, groups = 0, Counter()
+    for row in stream_rows(client, args.table, args.select, args.filter, page_size=args.page_size):
+        total += 1
+        if args.group_by:
+            groups[row.get(args.group_by)] += 1
+    print(f'📄 {args.table}: {total} rows')
+    for value, count in groups.most_common():
+        print(f'  • {value}: {count}')
+
+
+if __name__ == '__main__':
+    main()
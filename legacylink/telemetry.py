@@ -0,0 +1,433 @@
+"""
+Timing instrumentation for the Python toolkit.
+
+  - span('name', **attrs): context manager timing a block; spans nest, share
+    a trace id and land in the `legacylink_span_seconds` histogram,
+  - every table()/rpc() call made through get_client() is timed by
+    InstrumentedClient, with rows (and response bytes when
+    LEGACYLINK_MEASURE_BYTES=1),
+  - record_retry() counts retries for whatever is retrying,
+  - a histogram/counter registry exported as Prometheus text (serve_metrics()
+    or render_prometheus()) and, when LEGACYLINK_TRACE_FILE is set, one JSON
+    line per span and per query.
+
+Set LEGACYLINK_INSTRUMENT=0 to get the bare client back. Byte sizes come from
+the transport (Content-Length or the raw body) when the response exposes it;
+supabase-py's APIResponse does not, so there they are estimated by
+re-serializing the rows, which costs a json.dumps per query - hence opt-in.
+stream_rows() always records the bytes it actually received.
+
+    LEGACYLINK_TRACE_FILE=trace.jsonl python check_database_state.py
+    python -m legacylink.telemetry trace.jsonl --top 20
+"""
+
+import argparse
+import bisect
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+TRACE_FILE_ENV = 'LEGACYLINK_TRACE_FILE'
+INSTRUMENT_ENV = 'LEGACYLINK_INSTRUMENT'
+MEASURE_BYTES_ENV = 'LEGACYLINK_MEASURE_BYTES'
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+
+def _label_text(labels):
+    if not labels:
+        return ''
+    inner = ','.join(f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+                     for k, v in labels)
+    return '{' + inner + '}'
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, Prometheus style."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def quantile(self, q, **labels):
+        """Upper bucket bound holding the q-th observation (0 < q <= 1), or None."""
+        with self._lock:
+            series = self._series.get(tuple(sorted(labels.items())))
+            if not series or not series[2]:
+                return None
+            rank, seen = q * series[2], 0
+            for bound, count in zip(self.buckets + (float('inf'),), series[0]):
+                seen += count
+                if seen >= rank:
+                    return bound
+        return None
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, n in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += n
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{self.name}_bucket{_label_text(key + (("le", le),))} {cumulative}')
+                lines.append(f'{self.name}_sum{_label_text(key)} {total}')
+                lines.append(f'{self.name}_count{_label_text(key)} {count}')
+        return lines
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._values = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        with self._lock:
+            self._values[tuple(sorted(labels.items()))] += amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_label_text(key)} {value:g}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, *args):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args)
+            return metric
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help_text, buckets)
+
+    def counter(self, name, help_text):
+        return self._get(Counter, name, help_text)
+
+    def render_prometheus(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(line for metric in metrics for line in metric.render()) + '\n'
+
+
+REGISTRY = Registry()
+SPAN_SECONDS = REGISTRY.histogram('legacylink_span_seconds', 'Duration of instrumented spans')
+QUERY_SECONDS = REGISTRY.histogram('legacylink_query_seconds', 'Duration of table/rpc calls')
+QUERY_ROWS = REGISTRY.histogram('legacylink_query_rows', 'Rows returned per call', SIZE_BUCKETS)
+QUERY_BYTES = REGISTRY.histogram('legacylink_query_bytes', 'Response bytes per call (when measured)', SIZE_BUCKETS)
+QUERY_ERRORS = REGISTRY.counter('legacylink_query_errors_total', 'Failed table/rpc calls')
+RETRIES = REGISTRY.counter('legacylink_retries_total', 'Retried operations')
+
+
+def render_prometheus():
+    return REGISTRY.render_prometheus()
+
+
+# -- JSON lines -------------------------------------------------------------
+
+class JsonLinesSink:
+    """Appends one JSON object per event to a file (thread-safe, line-buffered)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8', buffering=1)
+        self._lock = threading.Lock()
+
+    def write(self, event):
+        line = json.dumps(event, default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def set_sink(sink):
+    """Route span/query events to `sink` (anything with .write(dict)), or None to stop."""
+    global _sink
+    with _sink_lock:
+        _sink = sink
+
+
+def _emit(event):
+    global _sink
+    if _sink is None:
+        path = os.getenv(TRACE_FILE_ENV)
+        if not path:
+            return
+        with _sink_lock:
+            if _sink is None:
+                _sink = JsonLinesSink(path)
+    _sink.write(event)
+
+
+# -- spans ------------------------------------------------------------------
+
+_current_span = contextvars.ContextVar('legacylink_span', default=None)
+
+
+@contextmanager
+def span(name, **attrs):
+    """Time a block. Yields a dict of attributes the block may add to (e.g. rows)."""
+    parent = _current_span.get()
+    record = {
+        'type': 'span',
+        'name': name,
+        'trace_id': parent['trace_id'] if parent else uuid.uuid4().hex[:16],
+        'span_id': uuid.uuid4().hex[:16],
+        'parent_id': parent['span_id'] if parent else None,
+        'attrs': attrs,
+    }
+    token = _current_span.set(record)
+    started = time.perf_counter()
+    status = 'ok'
+    try:
+        yield attrs
+    except BaseException as e:
+        status = type(e).__name__
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        _current_span.reset(token)
+        SPAN_SECONDS.observe(elapsed, name=name, status=status)
+        record.update(status=status, seconds=round(elapsed, 6), ts=datetime.now(timezone.utc).isoformat())
+        _emit(record)
+
+
+def record_query(table, op, seconds, rows=None, nbytes=None, status='ok'):
+    """Record one data call (used by InstrumentedClient and the streaming reader)."""
+    QUERY_SECONDS.observe(seconds, table=table, op=op)
+    if rows is not None:
+        QUERY_ROWS.observe(rows, table=table, op=op)
+    if nbytes is not None:
+        QUERY_BYTES.observe(nbytes, table=table, op=op)
+    if status != 'ok':
+        QUERY_ERRORS.inc(table=table, op=op, error=status)
+    parent = _current_span.get()
+    _emit({
+        'type': 'query',
+        'table': table,
+        'op': op,
+        'seconds': round(seconds, 6),
+        'rows': rows,
+        'bytes': nbytes,
+        'status': status,
+        'trace_id': parent['trace_id'] if parent else None,
+        'parent_id': parent['span_id'] if parent else None,
+        'ts': datetime.now(timezone.utc).isoformat(),
+    })
+
+
+def record_retry(target, reason='error'):
+    RETRIES.inc(target=target, reason=reason)
+
+
+# -- client -----------------------------------------------------------------
+
+OPERATIONS = ('select', 'insert', 'upsert', 'update', 'delete')
+
+
+def response_bytes(response):
+    """Body size from the transport if the response carries it, else the size of the re-serialized rows."""
+    content = getattr(response, 'content', None)
+    if isinstance(content, (bytes, bytearray)):
+        return len(content)
+    headers = getattr(response, 'headers', None)
+    length = headers.get('content-length') if headers is not None else None
+    if length is not None and str(length).isdigit():
+        return int(length)
+    return len(json.dumps(response.data, separators=(',', ':'), default=str))
+
+
+class _TimedBuilder:
+    """Wraps a query builder; chained calls stay wrapped and execute() is timed."""
+
+    __slots__ = ('_builder', '_table', '_op', '_measure_bytes')
+
+    def __init__(self, builder, table, op, measure_bytes):
+        self._builder = builder
+        self._table = table
+        self._op = op
+        self._measure_bytes = measure_bytes
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if hasattr(attr, 'execute'):
+            # properties such as .not_ return a builder
+            return _TimedBuilder(attr, self._table, self._op, self._measure_bytes)
+        if not callable(attr):
+            return attr
+        op = name if self._op is None and name in OPERATIONS else self._op
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if hasattr(result, 'execute'):
+                return _TimedBuilder(result, self._table, op, self._measure_bytes)
+            return result
+
+        return call
+
+    def execute(self):
+        started = time.perf_counter()
+        try:
+            response = self._builder.execute()
+        except Exception as e:
+            record_query(self._table, self._op or 'select', time.perf_counter() - started,
+                         status=getattr(e, 'code', None) or type(e).__name__)
+            raise
+        elapsed = time.perf_counter() - started
+        data = getattr(response, 'data', None)
+        rows = len(data) if isinstance(data, list) else (1 if data else 0)
+        nbytes = response_bytes(response) if self._measure_bytes and data is not None else None
+        record_query(self._table, self._op or 'select', elapsed, rows, nbytes)
+        return response
+
+
+class InstrumentedClient:
+    """Transparent proxy timing every table()/rpc() call of a supabase-py (or stand-in) client."""
+
+    def __init__(self, client, measure_bytes=False):
+        object.__setattr__(self, '_client', client)
+        object.__setattr__(self, '_measure_bytes', measure_bytes)
+
+    def table(self, name):
+        return _TimedBuilder(self._client.table(name), name, None, self._measure_bytes)
+
+    from_ = table
+
+    def rpc(self, name, params=None, *args, **kwargs):
+        builder = self._client.rpc(name, params, *args, **kwargs)
+        return _TimedBuilder(builder, f'rpc:{name}', 'rpc', self._measure_bytes)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._client, name, value)
+
+
+def instrument(client):
+    """Wrap a client unless LEGACYLINK_INSTRUMENT=0; LEGACYLINK_MEASURE_BYTES=1 also records response sizes."""
+    if os.getenv(INSTRUMENT_ENV, '1') == '0' or isinstance(client, InstrumentedClient):
+        return client
+    return InstrumentedClient(client, measure_bytes=os.getenv(MEASURE_BYTES_ENV) == '1')
+
+
+# -- export -----------------------------------------------------------------
+
+def make_handler(registry=REGISTRY):
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip('/') != '/metrics':
+                self.send_error(404)
+                return
+            payload = registry.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return MetricsHandler
+
+
+def serve_metrics(port=9464, host='127.0.0.1', registry=REGISTRY):
+    """Serve /metrics from a daemon thread. Returns the server (call .shutdown() to stop)."""
+    from http.server import ThreadingHTTPServer
+
+    server = ThreadingHTTPServer((host, port), make_handler(registry))
+    threading.Thread(target=server.serve_forever, name='legacylink-metrics', daemon=True).start()
+    return server
+
+
+def summarize(path, top=10):
+    """Slowest queries and per-(table, op) totals from a JSON lines trace."""
+    queries, spans = [], []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            event = json.loads(line)
+            (queries if event['type'] == 'query' else spans).append(event)
+    totals = defaultdict(lambda: [0, 0.0, 0])
+    for q in queries:
+        entry = totals[(q['table'], q['op'])]
+        entry[0] += 1
+        entry[1] += q['seconds']
+        entry[2] += q.get('rows') or 0
+    return {
+        'slowest_queries': sorted(queries, key=lambda q: -q['seconds'])[:top],
+        'slowest_spans': sorted(spans, key=lambda s: -s['seconds'])[:top],
+        'by_table': sorted(
+            ((table, op, n, round(total, 4), rows) for (table, op), (n, total, rows) in totals.items()),
+            key=lambda t: -t[3],
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize a LEGACYLINK_TRACE_FILE trace')
+    parser.add_argument('trace')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    summary = summarize(args.trace, args.top)
+    print('⏱️ Time by table/op (calls, seconds, rows):')
+    for table, op, calls, seconds, rows in summary['by_table']:
+        print(f'  • {table} {op}: {calls} calls, {seconds}s, {rows} rows')
+    print(f'\n🐢 Slowest {args.top} queries:')
+    for q in summary['slowest_queries']:
+        print(f'  • {q["seconds"] * 1000:.1f} ms {q["table"]} {q["op"]} rows={q["rows"]} [{q["status"]}]')
+    if summary['slowest_spans']:
+        print(f'\n🐢 Slowest {args.top} spans:')
+        for s in summary['slowest_spans']:
+            print(f'  • {s["seconds"] * 1000:.1f} ms {s["name"]} {s["attrs"]} [{s["status"]}]')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+"""
+Per-worker test data namespaces.
+
+The test scripts used to insert rows with hard-coded ids
+('00000000-0000-0000-0000-000000000001' in three of them) and emails, so two
+of them running at once deleted each other's rows or failed on duplicate
+keys. A Namespace hands out ids and emails that are unique per script,
+worker and run:
+
+  - ids are uuid5 of (run, worker, scope, label), so a script run twice on
+    one worker gets the same ids (fixture replay keeps matching) while two
+    workers never share one,
+  - emails and university domains live under test.legacylink.invalid with
+    the namespace's tag, so leftovers from a crashed run can be swept by
+    pattern,
+  - every row handed out is tracked and cleanup() removes them with one
+    in_() delete per table and chunk, children before parents.
+
+The worker comes from LEGACYLINK_TEST_WORKER (or PYTEST_XDIST_WORKER) and the
+run from LEGACYLINK_TEST_RUN; `run` sets both for each script it starts.
+
+    ns = Namespace('test_manual_profile')
+    supabase.table('profiles').insert(ns.profile(full_name='Test User')).execute()
+    ns.cleanup(supabase)
+
+    python -m legacylink.testdata run --workers 8          # test_*.py in parallel
+    python -m legacylink.testdata sweep                    # delete leftover test rows
+"""
+
+import argparse
+import glob
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+WORKER_ENV = 'LEGACYLINK_TEST_WORKER'
+RUN_ENV = 'LEGACYLINK_TEST_RUN'
+TEST_DOMAIN = 'test.legacylink.invalid'
+NAMESPACE_UUID = uuid.UUID('5d1c3a8e-6f0b-4a57-9c43-1b2e7f6a0d94')
+# tables in the order their rows must be deleted (profiles reference universities)
+CLEANUP_ORDER = ('profiles', 'universities')
+# column and pattern that identify test rows, for sweep()
+SWEEP_PATTERNS = {'profiles': ('email', '%@' + TEST_DOMAIN), 'universities': ('domain', '%.' + TEST_DOMAIN)}
+
+
+def worker_id():
+    return os.getenv(WORKER_ENV) or os.getenv('PYTEST_XDIST_WORKER') or 'main'
+
+
+class Namespace:
+    """Unique ids, emails and universities for one script on one worker, plus their cleanup."""
+
+    def __init__(self, scope, worker=None, run=None, chunk=200):
+        self.scope = os.path.splitext(os.path.basename(scope))[0]
+        self.worker = worker or worker_id()
+        self.run = os.getenv(RUN_ENV, '') if run is None else run
+        self.chunk = chunk
+        self.tag = self.uuid('tag').replace('-', '')[:10]
+        self.created = {}
+        self._lock = threading.Lock()
+
+    def uuid(self, label):
+        return str(uuid.uuid5(NAMESPACE_UUID, f'{self.run}/{self.worker}/{self.scope}/{label}'))
+
+    def email(self, label):
+        return f'{label}+{self.tag}@{TEST_DOMAIN}'
+
+    def track(self, table, row_id):
+        with self._lock:
+            ids = self.created.setdefault(table, [])
+            if row_id not in ids:
+                ids.append(row_id)
+        return row_id
+
+    def profile(self, label='profile', **fields):
+        """A profiles row to insert; `fields` override the defaults."""
+        row = {
+            'id': self.uuid(label),
+            'email': self.email(label),
+            'full_name': f'Test {label.replace("-", " ").title()}',
+            'role': 'alumni',
+            'verified': False,
+        }
+        row.update(fields)
+        self.track('profiles', row['id'])
+        return row
+
+    def university(self, label='university', **fields):
+        """A universities row to insert, with a domain only this namespace uses."""
+        row = {
+            'id': self.uuid(label),
+            'name': f'Test University {self.tag} {label}',
+            'domain': f'{label}-{self.tag}.{TEST_DOMAIN}',
+            'approved': False,
+        }
+        row.update(fields)
+        self.track('universities', row['id'])
+        return row
+
+    def cleanup(self, client):
+        """Delete every tracked row. Returns the number of ids deleted per table."""
+        with self._lock:
+            created, self.created = self.created, {}
+        deleted = {}
+        for table in sorted(created, key=lambda t: CLEANUP_ORDER.index(t) if t in CLEANUP_ORDER else -1):
+            ids = created[table]
+            for start in range(0, len(ids), self.chunk):
+                client.table(table).delete().in_('id', ids[start:start + self.chunk]).execute()
+            deleted[table] = len(ids)
+        return deleted
+
+
+def sweep(client, tag=None):
+    """Delete rows left by test runs (all of them, or one namespace's by tag). Returns rows deleted per table."""
+    deleted = {}
+    for table in CLEANUP_ORDER:
+        column, pattern = SWEEP_PATTERNS[table]
+        if tag:
+            pattern = pattern.replace('%', f'%{tag}%', 1)
+        response = client.table(table).delete().like(column, pattern).execute()
+        deleted[table] = len(response.data or [])
+    return deleted
+
+
+def _run_one(script, worker, run):
+    env = dict(os.environ, **{WORKER_ENV: worker, RUN_ENV: run})
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, script], env=env, capture_output=True, text=True)
+    return script, worker, proc.returncode, time.perf_counter() - started, proc.stdout + proc.stderr
+
+
+def run_parallel(scripts, workers=None, run=None):
+    """Run scripts as separate processes, each in its own namespace. Returns [(script, worker, code, s, output)]."""
+    run = run or uuid.uuid4().hex[:8]
+    workers = workers or os.cpu_count() or 4
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_one, script, f'w{n}', run) for n, script in enumerate(scripts)]
+        return [future.result() for future in futures]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Test data namespaces: parallel runs and cleanup')
+    sub = parser.add_subparsers(dest='command', required=True)
+    run_parser = sub.add_parser('run', help='run test scripts in parallel, one namespace each')
+    run_parser.add_argument('scripts', nargs='*', help='scripts to run (default: test_*.py)')
+    run_parser.add_argument('--workers', type=int, help='processes at once (default: CPU count)')
+    run_parser.add_argument('-v', '--verbose', action='store_true', help='print each script\'s output')
+    sweep_parser = sub.add_parser('sweep', help=f'delete rows under {TEST_DOMAIN} (service role)')
+    sweep_parser.add_argument('--tag', help='only this namespace\'s rows')
+    args = parser.parse_args()
+
+    if args.command == 'sweep':
+        from legacylink.client import get_client
+
+        print(f'🧹 Deleted {sweep(get_client(service_role=True), args.tag)}')
+        return
+
+    scripts = args.scripts or sorted(glob.glob('test_*.py'))
+    print(f'🧪 Running {len(scripts)} script(s) on {args.workers or os.cpu_count()} worker(s)')
+    started = time.perf_counter()
+    results = run_parallel(scripts, args.workers)
+    for script, worker, code, seconds, output in results:
+        print(f'  {"✅" if code == 0 else "❌"} {script} [{worker}]: {seconds:.2f}s'
+              + (f' (exit {code})' if code else ''))
+        if args.verbose or code:
+            print('    ' + output.strip().replace('\n', '\n    '))
+    failed = sum(1 for result in results if result[2])
+    print(f'{"❌" if failed else "✅"} {len(results) - failed}/{len(results)} passed in '
+          f'{time.perf_counter() - started:.2f}s')
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Waitlist promotion engine for event_waitlist.
+
+Keeps a live registered/capacity counter per event so capacity checks never
+recount event_registrations, and promotes waitlisted users in FIFO created_at
+order, a batch at a time, whenever seats free up.
+
+All registration changes for an event go through the engine's per-event lock,
+so concurrent cancellations can never promote more users than there are seats.
+Run one engine per deployment (like the check-in ingestor); call resync() if
+registrations were changed behind its back.
+"""
+
+import threading
+
+
+class EventNotFound(Exception):
+    pass
+
+
+class WaitlistEngine:
+    """Registers, cancels and promotes against per-event live counters."""
+
+    def __init__(self, client, batch_size=50):
+        self.client = client
+        self.batch_size = batch_size
+        self._capacity = {}
+        self._registered = {}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self.promoted_total = 0
+
+    def _lock(self, event_id):
+        with self._locks_guard:
+            lock = self._locks.get(event_id)
+            if lock is None:
+                lock = self._locks[event_id] = threading.Lock()
+            return lock
+
+    def _load(self, event_id):
+        """Load capacity and the registration count once; counters are live after that."""
+        if event_id in self._registered:
+            return
+        event = self.client.table('events').select('id, max_attendees').eq('id', event_id).execute()
+        if not event.data:
+            raise EventNotFound(event_id)
+        registrations = self.client.table('event_registrations').select(
+            'id', count='exact'
+        ).eq('event_id', event_id).limit(1).execute()
+        self._capacity[event_id] = event.data[0].get('max_attendees')
+        self._registered[event_id] = registrations.count or 0
+
+    def resync(self, event_id):
+        """Recount an event from the database."""
+        with self._lock(event_id):
+            self._registered.pop(event_id, None)
+            self._load(event_id)
+
+    def seats_left(self, event_id):
+        """Free seats, or None for events without max_attendees."""
+        with self._lock(event_id):
+            self._load(event_id)
+            capacity = self._capacity[event_id]
+            if capacity is None:
+                return None
+            return max(0, capacity - self._registered[event_id])
+
+    def register(self, event_id, user_id):
+        """Register the user if a seat is free, otherwise join the waitlist.
+
+        Returns 'registered', 'waitlisted' or 'already_registered'.
+        """
+        with self._lock(event_id):
+            self._load(event_id)
+            capacity = self._capacity[event_id]
+            if capacity is None or self._registered[event_id] < capacity:
+                result = self.client.table('event_registrations').upsert(
+                    {'event_id': event_id, 'user_id': user_id},
+                    on_conflict='event_id,user_id',
+                    ignore_duplicates=True,
+                ).execute()
+                if not result.data:
+                    return 'already_registered'
+                self._registered[event_id] += 1
+                return 'registered'
+
+            # A full event must not waitlist someone who already holds a seat.
+            existing = self.client.table('event_registrations').select('id').eq(
+                'event_id', event_id
+            ).eq('user_id', user_id).limit(1).execute()
+            if existing.data:
+                return 'already_registered'
+            self.client.table('event_waitlist').upsert(
+                {'event_id': event_id, 'user_id': user_id},
+                on_conflict='event_id,user_id',
+                ignore_duplicates=True,
+            ).execute()
+            return 'waitlisted'
+
+    def cancel(self, event_id, user_id, promote=True):
+        """Cancel a registration (or waitlist entry) and refill the seat from the waitlist.
+
+        Returns the list of user ids promoted as a result.
+        """
+        return self.cancel_many(event_id, [user_id], promote=promote)
+
+    def cancel_many(self, event_id, user_ids, promote=True):
+        """Cancel several registrations at once and promote in a single batch."""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return []
+        with self._lock(event_id):
+            self._load(event_id)
+            removed = self.client.table('event_registrations').delete().eq(
+                'event_id', event_id
+            ).in_('user_id', user_ids).execute()
+            self._registered[event_id] -= len(removed.data or [])
+
+            # Cancelling while still waitlisted just leaves the queue.
+            self.client.table('event_waitlist').delete().eq('event_id', event_id).in_('user_id', user_ids).execute()
+
+            if not promote:
+                return []
+            return self._promote_locked(event_id)
+
+    def promote(self, event_id):
+        """Fill any free seats from the waitlist. Returns the promoted user ids."""
+        with self._lock(event_id):
+            self._load(event_id)
+            return self._promote_locked(event_id)
+
+    def _promote_locked(self, event_id):
+        capacity = self._capacity[event_id]
+        promoted = []
+        while True:
+            free = None if capacity is None else capacity - self._registered[event_id]
+            if free is not None and free <= 0:
+                break
+            size = self.batch_size if free is None else min(free, self.batch_size)
+            waiting = self.client.table('event_waitlist').select('id, user_id, created_at').eq(
+                'event_id', event_id
+            ).order('created_at').order('id').limit(size).execute()
+            if not waiting.data:
+                break
+
+            inserted = self.client.table('event_registrations').upsert(
+                [{'event_id': event_id, 'user_id': row['user_id']} for row in waiting.data],
+                on_conflict='event_id,user_id',
+                ignore_duplicates=True,
+            ).execute()
+            self.client.table('event_waitlist').delete().in_('id', [row['id'] for row in waiting.data]).execute()
+
+            newly = [row['user_id'] for row in inserted.data or []]
+            self._registered[event_id] += len(newly)
+            promoted.extend(newly)
+        self.promoted_total += len(promoted)
+        return promoted
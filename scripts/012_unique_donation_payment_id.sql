@@ -0,0 +1,20 @@
+-- Make donations idempotent on payment_id
+-- Provider webhook retries used to create duplicate donations rows. The batched
+-- webhook worker (legacylink/donation_webhooks.py) upserts ON CONFLICT (payment_id),
+-- which needs a unique constraint. NULL payment_ids stay allowed.
+
+-- Remove existing duplicates, keeping the earliest row per payment_id
+DELETE FROM donations d
+USING donations keep
+WHERE d.payment_id IS NOT NULL
+  AND d.payment_id = keep.payment_id
+  AND (d.created_at, d.id) > (keep.created_at, keep.id);
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_constraint WHERE conname = 'donations_payment_id_key'
+  ) THEN
+    ALTER TABLE donations ADD CONSTRAINT donations_payment_id_key UNIQUE (payment_id);
+  END IF;
+END $$;
@@ -0,0 +1,27 @@
+-- Donation rollups for the analytics and donations dashboards
+-- Maintained by legacylink/donation_rollups.py: completed donations aggregated by
+-- university x month x graduation-year cohort (0 = donor has no alumni profile / year).
+
+CREATE TABLE IF NOT EXISTS donation_rollups (
+    university_id UUID REFERENCES universities(id) ON DELETE CASCADE,
+    month DATE NOT NULL,
+    graduation_year INTEGER NOT NULL DEFAULT 0,
+    total_amount DECIMAL(14,2) NOT NULL DEFAULT 0,
+    donation_count INTEGER NOT NULL DEFAULT 0,
+    avg_amount DECIMAL(12,2) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (university_id, month, graduation_year)
+);
+
+ALTER TABLE donation_rollups ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "University admins can view their donation rollups" ON donation_rollups FOR SELECT USING (
+    EXISTS (
+        SELECT 1 FROM profiles
+        WHERE profiles.id = auth.uid()
+        AND (
+            profiles.role = 'super_admin'
+            OR (profiles.role = 'university_admin' AND profiles.university_id = donation_rollups.university_id)
+        )
+    )
+);
@@ -0,0 +1,88 @@
+-- Change outbox for cache / index consumers
+-- Every insert, update and delete on profiles, alumni_profiles, events and
+-- mentorships is appended here by trigger. ids are allocated when the change is
+-- made, so concurrent transactions can commit out of id order; legacylink/cdc.py
+-- reads in id order, holds back at gaps until they fill or time out, and
+-- checkpoints the last id it handled.
+-- No RLS policies: only the service role reads it.
+
+CREATE TABLE IF NOT EXISTS change_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    op TEXT NOT NULL CHECK (op IN ('INSERT', 'UPDATE', 'DELETE')),
+    row_id TEXT NOT NULL,
+    record JSONB,
+    old_record JSONB,
+    changed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_change_outbox_changed_at ON change_outbox(changed_at);
+
+ALTER TABLE change_outbox ENABLE ROW LEVEL SECURITY;
+
+-- TG_ARGV[0] names the primary-key column of the captured table
+CREATE OR REPLACE FUNCTION public.capture_change()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO public.change_outbox (table_name, op, row_id, old_record)
+        VALUES (TG_TABLE_NAME, TG_OP, to_jsonb(OLD)->>TG_ARGV[0], to_jsonb(OLD));
+        RETURN OLD;
+    END IF;
+
+    IF TG_OP = 'UPDATE' AND to_jsonb(NEW) = to_jsonb(OLD) THEN
+        RETURN NEW; -- no-op update, nothing for consumers to do
+    END IF;
+
+    INSERT INTO public.change_outbox (table_name, op, row_id, record, old_record)
+    VALUES (
+        TG_TABLE_NAME,
+        TG_OP,
+        to_jsonb(NEW)->>TG_ARGV[0],
+        to_jsonb(NEW),
+        CASE WHEN TG_OP = 'UPDATE' THEN to_jsonb(OLD) END
+    );
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS capture_profiles_change ON profiles;
+CREATE TRIGGER capture_profiles_change
+    AFTER INSERT OR UPDATE OR DELETE ON profiles
+    FOR EACH ROW EXECUTE FUNCTION public.capture_change('id');
+
+DROP TRIGGER IF EXISTS capture_alumni_profiles_change ON alumni_profiles;
+CREATE TRIGGER capture_alumni_profiles_change
+    AFTER INSERT OR UPDATE OR DELETE ON alumni_profiles
+    FOR EACH ROW EXECUTE FUNCTION public.capture_change('user_id');
+
+DROP TRIGGER IF EXISTS capture_events_change ON events;
+CREATE TRIGGER capture_events_change
+    AFTER INSERT OR UPDATE OR DELETE ON events
+    FOR EACH ROW EXECUTE FUNCTION public.capture_change('id');
+
+DROP TRIGGER IF EXISTS capture_mentorships_change ON mentorships;
+CREATE TRIGGER capture_mentorships_change
+    AFTER INSERT OR UPDATE OR DELETE ON mentorships
+    FOR EACH ROW EXECUTE FUNCTION public.capture_change('id');
+
+-- Drop outbox rows every consumer has long since processed
+CREATE OR REPLACE FUNCTION public.prune_change_outbox(keep INTERVAL DEFAULT INTERVAL '7 days')
+RETURNS BIGINT
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    WITH pruned AS (
+        DELETE FROM public.change_outbox WHERE changed_at < NOW() - keep RETURNING 1
+    )
+    SELECT COUNT(*) FROM pruned;
+$$;
+
+-- Functions are executable by PUBLIC by default; only the outbox consumer may prune
+REVOKE EXECUTE ON FUNCTION public.prune_change_outbox(INTERVAL) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.prune_change_outbox(INTERVAL) TO service_role;
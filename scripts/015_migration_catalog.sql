@@ -0,0 +1,58 @@
+-- Read-only migration probe
+-- Status checks used to detect functions by calling them, which for
+-- sync_existing_auth_users meant running a full auth-user sync on every check.
+-- migration_catalog() instead returns catalog metadata for the public functions,
+-- the triggers on auth.users / public tables and the RLS policies on public
+-- tables in one call; legacylink/migrations.py compares it with scripts 009-011.
+-- Function bodies are included so the probe can check for the fragments each
+-- fix script introduces; callable by service_role only.
+
+CREATE OR REPLACE FUNCTION public.migration_catalog()
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = pg_catalog
+AS $$
+    SELECT jsonb_build_object(
+        'functions', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                'name', p.proname,
+                'arguments', pg_get_function_identity_arguments(p.oid),
+                'returns', pg_get_function_result(p.oid),
+                'security_definer', p.prosecdef,
+                'body_md5', md5(p.prosrc),
+                'body', p.prosrc
+            ) ORDER BY p.proname)
+            FROM pg_proc p
+            JOIN pg_namespace n ON n.oid = p.pronamespace
+            WHERE n.nspname = 'public'
+        ), '[]'::jsonb),
+        'triggers', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                'name', t.tgname,
+                'table', n.nspname || '.' || c.relname,
+                'function', p.proname,
+                'enabled', t.tgenabled <> 'D'
+            ) ORDER BY t.tgname)
+            FROM pg_trigger t
+            JOIN pg_class c ON c.oid = t.tgrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            JOIN pg_proc p ON p.oid = t.tgfoid
+            WHERE NOT t.tgisinternal
+            AND (n.nspname = 'public' OR (n.nspname = 'auth' AND c.relname = 'users'))
+        ), '[]'::jsonb),
+        'policies', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                'name', pol.policyname,
+                'table', pol.tablename,
+                'command', pol.cmd
+            ) ORDER BY pol.tablename, pol.policyname)
+            FROM pg_policies pol
+            WHERE pol.schemaname = 'public'
+        ), '[]'::jsonb)
+    );
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.migration_catalog() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.migration_catalog() TO service_role;
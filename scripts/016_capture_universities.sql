@@ -0,0 +1,9 @@
+-- Capture university changes in the change outbox
+-- legacylink/refcache.py keeps universities in a process-local cache; this lets
+-- a ChangeConsumer drop stale entries as soon as a university is renamed,
+-- approved or removed instead of waiting for the TTL. Requires 014.
+
+DROP TRIGGER IF EXISTS capture_universities_change ON universities;
+CREATE TRIGGER capture_universities_change
+    AFTER INSERT OR UPDATE OR DELETE ON universities
+    FOR EACH ROW EXECUTE FUNCTION public.capture_change('id');
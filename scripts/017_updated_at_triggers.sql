@@ -0,0 +1,47 @@
+-- Keep updated_at current on every update
+-- 001 only gives updated_at a DEFAULT, so it records the insert time and stays
+-- there unless the writer sets it; the approval and self-verification
+-- components, the debug verification routes and bulk upserts do not.
+-- legacylink/snapshots.py exports incrementally on updated_at, so without this
+-- trigger those changes are missed by every run but `--full`.
+
+CREATE OR REPLACE FUNCTION public.set_updated_at()
+RETURNS trigger
+LANGUAGE plpgsql
+SET search_path = public
+AS $$
+BEGIN
+    NEW.updated_at := NOW();
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS set_universities_updated_at ON universities;
+CREATE TRIGGER set_universities_updated_at
+    BEFORE UPDATE ON universities
+    FOR EACH ROW EXECUTE FUNCTION public.set_updated_at();
+
+DROP TRIGGER IF EXISTS set_profiles_updated_at ON profiles;
+CREATE TRIGGER set_profiles_updated_at
+    BEFORE UPDATE ON profiles
+    FOR EACH ROW EXECUTE FUNCTION public.set_updated_at();
+
+DROP TRIGGER IF EXISTS set_alumni_profiles_updated_at ON alumni_profiles;
+CREATE TRIGGER set_alumni_profiles_updated_at
+    BEFORE UPDATE ON alumni_profiles
+    FOR EACH ROW EXECUTE FUNCTION public.set_updated_at();
+
+DROP TRIGGER IF EXISTS set_events_updated_at ON events;
+CREATE TRIGGER set_events_updated_at
+    BEFORE UPDATE ON events
+    FOR EACH ROW EXECUTE FUNCTION public.set_updated_at();
+
+DROP TRIGGER IF EXISTS set_mentorships_updated_at ON mentorships;
+CREATE TRIGGER set_mentorships_updated_at
+    BEFORE UPDATE ON mentorships
+    FOR EACH ROW EXECUTE FUNCTION public.set_updated_at();
+
+DROP TRIGGER IF EXISTS set_donations_updated_at ON donations;
+CREATE TRIGGER set_donations_updated_at
+    BEFORE UPDATE ON donations
+    FOR EACH ROW EXECUTE FUNCTION public.set_updated_at();
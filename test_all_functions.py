@@ -9,6 +9,8 @@ import asyncio
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+from legacylink.refcache import shared_cache
+
 def check_environment():
     """Check environment variables are set."""
     # Load from .env.local file
@@ -92,8 +94,9 @@ def test_university_admin_functions(supabase):
     try:
         # Get university admins
         admins_result = supabase.table('profiles').select(
-            'id, email, full_name, university_id, universities(name)'
+            'id, email, full_name, university_id'
         ).eq('role', 'university_admin').execute()
+        shared_cache(supabase).resolve(admins_result.data)
         
         print(f'  Found {len(admins_result.data)} university admins')
         
@@ -163,8 +166,9 @@ def test_alumni_workflow(supabase):
     try:
         # Get alumni
         alumni_result = supabase.table('profiles').select(
-            'id, email, full_name, verified, universities(name)'
+            'id, email, full_name, verified, university_id'
         ).eq('role', 'alumni').limit(5).execute()
+        shared_cache(supabase).resolve(alumni_result.data)
         
         print(f'  Found {len(alumni_result.data)} alumni (showing first 5)')
         
@@ -199,8 +203,9 @@ def test_student_workflow(supabase):
     try:
         # Get students
         students_result = supabase.table('profiles').select(
-            'id, email, full_name, verified, universities(name)'
+            'id, email, full_name, verified, university_id'
         ).eq('role', 'student').limit(5).execute()
+        shared_cache(supabase).resolve(students_result.data)
         
         print(f'  Found {len(students_result.data)} students (showing first 5)')
         
@@ -7,6 +7,10 @@ import os
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+from legacylink.testdata import Namespace
+
+TEST_DATA = Namespace(__file__)
+
 def manual_profile_creation_test():
     """Manually create a profile for testing."""
     print('🔧 Manual Profile Creation Test')
@@ -21,13 +25,7 @@ def manual_profile_creation_test():
     supabase: Client = create_client(url, key)
     
     # Create a test profile manually to see if RLS allows it now
-    test_profile = {
-        'id': '12345678-1234-5678-9012-123456789012',  # Fake UUID for testing
-        'email': 'harsh@test.com',
-        'full_name': 'Harsh Test User',
-        'role': 'alumni',
-        'verified': False
-    }
+    test_profile = TEST_DATA.profile('manual-profile', full_name='Harsh Test User')
     
     print('Attempting to create test profile manually...')
     
@@ -51,7 +49,7 @@ def manual_profile_creation_test():
             print(f'   • {profile["full_name"]} ({profile["email"]}) - {profile["role"]}')
         
         # Clean up test data
-        supabase.table('profiles').delete().eq('id', test_profile['id']).execute()
+        TEST_DATA.cleanup(supabase)
         print('\n🧹 Test profile cleaned up')
         
         print('\n🎉 GOOD NEWS: Profile creation is working!')
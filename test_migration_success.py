@@ -7,6 +7,11 @@ import os
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+from legacylink.migrations import MigrationProbeError, print_checks, probe_migrations
+from legacylink.testdata import Namespace
+
+TEST_DATA = Namespace(__file__)
+
 def test_migration_success():
     """Test if migration functions are working."""
     print('🧪 Testing Migration Success')
@@ -24,52 +29,27 @@ def test_migration_success():
     
     supabase: Client = create_client(url, key)
     
-    # Test 1: Check if trigger functions exist
-    print('1. Testing Trigger Functions:')
+    # Test 1: Check functions, triggers and policies in the catalog
+    # (one read-only RPC; calling the functions ran sync_existing_auth_users)
+    print('1. Checking Functions, Triggers and Policies (catalog):')
     
-    functions_to_test = [
-        'handle_new_user',
-        'handle_user_email_confirmed', 
-        'sync_existing_auth_users'
-    ]
-    
-    functions_working = 0
-    for func_name in functions_to_test:
+    # migration_catalog() is granted to service_role only
+    service_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+    checks = []
+    if not service_key:
+        print('   ❌ SUPABASE_SERVICE_ROLE_KEY is required to read the migration catalog')
+    else:
         try:
-            if func_name == 'sync_existing_auth_users':
-                result = supabase.rpc(func_name).execute()
-                print(f'   ✅ {func_name}: Working')
-                if result.data:
-                    data = result.data[0] if isinstance(result.data, list) else result.data
-                    print(f'      Processed: {data.get("users_processed", 0)} users')
-                functions_working += 1
-            else:
-                # For trigger functions, we can't call them directly
-                # But we can check if they exist by trying to call them
-                # and looking for specific error messages
-                try:
-                    supabase.rpc(func_name).execute()
-                    print(f'   ✅ {func_name}: Available')
-                    functions_working += 1
-                except Exception as e:
-                    if 'without parameters' in str(e):
-                        print(f'   ✅ {func_name}: Exists (trigger function)')
-                        functions_working += 1
-                    else:
-                        print(f'   ❌ {func_name}: Missing - {e}')
-        except Exception as e:
-            print(f'   ❌ {func_name}: Not available - {e}')
+            checks = probe_migrations(create_client(url, service_key))
+        except MigrationProbeError as e:
+            print(f'   ❌ {e}')
+    print_checks(checks, indent='   ')
+    functions_ok = bool(checks) and all(c.status == 'ok' for c in checks if c.kind in ('function', 'trigger'))
     
     # Test 2: Check if RLS policies are fixed
     print('\n2. Testing Profile Creation (RLS Policies):')
     
-    test_profile = {
-        'id': '00000000-0000-0000-0000-000000000001',
-        'email': 'migration-test@example.com',
-        'full_name': 'Migration Test User',
-        'role': 'alumni',
-        'verified': False
-    }
+    test_profile = TEST_DATA.profile('migration-test', full_name='Migration Test User')
     
     try:
         # Try to insert a test profile
@@ -77,7 +57,7 @@ def test_migration_success():
         print('   ✅ Profile creation: SUCCESS')
         
         # Clean up test data
-        supabase.table('profiles').delete().eq('id', test_profile['id']).execute()
+        TEST_DATA.cleanup(supabase)
         print('   🧹 Test data cleaned up')
         
         rls_fixed = True
@@ -108,14 +88,14 @@ def test_migration_success():
     print('\n📋 Migration Status Summary:')
     print('=' * 30)
     
-    if functions_working >= 2 and rls_fixed:
+    if functions_ok and rls_fixed:
         print('🎉 ✅ MIGRATION SUCCESSFUL!')
         print('   • Trigger functions are active')
         print('   • RLS policies fixed')
         print('   • Profile creation working')
         print('   • Ready for user signups')
         return True
-    elif functions_working >= 2:
+    elif functions_ok:
         print('⚠️  🔄 MIGRATION PARTIALLY APPLIED')
         print('   • Functions exist but RLS still blocking')
         print('   • May need to re-run migration')
@@ -141,14 +121,12 @@ def test_signup_simulation():
     supabase: Client = create_client(url, key)
     
     # Simulate what the trigger would do
-    simulated_user = {
-        'id': '11111111-1111-1111-1111-111111111111',
-        'email': 'simulated-signup@test.com',
-        'full_name': 'Simulated User',
-        'role': 'student',
-        'university_id': None,  # Will be None if not provided
-        'verified': False
-    }
+    simulated_user = TEST_DATA.profile(
+        'simulated-signup',
+        full_name='Simulated User',
+        role='student',
+        university_id=None,  # Will be None if not provided
+    )
     
     try:
         # This simulates the trigger creating a profile
@@ -161,7 +139,7 @@ def test_signup_simulation():
             print('   ✅ Admin visibility: User visible in dashboard')
         
         # Clean up
-        supabase.table('profiles').delete().eq('id', simulated_user['id']).execute()
+        TEST_DATA.cleanup(supabase)
         print('   🧹 Simulation data cleaned up')
         
         return True